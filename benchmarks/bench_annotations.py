@@ -0,0 +1,81 @@
+"""
+註解保留檢查基準測試
+
+以生成器實際渲染的 README.md 與 Python 文件內容比較：
+- nested: 每個文件逐一檢查每個預期註解（`annotation in content`，舊做法）
+- aho-corasick: 預期註解建立一次自動機，每個文件只掃描一次
+
+用法:
+    python benchmarks/bench_annotations.py --nodes 1000 5000 10000
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import List, Set
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from generation_plan import OP_WRITE
+from multi_pattern import AhoCorasick
+from progress import ProgressReporter
+from project_generator import ProjectGenerator
+from structure_index import StructureIndex
+
+
+def build_structure(nodes: int, files_per_dir: int = 20) -> dict:
+    """每個目錄與文件都帶有不同註解的結構字典"""
+    modules = {}
+    for m in range(max(nodes // (files_per_dir + 1), 1)):
+        children = {
+            f"part_{f}.py": {'name': f"part_{f}.py", 'type': 'file', 'comment': f"模組 {m} 的第 {f} 個元件"}
+            for f in range(files_per_dir)
+        }
+        modules[f"module_{m}"] = {'name': f"module_{m}", 'type': 'directory',
+                                  'comment': f"模組 {m}：業務邏輯", 'children': children}
+    return {'project': {'name': 'project', 'type': 'directory', 'comment': None, 'children': modules}}
+
+
+def nested(contents: List[str], annotations: List[str]) -> Set[str]:
+    preserved = []
+    for content in contents:
+        for annotation in annotations:
+            if annotation in content:
+                preserved.append(annotation)
+    return set(preserved)
+
+
+def automaton(contents: List[str], annotations: List[str]) -> Set[str]:
+    matcher = AhoCorasick(annotations)
+    preserved = set()
+    for content in contents:
+        preserved |= matcher.matches(content)
+    return preserved
+
+
+def main():
+    parser = argparse.ArgumentParser(description="註解保留檢查基準測試")
+    parser.add_argument('--nodes', type=int, nargs='+', default=[1000, 5000, 10000], help='結構節點數')
+    args = parser.parse_args()
+
+    for nodes in args.nodes:
+        structure = build_structure(nodes)
+        annotations = StructureIndex(structure).annotations
+        generator = ProjectGenerator("out", progress=ProgressReporter())
+        contents = [content for op, content in generator.iter_plan(structure)
+                    if op.op == OP_WRITE and (op.path.endswith('.py') or op.path.endswith('README.md'))]
+        print(f"\n{len(annotations)} 個註解、{len(contents)} 個文件")
+
+        results = []
+        baseline = None
+        for label, func in (("nested", nested), ("aho-corasick", automaton)):
+            start = time.perf_counter()
+            results.append(func(contents, annotations))
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(f"{label:>14}: {elapsed:8.3f}s  speedup {baseline / elapsed:7.1f}x  保留 {len(results[-1])}")
+        assert results[0] == results[1]
+
+
+if __name__ == "__main__":
+    main()
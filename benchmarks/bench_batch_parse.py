@@ -0,0 +1,59 @@
+"""
+批次解析吞吐量基準測試
+
+在 1、2、4、8 個程序下解析大量結構文件（停用解析快取），輸出每秒文件數。
+
+用法:
+    python benchmarks/bench_batch_parse.py --files 2000 --lines 300
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from batch_parser import parse_batch
+
+
+def build_structure(index: int, lines: int) -> str:
+    """建立單一結構文件內容"""
+    body = ["```", f"project_{index}/"]
+    for i in range(lines):
+        if i % 10 == 0:
+            body.append(f"├─ module_{i}/ ← 模組 {i}")
+        else:
+            body.append(f"│  ├─ part_{i}.py")
+    body.append("└─ README.md")
+    body.append("```")
+    return "\n".join(body) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="批次解析吞吐量基準測試")
+    parser.add_argument('--files', type=int, default=1000, help='結構文件數量')
+    parser.add_argument('--lines', type=int, default=300, help='每個文件的結構行數')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8], help='程序數量')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(args.files):
+            path = Path(tmp) / f"structure_{i}.md"
+            path.write_text(build_structure(i, args.lines), encoding='utf-8')
+            paths.append(path)
+
+        baseline = None
+        for workers in args.workers:
+            start = time.perf_counter()
+            results = parse_batch(paths, workers=workers, use_cache=False, include_structure=False)
+            elapsed = time.perf_counter() - start
+            assert all(r.ok for r in results)
+            baseline = baseline or elapsed
+            print(f"workers={workers}:  {elapsed:7.3f}s  {len(paths) / elapsed:9.1f} files/s  "
+                  f"speedup {baseline / elapsed:4.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+結構樹記憶體基準測試
+
+比較舊版巢狀字典與 CompactTree 在大型結構上的記憶體用量（tracemalloc）。
+
+用法:
+    python benchmarks/bench_compact_tree.py --nodes 1000000
+"""
+import argparse
+import gc
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from structure_parser import StructureParser
+from compact_tree import CompactTree
+
+
+def build_wide_tree(nodes: int, files_per_dir: int = 8) -> str:
+    """建立模組化的樹狀結構：每個模組目錄下有固定的幾個文件"""
+    lines = ["```", "root/"]
+    module_count = max(nodes // (files_per_dir + 1), 1)
+    for m in range(module_count):
+        lines.append(f"├─ module_{m}/ ← 模組 {m % 10}")
+        lines.append("│  ├─ __init__.py")
+        lines.append("│  ├─ README.md ← 模組說明")
+        for f in range(files_per_dir - 2):
+            lines.append(f"│  ├─ part_{f}.py")
+    lines.append("```")
+    return "\n".join(lines) + "\n"
+
+
+def measure(func):
+    """返回 (結果, 建立後仍保留的位元組數)"""
+    gc.collect()
+    tracemalloc.start()
+    result = func()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def main():
+    parser = argparse.ArgumentParser(description="結構樹記憶體基準測試")
+    parser.add_argument('--nodes', type=int, default=200000, help='節點總數')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        structure_file = Path(tmp) / "wide.md"
+        structure_file.write_text(build_wide_tree(args.nodes), encoding='utf-8')
+
+        structure, dict_bytes = measure(lambda: StructureParser(str(structure_file)).parse())
+        del structure
+        tree, compact_bytes = measure(lambda: CompactTree.from_file(str(structure_file)))
+
+    count = len(tree)
+    print(f"nodes:        {count}")
+    print(f"nested dict:  {dict_bytes / 1024 / 1024:8.1f} MiB  ({dict_bytes / count:6.1f} B/node)")
+    print(f"CompactTree:  {compact_bytes / 1024 / 1024:8.1f} MiB  ({compact_bytes / count:6.1f} B/node)")
+    print(f"ratio:        {dict_bytes / compact_bytes:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
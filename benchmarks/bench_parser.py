@@ -0,0 +1,99 @@
+"""
+結構解析器效能基準測試
+
+比較兩種節點掛載方式在深層樹狀結構上的耗時：
+- root-walk: 每個節點都從根節點沿著路徑堆疊走到父目錄（舊做法，O(depth)）
+- parent-stack: 維護開啟目錄的 children 堆疊，直接掛載（O(1)）
+
+除端到端解析時間外，也在預先收集的事件上單獨計算掛載耗時，
+排除逐行讀取與層級計算（與行長成正比）的影響。
+
+用法:
+    python benchmarks/bench_parser.py --depths 10 50 100 --nodes 100000
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from structure_parser import StructureParser, ParseEvent, EVENT_ENTER_DIR, EVENT_LEAVE_DIR
+
+
+def build_deep_tree(depth: int, nodes: int) -> str:
+    """建立深度為 depth、共約 nodes 個節點的樹狀結構文字"""
+    lines = ["```", "root/"]
+    # 主幹：depth 層目錄
+    for level in range(1, depth + 1):
+        lines.append("│  " * (level - 1) + f"├─ d{level}/")
+    # 其餘節點全部是最深層目錄下的文件
+    prefix = "│  " * depth
+    for i in range(max(nodes - depth - 1, 0)):
+        lines.append(f"{prefix}├─ f{i}.py")
+    lines.append("```")
+    return "\n".join(lines) + "\n"
+
+
+def build_root_walk(events: Iterable[ParseEvent]) -> Dict:
+    """舊做法：每個節點都從根節點走到父目錄"""
+    structure = {}
+    path_stack: List[str] = []
+    for event in events:
+        if event.kind == EVENT_LEAVE_DIR:
+            path_stack.pop()
+            continue
+        is_dir = event.kind == EVENT_ENTER_DIR
+        node = {
+            'type': 'directory' if is_dir else 'file',
+            'name': event.name,
+            'comment': event.comment,
+            'children': {} if is_dir else None
+        }
+        current = structure
+        for part in path_stack:
+            current = current[part]['children']
+        current[event.name] = node
+        if is_dir:
+            path_stack.append(event.name)
+    return structure
+
+
+def time_call(func, repeat: int) -> float:
+    """取多次執行中的最短耗時（秒）"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="結構解析器深層樹基準測試")
+    parser.add_argument('--depths', type=int, nargs='+', default=[10, 50, 100, 200], help='樹的深度')
+    parser.add_argument('--nodes', type=int, default=100000, help='節點總數')
+    parser.add_argument('--repeat', type=int, default=3, help='每項重複次數')
+    args = parser.parse_args()
+
+    header = f"{'depth':>6} {'nodes':>8} {'attach root-walk':>17} {'attach stack':>13} {'speedup':>8} {'parse total':>12}"
+    print(header)
+    print('-' * len(header))
+    with tempfile.TemporaryDirectory() as tmp:
+        for depth in args.depths:
+            structure_file = Path(tmp) / f"deep_{depth}.md"
+            structure_file.write_text(build_deep_tree(depth, args.nodes), encoding='utf-8')
+            parser_obj = StructureParser(str(structure_file))
+            events = list(parser_obj.parse_iter())
+
+            legacy = time_call(lambda: build_root_walk(events), args.repeat)
+            current = time_call(lambda: parser_obj._build_structure(events), args.repeat)
+            total = time_call(parser_obj.parse, args.repeat)
+            print(f"{depth:>6} {args.nodes:>8} {legacy:>16.3f}s {current:>12.3f}s "
+                  f"{legacy / current:>7.1f}x {total:>11.3f}s")
+
+
+if __name__ == "__main__":
+    main()
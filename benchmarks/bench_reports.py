@@ -0,0 +1,97 @@
+"""
+報告生成基準測試
+
+比較 --generate-reports --all-langs 的兩種做法：
+- per-report: 9 份報告（3 種報告 × 3 種語言）各自建立 VerificationMetrics，
+  每次都重新解析結構文件並走訪生成的專案（舊做法）
+- shared: 指標只計算一次（VerificationMetrics.compute()），所有報告與語言共用
+
+用法:
+    python benchmarks/bench_reports.py --modules 200 --files 20
+"""
+import argparse
+import contextlib
+import io
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from i18n import LANG_EN, LANG_ZH_CN, LANG_ZH_TW, get_lang_suffix
+from main import generate_metrics_report_file, generate_report_files
+from generate_verification import generate_verification_report
+from generate_conclusion import generate_conclusion_report
+from project_generator import ProjectGenerator
+from progress import ProgressReporter
+from structure_parser import StructureParser
+from tree_snapshot import TreeSnapshot
+
+LANGUAGES = [LANG_ZH_TW, LANG_ZH_CN, LANG_EN]
+
+
+def build_project_structure(modules: int, files: int) -> str:
+    """system/project1 下 modules 個模組，每個模組 files 個 Python 文件（模組目錄帶註解）"""
+    lines = ["```", "system/", "└─ project1/", "   ├─ README.md"]
+    for m in range(modules):
+        last = m == modules - 1
+        lines.append("   " + ("└─ " if last else "├─ ") + f"module{m}/   ← 模組 {m}")
+        indent = "   " + ("   " if last else "│  ")
+        lines.append(indent + "├─ pyproject.toml")
+        lines.append(indent + "└─ src/")
+        for f in range(files):
+            lines.append(indent + "   " + ("└─ " if f == files - 1 else "├─ ") + f"f{f}.py")
+    lines.append("```")
+    return "\n".join(lines) + "\n"
+
+
+def per_report(structure_file: str, generated: str, report_dir: Path):
+    """舊做法：每份報告各自計算指標"""
+    for lang in LANGUAGES:
+        suffix = get_lang_suffix(lang)
+        generate_metrics_report_file(structure_file, generated, str(report_dir / f"METRICS{suffix}.md"), lang)
+        generate_verification_report(structure_file, generated, str(report_dir / f"VERIFICATION{suffix}.md"), lang)
+        generate_conclusion_report(structure_file, generated, str(report_dir / f"CONCLUSION{suffix}.md"), lang)
+
+
+def shared(structure_file: str, generated: str, report_dir: Path):
+    generate_report_files(structure_file, generated, report_dir, LANGUAGES)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="報告生成基準測試")
+    parser.add_argument('--modules', type=int, default=200, help='模組數量')
+    parser.add_argument('--files', type=int, default=20, help='每個模組的 Python 文件數量')
+    parser.add_argument('--repeat', type=int, default=3, help='每項重複次數（取最佳值）')
+    args = parser.parse_args()
+
+    work_dir = Path(tempfile.mkdtemp())
+    try:
+        structure_file = work_dir / "structure.md"
+        structure_file.write_text(build_project_structure(args.modules, args.files), encoding='utf-8')
+        generated = work_dir / "generated"
+        structure = StructureParser(str(structure_file)).parse()
+        ProjectGenerator(str(generated), workers=8, progress=ProgressReporter()).generate(structure)
+        snapshot = TreeSnapshot(generated / "system" / "project1")
+        print(f"{args.modules} 個模組：{len(snapshot.directories)} 個目錄、{len(snapshot.files)} 個文件")
+
+        baseline = None
+        for label, func in (("per-report", per_report), ("shared", shared)):
+            best = float('inf')
+            for i in range(args.repeat):
+                report_dir = work_dir / f"reports_{label}_{i}"
+                report_dir.mkdir()
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    func(str(structure_file), str(generated), report_dir)
+                best = min(best, time.perf_counter() - start)
+            baseline = baseline or best
+            print(f"{label:>10}: {best:7.3f}s  speedup {baseline / best:5.2f}x")
+    finally:
+        shutil.rmtree(work_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+寫入器系統呼叫基準測試
+
+比較以完整路徑操作的 DiskFileSystem 與保留目錄 fd 的 DirFdFileSystem：
+不需要 strace，直接包裝 os 模組與 open 計算檔案系統操作次數，並統計
+核心需要解析的路徑元件數（完整路徑為元件數，dir_fd 相對路徑為 1）。
+
+內建 open() 在 C 層級另外執行的操作無法包裝，依 _pyio.open(path, 'x') 實測
+計入：fstat 2 次、lseek 2 次、ioctl（isatty）1 次、write 1 次、close 1 次。
+
+用法:
+    python benchmarks/bench_writer.py --nodes 10000 100000
+"""
+import argparse
+import builtins
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from filesystem import DiskFileSystem, DirFdFileSystem
+from project_generator import ProjectGenerator
+from bench_generate import build_structure
+
+# 以路徑為第一個參數的操作
+_PATH_OPS = ('open', 'mkdir', 'stat', 'lstat', 'replace', 'link', 'unlink', 'rmdir', 'scandir')
+_OTHER_OPS = ('close', 'write', 'fstat', 'lseek', 'ioctl')
+# 內建 open() 開啟文字文件時隱含的操作
+_IMPLIED_BY_OPEN = {'fstat': 2, 'lseek': 2, 'ioctl': 1, 'write': 1, 'close': 1}
+
+
+@contextlib.contextmanager
+def count_operations(counts: Counter):
+    """包裝 os 函式與 open，累計每種操作的次數與解析的路徑元件數"""
+    originals = {}
+
+    def wrap(module, name, label, implied=None):
+        original = getattr(module, name)
+        originals[(module, name)] = original
+
+        def wrapper(*args, **kwargs):
+            counts[label] += 1
+            counts.update(implied or {})
+            if label in _PATH_OPS and args and isinstance(args[0], (str, os.PathLike)):
+                if kwargs.get('dir_fd') is not None or kwargs.get('src_dir_fd') is not None:
+                    counts['path_components'] += 1
+                else:
+                    path = os.path.abspath(os.fspath(args[0]))
+                    counts['path_components'] += len(Path(path).parts) - 1
+            return original(*args, **kwargs)
+
+        setattr(module, name, wrapper)
+
+    for name in _PATH_OPS + _OTHER_OPS:
+        if hasattr(os, name):
+            wrap(os, name, name)
+    wrap(builtins, 'open', 'open', _IMPLIED_BY_OPEN)
+    wrap(io, 'open', 'open', _IMPLIED_BY_OPEN)
+    try:
+        yield counts
+    finally:
+        for (module, name), original in originals.items():
+            setattr(module, name, original)
+
+
+def run(structure: dict, fs, count: bool):
+    output_dir = Path(tempfile.mkdtemp())
+    counts: Counter = Counter()
+    try:
+        generator = ProjectGenerator(str(output_dir / "out"), fs=fs)
+        plan = generator.plan(structure)
+        manager = count_operations(counts) if count else contextlib.nullcontext()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()), manager:
+            generator.generate(structure, plan=plan)
+        elapsed = time.perf_counter() - start
+    finally:
+        shutil.rmtree(output_dir)
+    return elapsed, counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="寫入器系統呼叫基準測試")
+    parser.add_argument('--nodes', type=int, nargs='+', default=[10000, 100000],
+                        help='樹的節點數（目錄與文件）')
+    parser.add_argument('--repeat', type=int, default=3, help='計時重複次數（取最佳值）')
+    args = parser.parse_args()
+
+    for nodes in args.nodes:
+        # build_structure 每個模組目錄有 20 個文件與 1 個 README.md，約 22 個節點
+        structure = build_structure(nodes * 20 // 22)
+        print(f"\n{nodes} 個節點")
+        baseline = None
+        for label, make_fs in (("path", DiskFileSystem), ("dir_fd", DirFdFileSystem)):
+            _, counts = run(structure, make_fs(), count=True)
+            elapsed = min(run(structure, make_fs(), count=False)[0] for _ in range(args.repeat))
+            baseline = baseline or elapsed
+            ops = sum(v for k, v in counts.items() if k != 'path_components')
+            detail = " ".join(f"{k}={counts[k]}" for k in _PATH_OPS + _OTHER_OPS if counts[k])
+            print(f"{label:>8}: {elapsed:7.3f}s  speedup {baseline / elapsed:4.2f}x  "
+                  f"ops={ops}  path_components={counts['path_components']}")
+            print(f"{'':>10}{detail}")
+
+
+if __name__ == "__main__":
+    main()
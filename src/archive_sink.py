@@ -0,0 +1,89 @@
+"""
+將生成計畫直接串流寫入壓縮檔（tar / tar.gz / zip）
+
+每個操作渲染後立即寫入壓縮檔，不建立暫存目錄；目標可以是文件路徑
+或不可 seek 的串流（例如 stdout），記憶體用量與樹的大小無關。
+"""
+import io
+import os
+import tarfile
+import time
+import zipfile
+from typing import BinaryIO, Dict, Iterable, Optional, Tuple, Union
+
+from generation_plan import PlanOperation, OP_MKDIR, OP_WRITE
+
+ARCHIVE_FORMATS = ('tar', 'tar.gz', 'zip')
+
+_DIR_MODE = 0o755
+_FILE_MODE = 0o644
+
+
+def _archive_time() -> float:
+    """壓縮檔內的修改時間（設定 SOURCE_DATE_EPOCH 時使用固定時間，便於重現）"""
+    epoch = os.environ.get('SOURCE_DATE_EPOCH')
+    return float(epoch) if epoch else time.time()
+
+
+def write_archive(operations: Iterable[Tuple[PlanOperation, Optional[str]]],
+                  target: Union[str, BinaryIO], fmt: str) -> Dict[str, int]:
+    """依序將 (操作, 內容) 寫入壓縮檔，返回 {'directories': n, 'files': m}
+
+    target 為路徑或二進位串流；fmt 為 ARCHIVE_FORMATS 之一。
+    """
+    if fmt not in ARCHIVE_FORMATS:
+        raise ValueError(f"不支援的壓縮格式: {fmt}")
+
+    if isinstance(target, (str, os.PathLike)):
+        with open(target, 'wb') as f:
+            return write_archive(operations, f, fmt)
+
+    if fmt == 'zip':
+        return _write_zip(operations, target)
+    return _write_tar(operations, target, 'w|gz' if fmt == 'tar.gz' else 'w|')
+
+
+def _write_tar(operations, stream: BinaryIO, mode: str) -> Dict[str, int]:
+    counts = {'directories': 0, 'files': 0}
+    mtime = _archive_time()
+    # 串流模式（w| / w|gz）不需要 seek，可直接寫到 stdout
+    with tarfile.open(fileobj=stream, mode=mode, format=tarfile.PAX_FORMAT) as tar:
+        for op, content in operations:
+            info = tarfile.TarInfo(op.path)
+            info.mtime = mtime
+            if op.op == OP_MKDIR:
+                info.type = tarfile.DIRTYPE
+                info.mode = _DIR_MODE
+                tar.addfile(info)
+                counts['directories'] += 1
+            elif op.op == OP_WRITE:
+                data = content.encode('utf-8')
+                info.size = len(data)
+                info.mode = _FILE_MODE
+                tar.addfile(info, io.BytesIO(data))
+                counts['files'] += 1
+            # TarFile 會保留每個項目的 TarInfo；只寫入時不需要，清除以維持固定記憶體
+            tar.members.clear()
+    return counts
+
+
+def _write_zip(operations, stream: BinaryIO) -> Dict[str, int]:
+    counts = {'directories': 0, 'files': 0}
+    # zip 格式最早只能表示 1980 年
+    date_time = max(time.localtime(_archive_time())[:6], (1980, 1, 1, 0, 0, 0))
+    # ZipFile 對不可 seek 的串流會改用資料描述區，仍可逐項寫入；
+    # zip 格式結尾的中央目錄需要每個項目一筆紀錄，這是唯一隨項目數增加的記憶體
+    with zipfile.ZipFile(stream, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for op, content in operations:
+            if op.op == OP_MKDIR:
+                info = zipfile.ZipInfo(op.path + '/', date_time)
+                info.external_attr = (0o40000 | _DIR_MODE) << 16 | 0x10
+                archive.writestr(info, b'')
+                counts['directories'] += 1
+            elif op.op == OP_WRITE:
+                info = zipfile.ZipInfo(op.path, date_time)
+                info.compress_type = zipfile.ZIP_DEFLATED
+                info.external_attr = (0o100000 | _FILE_MODE) << 16
+                archive.writestr(info, content.encode('utf-8'))
+                counts['files'] += 1
+    return counts
@@ -0,0 +1,127 @@
+"""
+批次解析多個結構文件（多程序）
+"""
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from structure_parser import StructureParser
+from structure_index import StructureIndex
+from parse_cache import ParseCache, default_parse_cache
+
+
+class BatchResult(NamedTuple):
+    """單一文件的解析結果"""
+    path: str
+    structure: Optional[Dict]   # include_structure=False 時為 None
+    directories: int
+    files: int
+    error: Optional[str]
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def find_structure_files(paths: Iterable[str], pattern: str = "*.md") -> List[Path]:
+    """展開文件與目錄參數，目錄內依 pattern 遞迴搜尋，結果排序且不重複"""
+    found = []
+    seen = set()
+    for raw in paths:
+        path = Path(raw)
+        candidates = sorted(path.rglob(pattern)) if path.is_dir() else [path]
+        for candidate in candidates:
+            if candidate.is_dir() or candidate in seen:
+                continue
+            seen.add(candidate)
+            found.append(candidate)
+    return found
+
+
+def _parse_one(path: str, use_cache: bool, include_structure: bool) -> BatchResult:
+    """解析單一文件，錯誤記錄在結果中而不拋出"""
+    try:
+        cache = ParseCache() if use_cache else None
+        structure = StructureParser(path, cache=cache).parse()
+    except Exception as e:
+        return BatchResult(path, None, 0, 0, f"{type(e).__name__}: {e}")
+
+    if not structure:
+        return BatchResult(path, None, 0, 0, "無法解析結構")
+
+    counts = StructureIndex(structure).counts
+    return BatchResult(path, structure if include_structure else None,
+                       counts['directories'], counts['files'], None)
+
+
+def parse_batch(paths: Iterable[str], workers: Optional[int] = None,
+                use_cache: Optional[bool] = None, include_structure: bool = True,
+                chunksize: Optional[int] = None) -> List[BatchResult]:
+    """批次解析結構文件，結果順序與輸入相同
+
+    workers 為 1 時在目前程序中依序解析；否則分批交給 ProcessPoolExecutor。
+    use_cache 預設跟隨 --no-parse-cache 設定。
+    """
+    paths = [str(p) for p in paths]
+    if use_cache is None:
+        use_cache = default_parse_cache() is not None
+    worker = partial(_parse_one, use_cache=use_cache, include_structure=include_structure)
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(paths) <= 1:
+        return [worker(p) for p in paths]
+
+    if chunksize is None:
+        # 每個程序約分到 4 批，兼顧負載平衡與程序間通訊成本
+        chunksize = max(1, len(paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(worker, paths, chunksize=chunksize))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """generate-project parse-batch 命令列入口，返回結束碼"""
+    parser = argparse.ArgumentParser(
+        prog="generate-project parse-batch",
+        description="批次解析多個結構文件並回報每個文件的結果"
+    )
+    parser.add_argument('paths', nargs='+', help='結構文件或包含結構文件的目錄')
+    parser.add_argument('--pattern', type=str, default='*.md', help='目錄中搜尋的文件樣式（預設: *.md）')
+    parser.add_argument('--workers', type=int, default=None, help='程序數量（預設: CPU 數量）')
+    parser.add_argument('--json', action='store_true', help='以 JSON Lines 輸出每個文件的結果')
+    parser.add_argument('--no-parse-cache', action='store_true',
+                        help='停用結構解析快取，每次重新解析結構文件')
+    args = parser.parse_args(argv)
+
+    files = find_structure_files(args.paths, args.pattern)
+    results = parse_batch(files, workers=args.workers, use_cache=not args.no_parse_cache,
+                          include_structure=False)
+
+    failed = 0
+    for result in results:
+        if not result.ok:
+            failed += 1
+        if args.json:
+            print(json.dumps({
+                'path': result.path,
+                'ok': result.ok,
+                'directories': result.directories,
+                'files': result.files,
+                'error': result.error
+            }, ensure_ascii=False))
+        elif result.ok:
+            print(f"[OK] {result.path} ({result.directories} dirs, {result.files} files)")
+        else:
+            print(f"[X] {result.path}: {result.error}")
+
+    if not args.json:
+        print(f"\n[*] 共 {len(results)} 個文件，成功 {len(results) - failed}，失敗 {failed}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
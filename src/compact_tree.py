@@ -0,0 +1,142 @@
+"""
+緊湊的結構樹表示（欄式儲存 + 字串駐留）
+"""
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from structure_parser import StructureParser, ParseEvent, EVENT_ENTER_DIR, EVENT_LEAVE_DIR
+
+# 根節點的父節點索引 / 沒有註解時的字串索引
+NO_PARENT = -1
+NO_COMMENT = -1
+
+
+class CompactTree:
+    """以平行陣列儲存的結構樹
+
+    節點依解析順序（先序）以索引表示：
+    - parents[i]: 父節點索引，根節點為 NO_PARENT
+    - name_ids[i]: 名稱在字串表中的索引
+    - comment_ids[i]: 註解在字串表中的索引，沒有註解為 NO_COMMENT
+    - dir_flags[i]: 1 為目錄，0 為文件
+
+    重複出現的名稱與註解（如 __init__.py、README.md）只儲存一份。
+    """
+
+    __slots__ = ('parents', 'name_ids', 'comment_ids', 'dir_flags', 'strings', '_string_ids')
+
+    def __init__(self):
+        self.parents = array('i')
+        self.name_ids = array('i')
+        self.comment_ids = array('i')
+        self.dir_flags = bytearray()
+        self.strings: List[str] = []
+        self._string_ids: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.parents)
+
+    def _intern(self, text: str) -> int:
+        """取得字串索引，首次出現時加入字串表"""
+        string_id = self._string_ids.get(text)
+        if string_id is None:
+            string_id = len(self.strings)
+            self.strings.append(text)
+            self._string_ids[text] = string_id
+        return string_id
+
+    def add_node(self, parent: int, name: str, comment: Optional[str], is_dir: bool) -> int:
+        """新增節點並返回其索引（父節點必須已存在）"""
+        self.parents.append(parent)
+        self.name_ids.append(self._intern(name))
+        self.comment_ids.append(NO_COMMENT if comment is None else self._intern(comment))
+        self.dir_flags.append(1 if is_dir else 0)
+        return len(self.parents) - 1
+
+    @classmethod
+    def from_events(cls, events: Iterable[ParseEvent]) -> 'CompactTree':
+        """由 StructureParser.parse_iter() 的事件建立"""
+        tree = cls()
+        open_dirs: List[int] = []
+        for event in events:
+            if event.kind == EVENT_LEAVE_DIR:
+                open_dirs.pop()
+                continue
+            parent = open_dirs[-1] if open_dirs else NO_PARENT
+            is_dir = event.kind == EVENT_ENTER_DIR
+            index = tree.add_node(parent, event.name, event.comment, is_dir)
+            if is_dir:
+                open_dirs.append(index)
+        return tree
+
+    @classmethod
+    def from_file(cls, structure_file: str) -> 'CompactTree':
+        """直接解析結構文件，不建立巢狀字典"""
+        return cls.from_events(StructureParser(structure_file).parse_iter())
+
+    @classmethod
+    def from_structure(cls, structure: Dict) -> 'CompactTree':
+        """由舊版巢狀結構字典建立"""
+        tree = cls()
+
+        def traverse(node: Dict, parent: int):
+            for name, info in node.items():
+                if not isinstance(info, dict):
+                    continue
+                is_dir = info.get('type') == 'directory'
+                index = tree.add_node(parent, info.get('name', name), info.get('comment'), is_dir)
+                if is_dir and info.get('children'):
+                    traverse(info['children'], index)
+
+        traverse(structure, NO_PARENT)
+        return tree
+
+    def name(self, index: int) -> str:
+        """節點名稱"""
+        return self.strings[self.name_ids[index]]
+
+    def comment(self, index: int) -> Optional[str]:
+        """節點註解"""
+        comment_id = self.comment_ids[index]
+        return None if comment_id == NO_COMMENT else self.strings[comment_id]
+
+    def is_dir(self, index: int) -> bool:
+        """是否為目錄"""
+        return self.dir_flags[index] == 1
+
+    def iter_paths(self) -> Iterator[Tuple[int, str]]:
+        """依先序產生 (節點索引, 完整路徑)"""
+        # 記錄目錄路徑供子節點組合；先序排列保證父節點先出現
+        dir_paths: Dict[int, str] = {}
+        strings = self.strings
+        for index, (parent, name_id) in enumerate(zip(self.parents, self.name_ids)):
+            name = strings[name_id]
+            path = f"{dir_paths[parent]}/{name}" if parent != NO_PARENT else name
+            if self.dir_flags[index]:
+                dir_paths[index] = path
+            yield index, path
+
+    def get_file_list(self) -> List[Tuple[str, str]]:
+        """返回所有文件的列表 (full_path, name)，格式同 StructureParser.get_file_list"""
+        return [(path, self.name(index)) for index, path in self.iter_paths() if not self.dir_flags[index]]
+
+    def get_directory_list(self) -> List[str]:
+        """返回所有目錄的列表，格式同 StructureParser.get_directory_list"""
+        return [path for index, path in self.iter_paths() if self.dir_flags[index]]
+
+    def to_dict(self) -> Dict:
+        """轉換為舊版巢狀結構字典"""
+        structure = {}
+        children: Dict[int, Dict] = {NO_PARENT: structure}
+        for index in range(len(self)):
+            is_dir = self.is_dir(index)
+            name = self.name(index)
+            node = {
+                'type': 'directory' if is_dir else 'file',
+                'name': name,
+                'comment': self.comment(index),
+                'children': {} if is_dir else None
+            }
+            children[self.parents[index]][name] = node
+            if is_dir:
+                children[index] = node['children']
+        return structure
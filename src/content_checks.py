@@ -0,0 +1,92 @@
+"""
+文件內容檢查引擎
+
+VerificationMetrics 的模板檢查與註解保留檢查共用同一次讀取：
+- 以執行緒池並行讀取文件（分批提交，減少每個文件一個 Future 的排程成本）
+- 分段讀取，規則需要的標記（例如 docstring 標記、[project] 標題、"name" 鍵）
+  都已找到就停止，不讀完整個文件
+- 最多讀取 max_bytes，超過上限仍未出現的標記視為不存在
+- 需要比對註解的文件讀到結尾（同樣受 max_bytes 限制）
+"""
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from typing import Callable, Dict, FrozenSet, List, NamedTuple, Optional, Tuple
+
+from filesystem import FileSystem
+from multi_pattern import AhoCorasick
+
+DEFAULT_WORKERS = 8
+DEFAULT_MAX_BYTES = 1024 * 1024
+DEFAULT_CHUNK_SIZE = 4096
+
+
+class ContentRule(NamedTuple):
+    """一種文件的內容檢查
+
+    build 由 (各標記是否出現, 是否有非空白內容) 產生檢查結果（不含 file）；
+    annotations 為 True 時另外比對預期註解。
+    """
+    markers: Tuple[str, ...]
+    build: Callable[[Dict[str, bool], bool], Dict]
+    annotations: bool = False
+
+
+class ContentResult(NamedTuple):
+    """單一文件的檢查結果"""
+    check: Dict                    # {'file': 相對路徑, 'passed': ..., ...}
+    annotations: FrozenSet[str]    # 文件中出現的預期註解
+
+
+class ContentChecker:
+    """並行、分段讀取文件並套用內容檢查規則"""
+
+    def __init__(self, fs: FileSystem, matcher: Optional[AhoCorasick] = None,
+                 workers: int = DEFAULT_WORKERS, max_bytes: Optional[int] = DEFAULT_MAX_BYTES,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.fs = fs
+        self.matcher = matcher
+        self.workers = workers
+        self.max_bytes = max_bytes
+        self.chunk_size = chunk_size
+
+    def check(self, relative_path: str, full_path: str, rule: ContentRule) -> ContentResult:
+        """檢查單一文件，無法讀取時 passed 為 False"""
+        found = dict.fromkeys(rule.markers, False)
+        remaining = set(rule.markers)
+        # 保留上一段結尾，找出跨段的標記
+        keep = max((len(marker) for marker in remaining), default=1) - 1
+        parts: Optional[List[str]] = [] if rule.annotations and self.matcher else None
+        has_content = False
+        tail = ''
+        try:
+            with closing(self.fs.read_chunks(full_path, self.chunk_size, self.max_bytes)) as chunks:
+                for chunk in chunks:
+                    if parts is not None:
+                        parts.append(chunk)
+                    if not has_content and chunk.strip():
+                        has_content = True
+                    if remaining:
+                        window = tail + chunk
+                        for marker in [m for m in remaining if m in window]:
+                            found[marker] = True
+                            remaining.discard(marker)
+                        tail = window[-keep:] if keep else ''
+                    if parts is None and has_content and not remaining:
+                        break
+        except (OSError, UnicodeDecodeError):
+            return ContentResult({'file': relative_path, 'passed': False}, frozenset())
+
+        annotations = frozenset(self.matcher.matches(''.join(parts))) if parts else frozenset()
+        return ContentResult({'file': relative_path, **rule.build(found, has_content)}, annotations)
+
+    def run(self, jobs: List[Tuple[str, str, ContentRule]]) -> List[ContentResult]:
+        """檢查 (相對路徑, 完整路徑, 規則) 列表，結果順序與 jobs 相同"""
+        check = self.check
+        if self.workers <= 1 or len(jobs) < 2:
+            return [check(*job) for job in jobs]
+
+        chunk_size = max(1, len(jobs) // (self.workers * 8))
+        batches = [jobs[i:i + chunk_size] for i in range(0, len(jobs), chunk_size)]
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            results = executor.map(lambda batch: [check(*job) for job in batch], batches)
+            return [result for batch_results in results for result in batch_results]
@@ -0,0 +1,163 @@
+"""
+磁碟快取的共用部分（結構解析快取與驗證結果快取共用）
+
+- 快取目錄：環境變數覆寫，否則為 XDG_CACHE_HOME（或 ~/.cache）下的
+  project-structure-generator/<子目錄>
+- 啟用開關：環境變數或 set_enabled()（對應各命令列的 --no-*-cache）
+- 以 marshal 格式存放項目，先寫入暫存檔再 os.replace；超過容量上限時依最近
+  使用時間（LRU）淘汰
+
+每個快取目錄的總大小在同一程序內記錄一次（第一次寫入時掃描目錄），之後由每次
+寫入累加；只有超過上限時才重新掃描，並淘汰到上限的 EVICT_LOW_WATER 比例，
+讓掃描成本分攤到多次寫入。其他程序的寫入在下一次掃描時才計入。
+"""
+import marshal
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# 預設容量上限（位元組）
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# 淘汰時降到上限的此比例以下
+EVICT_LOW_WATER = 0.8
+
+_CACHE_SUFFIX = '.marshal'
+
+# 快取目錄 -> 目前估計的總大小（位元組）
+_sizes: Dict[str, int] = {}
+
+
+class DiskCache:
+    """以鍵存放 marshal 項目的磁碟快取
+
+    子類別設定 CACHE_DIR_ENV（快取目錄環境變數）、NO_CACHE_ENV（停用環境變數）
+    與 SUBDIR（預設快取目錄下的子目錄名稱）。
+    """
+
+    CACHE_DIR_ENV = ''
+    NO_CACHE_ENV = ''
+    SUBDIR = ''
+    # None 表示依 NO_CACHE_ENV 決定
+    _enabled: Optional[bool] = None
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir) if cache_dir else self.default_cache_dir()
+        self.max_bytes = max_bytes
+
+    @classmethod
+    def default_cache_dir(cls) -> Path:
+        """預設快取目錄（可用 CACHE_DIR_ENV 覆寫）"""
+        override = os.environ.get(cls.CACHE_DIR_ENV)
+        if override:
+            return Path(override)
+        base = os.environ.get('XDG_CACHE_HOME') or str(Path.home() / '.cache')
+        return Path(base) / 'project-structure-generator' / cls.SUBDIR
+
+    @classmethod
+    def set_enabled(cls, enabled: bool):
+        """啟用或停用預設快取"""
+        cls._enabled = enabled
+
+    @classmethod
+    def enabled(cls) -> bool:
+        """預設快取是否啟用"""
+        if cls._enabled is None:
+            return not os.environ.get(cls.NO_CACHE_ENV)
+        return cls._enabled
+
+    @classmethod
+    def default(cls) -> Optional['DiskCache']:
+        """返回預設快取，停用時返回 None"""
+        return cls() if cls.enabled() else None
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{_CACHE_SUFFIX}"
+
+    def get(self, key: str) -> Optional[Any]:
+        """讀取快取，未命中或內容損壞時返回 None"""
+        entry = self._entry_path(key)
+        try:
+            # 一次讀入再解碼：marshal.load 直接讀取文件物件時每個物件都會呼叫一次 read
+            with open(entry, 'rb') as f:
+                value = marshal.loads(f.read())
+        except FileNotFoundError:
+            return None
+        except (EOFError, ValueError, TypeError, OSError):
+            # 損壞的快取項目直接移除
+            self._remove(entry)
+            return None
+
+        # 更新修改時間作為最近使用時間
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+        return value
+
+    def put(self, key: str, value: Any):
+        """寫入快取並在超過容量時淘汰最舊的項目"""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            entry = self._entry_path(key)
+            temp = entry.with_suffix(f".{os.getpid()}.tmp")
+            with open(temp, 'wb') as f:
+                marshal.dump(value, f)
+                size = f.tell()
+            try:
+                replaced = entry.stat().st_size
+            except OSError:
+                replaced = 0
+            os.replace(temp, entry)
+        except OSError:
+            # 快取寫入失敗不影響結果
+            return
+
+        total = _sizes.get(str(self.cache_dir))
+        if total is None:
+            # 第一次寫入：掃描一次取得目前大小（已包含剛寫入的項目）
+            self.evict()
+            return
+        total += size - replaced
+        _sizes[str(self.cache_dir)] = total
+        if total > self.max_bytes:
+            self.evict()
+
+    def evict(self):
+        """掃描快取目錄；總大小超過上限時依最近使用時間淘汰到上限的 EVICT_LOW_WATER 比例"""
+        entries = []
+        total = 0
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if not entry.name.endswith(_CACHE_SUFFIX):
+                        continue
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+                    total += stat.st_size
+        except OSError:
+            return
+
+        if total > self.max_bytes:
+            low_water = self.max_bytes * EVICT_LOW_WATER
+            entries.sort()
+            for _, size, path in entries:
+                if total <= low_water:
+                    break
+                self._remove(Path(path))
+                total -= size
+        _sizes[str(self.cache_dir)] = total
+
+    def clear(self):
+        """清除所有快取項目"""
+        _sizes.pop(str(self.cache_dir), None)
+        if not self.cache_dir.exists():
+            return
+        for entry in self.cache_dir.glob(f"*{_CACHE_SUFFIX}"):
+            self._remove(entry)
+
+    @staticmethod
+    def _remove(path: Path):
+        try:
+            path.unlink()
+        except OSError:
+            pass
@@ -0,0 +1,90 @@
+"""
+Markdown 圍欄代碼區塊索引
+
+單次掃描文件，記錄每個 ``` / ~~~ 區塊內容的位元組偏移與最近的標題，
+讓解析器只讀取被選取的區塊。
+"""
+import re
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Union
+
+# 可能包含樹狀結構的區塊資訊字串
+TREE_BLOCK_INFOS = frozenset({'', 'text', 'txt', 'tree', 'plaintext', 'plain'})
+
+_HEADING = re.compile(rb'^(#{1,6})\s+(.*?)\s*#*\s*$')
+
+
+class FencedBlock(NamedTuple):
+    """圍欄代碼區塊"""
+    index: int               # 文件中的第幾個區塊（從 0 開始）
+    heading: Optional[str]   # 區塊前最近的標題
+    info: str                # 開頭圍欄後的資訊字串（如 text、bash）
+    start: int               # 區塊內容起始位元組偏移（開頭圍欄的下一行）
+    end: int                 # 區塊內容結束位元組偏移（結尾圍欄所在行的開頭）
+
+    @property
+    def name(self) -> str:
+        """區塊名稱：標題或 block-<index>"""
+        return self.heading or f"block-{self.index}"
+
+
+def scan_fenced_blocks(path: Path) -> List[FencedBlock]:
+    """掃描文件中所有圍欄代碼區塊（只解碼標題與圍欄行）"""
+    blocks: List[FencedBlock] = []
+    heading: Optional[str] = None
+    fence: Optional[bytes] = None   # 開頭圍欄，例如 b'```'
+    info = ''
+    start = 0
+    offset = 0
+
+    with open(path, 'rb') as f:
+        for raw in f:
+            line_start = offset
+            offset += len(raw)
+            stripped = raw.strip()
+
+            if fence is None:
+                if stripped.startswith((b'```', b'~~~')):
+                    char = stripped[:1]
+                    body = stripped.lstrip(char)
+                    fence = stripped[:len(stripped) - len(body)]
+                    info = body.strip().split(b' ', 1)[0].decode('utf-8', 'replace').lower()
+                    start = offset
+                elif stripped.startswith(b'#'):
+                    match = _HEADING.match(stripped)
+                    if match:
+                        heading = match.group(2).decode('utf-8', 'replace')
+            elif stripped.startswith(fence) and not stripped.lstrip(fence[:1]):
+                blocks.append(FencedBlock(len(blocks), heading, info, start, line_start))
+                fence = None
+
+    # 未關閉的區塊延伸到文件結尾
+    if fence is not None:
+        blocks.append(FencedBlock(len(blocks), heading, info, start, offset))
+
+    return blocks
+
+
+def parse_block_selector(value: str) -> Union[int, str]:
+    """將命令列參數轉為區塊選擇器：純數字為索引，否則為標題"""
+    value = value.strip()
+    return int(value) if value.isdigit() else value
+
+
+def select_block(blocks: List[FencedBlock], selector: Union[int, str]) -> FencedBlock:
+    """依索引或標題選取區塊（標題先比對完全相同，再比對不分大小寫的部分字串）"""
+    if isinstance(selector, int):
+        if 0 <= selector < len(blocks):
+            return blocks[selector]
+        raise ValueError(f"找不到結構區塊: {selector}（共 {len(blocks)} 個區塊）")
+
+    for block in blocks:
+        if block.heading == selector:
+            return block
+
+    lowered = selector.lower()
+    for block in blocks:
+        if block.heading and lowered in block.heading.lower():
+            return block
+
+    raise ValueError(f"找不到結構區塊: {selector}")
@@ -0,0 +1,99 @@
+"""
+文件 / 目錄分類規則
+
+樹狀圖中的名稱依下列優先順序判斷：
+1. 名稱以 / 結尾：目錄
+2. 完全相同的文件名（Makefile、.gitignore、Dockerfile 等）：文件
+3. 已註冊的副檔名（.py、.rs、.cpp 等）：文件
+4. 其他：目錄
+
+每個名稱只做固定次數的集合查詢，與註冊規則的數量無關。
+"""
+import hashlib
+from typing import Dict, FrozenSet, Iterable, NamedTuple, Optional, Set
+
+
+class LanguagePack(NamedTuple):
+    """一組副檔名與文件名規則"""
+    suffixes: FrozenSet[str]    # 不含點、小寫
+    filenames: FrozenSet[str]   # 小寫的完整文件名
+
+
+def _pack(suffixes: str, filenames: str = "") -> LanguagePack:
+    return LanguagePack(frozenset(suffixes.split()), frozenset(filenames.lower().split()))
+
+
+# 內建語言包（涵蓋 examples/ 中的各語言範例）
+LANGUAGE_PACKS: Dict[str, LanguagePack] = {
+    'common': _pack(
+        "md markdown rst txt json toml yml yaml ini cfg conf lock csv xml "
+        "html htm css svg png jpg jpeg gif ico sh bash bat ps1 sql log env",
+        "Makefile GNUmakefile Dockerfile LICENSE NOTICE CHANGELOG AUTHORS Procfile "
+        ".gitignore .gitattributes .gitmodules .editorconfig .dockerignore .env",
+    ),
+    'python': _pack("py pyi pyx pxd ipynb", "Pipfile"),
+    'javascript': _pack(
+        "js jsx mjs cjs ts tsx vue svelte scss sass less map",
+        ".npmrc .nvmrc .prettierrc .eslintrc .babelrc",
+    ),
+    'rust': _pack("rs"),
+    'c': _pack("c h"),
+    'cpp': _pack("cpp cc cxx hpp hh hxx ipp"),
+}
+
+
+class FileClassifier:
+    """依註冊的語言包判斷名稱是文件還是目錄"""
+
+    def __init__(self, packs: Optional[Iterable[str]] = None):
+        self._suffixes: Set[str] = set()
+        self._filenames: Set[str] = set()
+        for pack in (LANGUAGE_PACKS if packs is None else packs):
+            self.register_pack(pack)
+
+    def register_pack(self, pack):
+        """註冊語言包（名稱或 LanguagePack）"""
+        if isinstance(pack, str):
+            try:
+                pack = LANGUAGE_PACKS[pack]
+            except KeyError:
+                raise ValueError(f"未知的語言包: {pack}") from None
+        self._suffixes.update(pack.suffixes)
+        self._filenames.update(pack.filenames)
+
+    def register_suffixes(self, *suffixes: str):
+        """註冊副檔名（可含或不含開頭的點）"""
+        self._suffixes.update(s.lower().lstrip('.') for s in suffixes)
+
+    def register_filenames(self, *filenames: str):
+        """註冊完整文件名"""
+        self._filenames.update(f.lower() for f in filenames)
+
+    def fingerprint(self) -> str:
+        """規則內容的雜湊（用於解析快取鍵，規則不同時快取不共用）"""
+        digest = hashlib.sha256()
+        digest.update(" ".join(sorted(self._suffixes)).encode('utf-8'))
+        digest.update(b"\0")
+        digest.update(" ".join(sorted(self._filenames)).encode('utf-8'))
+        return digest.hexdigest()[:16]
+
+    def is_directory(self, name: str, trailing_slash: bool = False) -> bool:
+        """判斷名稱是否為目錄；trailing_slash 表示樹狀圖中名稱以 / 結尾"""
+        if trailing_slash:
+            return True
+        lowered = name.lower()
+        if lowered in self._filenames:
+            return False
+        dot = lowered.rfind('.')
+        return dot < 0 or lowered[dot + 1:] not in self._suffixes
+
+
+_default_classifier: Optional[FileClassifier] = None
+
+
+def default_classifier() -> FileClassifier:
+    """共用的預設分類器（載入所有內建語言包）"""
+    global _default_classifier
+    if _default_classifier is None:
+        _default_classifier = FileClassifier()
+    return _default_classifier
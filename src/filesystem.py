@@ -0,0 +1,524 @@
+"""
+檔案系統介面
+
+ProjectGenerator 與 VerificationMetrics 透過此介面存取輸出目錄：
+- DiskFileSystem：實際磁碟
+- DirFdFileSystem：實際磁碟，保留目錄 fd 並以 dir_fd 相對路徑建立子項目
+- MemoryFileSystem：以字典儲存的記憶體檔案系統，生成後驗證可完全在記憶體中進行
+
+路徑可為 str 或 Path；文件內容一律為 UTF-8 文字。
+"""
+import codecs
+import errno
+import itertools
+import os
+import stat
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Set, Tuple, Union
+
+PathLike = Union[str, Path]
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+class ScanEntry(NamedTuple):
+    """scan() 產生的目錄項目與其 stat 資訊"""
+    name: str
+    size: int
+    mtime_ns: int
+    inode: int
+
+
+class FileSystem:
+    """檔案系統介面"""
+
+    def mkdir(self, path: PathLike, parents: bool = True, exist_ok: bool = True):
+        """建立目錄"""
+        raise NotImplementedError
+
+    def write(self, path: PathLike, content: str, overwrite: bool = False) -> bool:
+        """寫入文件；overwrite 為 False 時只在路徑不存在時寫入，返回是否寫入"""
+        raise NotImplementedError
+
+    def link(self, source: PathLike, target: PathLike, overwrite: bool = False) -> bool:
+        """建立與 source 共用內容的硬連結，語意同 write；不支援時拋出 OSError"""
+        raise NotImplementedError
+
+    def clone(self, source: PathLike, target: PathLike, overwrite: bool = False) -> bool:
+        """建立與 source 共用資料區塊的副本（reflink），語意同 write；不支援時拋出 OSError"""
+        raise NotImplementedError
+
+    def read(self, path: PathLike) -> str:
+        """讀取文件內容（不存在時拋出 FileNotFoundError）"""
+        raise NotImplementedError
+
+    def read_chunks(self, path: PathLike, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                    max_bytes: Optional[int] = None) -> Iterator[str]:
+        """依序產生文件內容的片段，最多讀取 max_bytes；呼叫端可隨時停止，不必讀完整個文件
+
+        預設實作讀取整個文件後以字元數切段。
+        """
+        content = self.read(path)
+        if max_bytes is not None:
+            content = content[:max_bytes]
+        for start in range(0, len(content), chunk_size):
+            yield content[start:start + chunk_size]
+
+    def exists(self, path: PathLike) -> bool:
+        raise NotImplementedError
+
+    def is_dir(self, path: PathLike) -> bool:
+        raise NotImplementedError
+
+    def is_file(self, path: PathLike) -> bool:
+        raise NotImplementedError
+
+    def remove(self, path: PathLike):
+        """刪除文件"""
+        raise NotImplementedError
+
+    def rmdir(self, path: PathLike):
+        """刪除空目錄（非空時拋出 OSError）"""
+        raise NotImplementedError
+
+    def walk(self, top: PathLike) -> Iterator[Tuple[str, List[str], List[str]]]:
+        """由上而下走訪目錄，同 os.walk 產生 (目錄, 子目錄名稱, 文件名稱)，名稱已排序"""
+        raise NotImplementedError
+
+    def scan(self, top: PathLike) -> Iterator[Tuple[str, List[ScanEntry], List[ScanEntry]]]:
+        """同 walk，但子目錄與文件附上大小、mtime_ns 與 inode（一次走訪取得所有資訊）"""
+        raise NotImplementedError
+
+    def close(self):
+        """釋放快取的資源（之後仍可繼續使用）"""
+
+
+# Linux 的 FICLONE ioctl（btrfs、XFS 等支援 reflink 的檔案系統）
+_FICLONE = 0x40049409
+
+
+def _temp_path(path: Path) -> Path:
+    return path.with_name(f"{path.name}.{os.getpid()}.tmp")
+
+
+class DiskFileSystem(FileSystem):
+    """實際磁碟"""
+
+    def mkdir(self, path: PathLike, parents: bool = True, exist_ok: bool = True):
+        Path(path).mkdir(parents=parents, exist_ok=exist_ok)
+
+    def write(self, path: PathLike, content: str, overwrite: bool = False) -> bool:
+        if not overwrite:
+            # O_EXCL：檢查與建立為同一個系統呼叫
+            try:
+                with open(path, 'x', encoding='utf-8') as f:
+                    f.write(content)
+            except FileExistsError:
+                return False
+            return True
+
+        # 覆寫時先寫暫存檔再取代，中斷時不會留下寫到一半的文件
+        path = Path(path)
+        temp = _temp_path(path)
+        with open(temp, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(temp, path)
+        return True
+
+    def link(self, source: PathLike, target: PathLike, overwrite: bool = False) -> bool:
+        if not overwrite:
+            try:
+                os.link(source, target)
+            except FileExistsError:
+                return False
+            return True
+
+        target = Path(target)
+        temp = _temp_path(target)
+        os.link(source, temp)
+        os.replace(temp, target)
+        return True
+
+    def clone(self, source: PathLike, target: PathLike, overwrite: bool = False) -> bool:
+        try:
+            import fcntl
+        except ImportError:
+            raise OSError(errno.EOPNOTSUPP, "此平台不支援 reflink") from None
+
+        destination = _temp_path(Path(target)) if overwrite else Path(target)
+        try:
+            dst = open(destination, 'xb')
+        except FileExistsError:
+            return False
+        try:
+            with dst, open(source, 'rb') as src:
+                fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+        except OSError:
+            os.unlink(destination)
+            raise
+        if overwrite:
+            os.replace(destination, target)
+        return True
+
+    def read(self, path: PathLike) -> str:
+        return Path(path).read_text(encoding='utf-8')
+
+    def read_chunks(self, path: PathLike, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                    max_bytes: Optional[int] = None) -> Iterator[str]:
+        # 以位元組分段讀取並逐段解碼，跨段的多位元組字元由增量解碼器處理
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        remaining = max_bytes
+        with open(path, 'rb') as f:
+            while remaining is None or remaining > 0:
+                size = chunk_size if remaining is None else min(chunk_size, remaining)
+                data = f.read(size)
+                # 讀到的位元組少於要求即已到文件結尾（小文件只需一次 read）
+                at_end = len(data) < size
+                if remaining is not None:
+                    remaining -= len(data)
+                text = decoder.decode(data, final=at_end)
+                if text:
+                    yield text
+                if at_end:
+                    return
+
+    def exists(self, path: PathLike) -> bool:
+        return os.path.exists(path)
+
+    def is_dir(self, path: PathLike) -> bool:
+        return os.path.isdir(path)
+
+    def is_file(self, path: PathLike) -> bool:
+        return os.path.isfile(path)
+
+    def remove(self, path: PathLike):
+        os.unlink(path)
+
+    def rmdir(self, path: PathLike):
+        os.rmdir(path)
+
+    def walk(self, top: PathLike) -> Iterator[Tuple[str, List[str], List[str]]]:
+        for dirpath, dirnames, filenames in os.walk(top):
+            dirnames.sort()
+            filenames.sort()
+            yield dirpath, dirnames, filenames
+
+    def scan(self, top: PathLike) -> Iterator[Tuple[str, List[ScanEntry], List[ScanEntry]]]:
+        # os.scandir 的類型來自目錄項目本身，每個項目只需一次 stat
+        stack = [os.fspath(top)]
+        while stack:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as it:
+                    entries = sorted(it, key=lambda entry: entry.name)
+            except OSError:
+                continue
+            dirs: List[ScanEntry] = []
+            files: List[ScanEntry] = []
+            descend: List[str] = []
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                    st = entry.stat()
+                except OSError:
+                    continue
+                info = ScanEntry(entry.name, st.st_size, st.st_mtime_ns, st.st_ino)
+                if is_dir:
+                    dirs.append(info)
+                    # 與 os.walk 相同，不進入目錄的符號連結
+                    if not entry.is_symlink():
+                        descend.append(entry.path)
+                else:
+                    files.append(info)
+            yield current, dirs, files
+            stack.extend(reversed(descend))
+
+
+# 平台是否支援以目錄 fd 為基準建立文件與目錄（Windows 不支援）
+DIR_FD_SUPPORTED = (os.open in os.supports_dir_fd and os.mkdir in os.supports_dir_fd
+                    and hasattr(os, 'O_DIRECTORY'))
+
+_CREATE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_CLOEXEC', 0)
+_REPLACE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_CLOEXEC', 0)
+_DIR_FLAGS = os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0) | getattr(os, 'O_CLOEXEC', 0)
+
+
+def _write_all(fd: int, data: bytes):
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+class DirFdFileSystem(DiskFileSystem):
+    """保留目錄 fd 的磁碟檔案系統
+
+    以路徑操作時，每次建立文件或目錄都要由輸出根目錄重新解析完整路徑；
+    此實作為每個目錄保留開啟的 fd，子項目以 os.open(..., dir_fd=) /
+    os.mkdir(..., dir_fd=) 建立，O_EXCL 讓存在檢查與建立為同一個系統呼叫。
+
+    每個執行緒各自保留最近使用的 max_open_dirs 個目錄 fd；生成依前序進行，
+    同一目錄的文件連續寫入，命中率很高。使用完畢後呼叫 close() 釋放 fd。
+    """
+
+    def __init__(self, max_open_dirs: int = 64):
+        if not DIR_FD_SUPPORTED:
+            raise OSError(errno.ENOTSUP, "此平台不支援 dir_fd")
+        self.max_open_dirs = max_open_dirs
+        self._local = threading.local()
+        self._caches: List['OrderedDict[str, int]'] = []
+        self._lock = threading.Lock()
+
+    def _cache(self) -> 'OrderedDict[str, int]':
+        cache = getattr(self._local, 'fds', None)
+        if cache is None:
+            cache = self._local.fds = OrderedDict()
+            with self._lock:
+                self._caches.append(cache)
+        return cache
+
+    def _dir_fd(self, directory: str) -> int:
+        """目錄的 fd（父目錄的 fd 已開啟時以相對路徑開啟）"""
+        cache = self._cache()
+        fd = cache.get(directory)
+        if fd is not None:
+            cache.move_to_end(directory)
+            return fd
+
+        parent, name = os.path.split(directory)
+        parent_fd = cache.get(parent) if name else None
+        if parent_fd is not None:
+            fd = os.open(name, _DIR_FLAGS, dir_fd=parent_fd)
+        else:
+            fd = os.open(directory or '.', _DIR_FLAGS)
+        cache[directory] = fd
+        if len(cache) > self.max_open_dirs:
+            os.close(cache.popitem(last=False)[1])
+        return fd
+
+    def _locate(self, path: PathLike) -> Tuple[int, str]:
+        """(父目錄 fd, 名稱)"""
+        parent, name = os.path.split(os.path.normpath(os.fspath(path)))
+        return self._dir_fd(parent), name
+
+    def mkdir(self, path: PathLike, parents: bool = True, exist_ok: bool = True):
+        path = os.path.normpath(os.fspath(path))
+        parent, name = os.path.split(path)
+        if not name:
+            # 根目錄或 '.'
+            return super().mkdir(path, parents=parents, exist_ok=exist_ok)
+        try:
+            os.mkdir(name, dir_fd=self._dir_fd(parent))
+        except FileNotFoundError:
+            if not parents or not parent:
+                raise
+            self.mkdir(parent, parents=True, exist_ok=True)
+            self.mkdir(path, parents=False, exist_ok=exist_ok)
+        except FileExistsError:
+            if not exist_ok or not self.is_dir(path):
+                raise
+
+    def write(self, path: PathLike, content: str, overwrite: bool = False) -> bool:
+        dir_fd, name = self._locate(path)
+        data = content.encode('utf-8')
+        if not overwrite:
+            try:
+                fd = os.open(name, _CREATE_FLAGS, 0o666, dir_fd=dir_fd)
+            except FileExistsError:
+                return False
+            try:
+                _write_all(fd, data)
+            finally:
+                os.close(fd)
+            return True
+
+        # 覆寫時先寫暫存檔再取代
+        temp = f"{name}.{os.getpid()}.tmp"
+        fd = os.open(temp, _REPLACE_FLAGS, 0o666, dir_fd=dir_fd)
+        try:
+            _write_all(fd, data)
+        finally:
+            os.close(fd)
+        os.replace(temp, name, src_dir_fd=dir_fd, dst_dir_fd=dir_fd)
+        return True
+
+    def _stat(self, path: PathLike):
+        try:
+            dir_fd, name = self._locate(path)
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        if not name:
+            return os.stat(dir_fd)
+        try:
+            return os.stat(name, dir_fd=dir_fd)
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+
+    def exists(self, path: PathLike) -> bool:
+        return self._stat(path) is not None
+
+    def is_dir(self, path: PathLike) -> bool:
+        st = self._stat(path)
+        return st is not None and stat.S_ISDIR(st.st_mode)
+
+    def is_file(self, path: PathLike) -> bool:
+        st = self._stat(path)
+        return st is not None and stat.S_ISREG(st.st_mode)
+
+    def rmdir(self, path: PathLike):
+        # 已刪除目錄的 fd 不能再用來建立子項目
+        key = os.path.normpath(os.fspath(path))
+        with self._lock:
+            for cache in self._caches:
+                fd = cache.pop(key, None)
+                if fd is not None:
+                    os.close(fd)
+        super().rmdir(path)
+
+    def close(self):
+        with self._lock:
+            for cache in self._caches:
+                for fd in cache.values():
+                    os.close(fd)
+                cache.clear()
+
+
+class MemoryFileSystem(FileSystem):
+    """以字典儲存的記憶體檔案系統
+
+    路徑以 os.path.normpath 正規化後作為鍵；相對路徑的最上層（'' 或 '.'）
+    與絕對路徑的根目錄視為已存在。
+    """
+
+    def __init__(self):
+        self._files: Dict[str, str] = {}
+        self._children: Dict[str, Set[str]] = {}   # 目錄 -> 子項目名稱
+        # 文件最後寫入的序號，scan() 以此作為 mtime_ns
+        self._mtimes: Dict[str, int] = {}
+        self._clock = itertools.count(1)
+
+    @staticmethod
+    def _key(path: PathLike) -> str:
+        return os.path.normpath(os.fspath(path))
+
+    @staticmethod
+    def _is_root(key: str) -> bool:
+        return key in ('', '.') or os.path.dirname(key) == key
+
+    def _dir_exists(self, key: str) -> bool:
+        return self._is_root(key) or key in self._children
+
+    def _link(self, key: str):
+        """在父目錄中登記子項目"""
+        parent = os.path.dirname(key)
+        if not self._is_root(parent) or parent in self._children:
+            self._children.setdefault(parent, set()).add(os.path.basename(key))
+
+    def mkdir(self, path: PathLike, parents: bool = True, exist_ok: bool = True):
+        key = self._key(path)
+        if key in self._files:
+            raise FileExistsError(f"文件已存在: {path}")
+        if self._dir_exists(key):
+            if not exist_ok:
+                raise FileExistsError(f"目錄已存在: {path}")
+            return
+
+        parent = os.path.dirname(key)
+        if not self._dir_exists(parent):
+            if not parents:
+                raise FileNotFoundError(f"找不到目錄: {parent}")
+            self.mkdir(parent, parents=True, exist_ok=True)
+        self._children[key] = set()
+        self._link(key)
+
+    def write(self, path: PathLike, content: str, overwrite: bool = False) -> bool:
+        key = self._key(path)
+        if key in self._children:
+            raise IsADirectoryError(f"是目錄: {path}")
+        if key in self._files and not overwrite:
+            return False
+        if not self._dir_exists(os.path.dirname(key)):
+            raise FileNotFoundError(f"找不到目錄: {os.path.dirname(key)}")
+        self._files[key] = content
+        self._mtimes[key] = next(self._clock)
+        self._link(key)
+        return True
+
+    def link(self, source: PathLike, target: PathLike, overwrite: bool = False) -> bool:
+        # 記憶體中的「連結」直接共用同一個字串物件
+        return self.write(target, self.read(source), overwrite)
+
+    clone = link
+
+    def read(self, path: PathLike) -> str:
+        key = self._key(path)
+        try:
+            return self._files[key]
+        except KeyError:
+            if key in self._children:
+                raise IsADirectoryError(f"是目錄: {path}") from None
+            raise FileNotFoundError(f"找不到文件: {path}") from None
+
+    def exists(self, path: PathLike) -> bool:
+        key = self._key(path)
+        return key in self._files or self._dir_exists(key)
+
+    def is_dir(self, path: PathLike) -> bool:
+        return self._dir_exists(self._key(path))
+
+    def is_file(self, path: PathLike) -> bool:
+        return self._key(path) in self._files
+
+    def remove(self, path: PathLike):
+        key = self._key(path)
+        if key not in self._files:
+            raise FileNotFoundError(f"找不到文件: {path}")
+        del self._files[key]
+        self._mtimes.pop(key, None)
+        self._children.get(os.path.dirname(key), set()).discard(os.path.basename(key))
+
+    def rmdir(self, path: PathLike):
+        key = self._key(path)
+        if key not in self._children:
+            raise FileNotFoundError(f"找不到目錄: {path}")
+        if self._children[key]:
+            raise OSError(f"目錄不是空的: {path}")
+        del self._children[key]
+        self._children.get(os.path.dirname(key), set()).discard(os.path.basename(key))
+
+    def walk(self, top: PathLike) -> Iterator[Tuple[str, List[str], List[str]]]:
+        top_key = self._key(top)
+        if top_key not in self._children:
+            return
+        stack = [top_key]
+        while stack:
+            current = stack.pop()
+            dirnames: List[str] = []
+            filenames: List[str] = []
+            for name in sorted(self._children.get(current, ())):
+                if os.path.join(current, name) in self._children:
+                    dirnames.append(name)
+                else:
+                    filenames.append(name)
+            yield current, dirnames, filenames
+            # 與 os.walk 相同，呼叫端可修改 dirnames 以略過子目錄
+            stack.extend(os.path.join(current, name) for name in reversed(dirnames))
+
+    def scan(self, top: PathLike) -> Iterator[Tuple[str, List[ScanEntry], List[ScanEntry]]]:
+        for dirpath, dirnames, filenames in self.walk(top):
+            dirs = [ScanEntry(name, 0, 0, 0) for name in dirnames]
+            files = []
+            for name in filenames:
+                key = os.path.join(dirpath, name)
+                files.append(ScanEntry(name, len(self._files[key].encode('utf-8')),
+                                       self._mtimes.get(key, 0), 0))
+            yield dirpath, dirs, files
+
+
+_default_fs = DiskFileSystem()
+
+
+def default_filesystem() -> FileSystem:
+    """預設的磁碟檔案系統"""
+    return _default_fs
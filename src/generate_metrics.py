@@ -6,6 +6,7 @@ import json
 import sys
 import os
 from pathlib import Path
+from typing import Mapping
 
 # 設置 Windows 控制台編碼支援 UTF-8
 if sys.platform == 'win32':
@@ -21,7 +22,12 @@ if sys.platform == 'win32':
 # 添加 src 目錄到路徑
 sys.path.insert(0, str(Path(__file__).parent))
 
-from verification_metrics import VerificationMetrics
+from verification_metrics import (
+    SCORE_WEIGHTS, VerificationMetrics, parse_metric_selection, overall_score as calculate_overall_score
+)
+from parse_cache import set_parse_cache_enabled
+from verification_cache import set_verification_cache_enabled
+from fenced_blocks import parse_block_selector
 from i18n import get_text, get_lang_suffix, LANG_EN, LANG_ZH_CN, LANG_ZH_TW, DEFAULT_LANG
 
 
@@ -30,111 +36,129 @@ def format_percentage(value: float) -> str:
     return f"{value * 100:.2f}%"
 
 
-def generate_report(metrics: dict, output_file: str = None, lang: str = DEFAULT_LANG):
-    """生成指標報告"""
+def _status(rate: float, good: float, fair: float) -> str:
+    """依門檻返回狀態符號"""
+    return '✅' if rate >= good else '⚠️' if rate >= fair else '❌'
+
+
+def generate_report(metrics: Mapping, output_file: str = None, lang: str = DEFAULT_LANG):
+    """生成指標報告（metrics 可為 dict 或 VerificationMetrics.compute() 的結果）
+
+    只包含部分指標時（--metrics）只輸出這些指標的章節，所有計分指標都在時才有總體分數。
+    """
     t = lambda key: get_text(key, lang)
 
     report = []
     report.append(f"# {t('metrics_title')}\n")
-    report.append(f"## 📊 {t('overall_metrics')}\n\n")
 
     # 計算總體分數
-    overall_score = (
-        metrics['structure_coverage']['overall_coverage'] * 0.3 +
-        metrics['file_coverage']['coverage_rate'] * 0.2 +
-        metrics['directory_coverage']['coverage_rate'] * 0.2 +
-        metrics['template_accuracy']['accuracy_rate'] * 0.1 +
-        metrics['hierarchy_accuracy']['overall_accuracy'] * 0.1 +
-        metrics['annotation_preservation']['preservation_rate'] * 0.05 +
-        metrics['module_independence']['independence_rate'] * 0.05
-    ) * 100
-
-    report.append(f"**{t('overall_score')}**: {overall_score:.2f}/100\n\n")
+    overall_score = None
+    if all(name in metrics for name, _, _ in SCORE_WEIGHTS):
+        overall_score = calculate_overall_score(metrics)
+        report.append(f"## 📊 {t('overall_metrics')}\n\n")
+        report.append(f"**{t('overall_score')}**: {overall_score:.2f}/100\n\n")
     report.append("---\n\n")
 
+    # 總結表格的列：(名稱, 分數, 狀態)
+    indicators = []
+
     # 1. 結構覆蓋率
-    report.append(f"## 1️⃣ {t('structure_coverage_title')}\n\n")
-    sc = metrics['structure_coverage']
-    report.append(f"- **{t('expected_directories')}**: {sc['expected_directories']}")
-    report.append(f"- **{t('actual_directories')}**: {sc['actual_directories']}")
-    report.append(f"- **{t('directory_coverage_rate')}**: {format_percentage(sc['directory_coverage_rate'])}")
-    report.append(f"- **{t('expected_files')}**: {sc['expected_files']}")
-    report.append(f"- **{t('actual_files')}**: {sc['actual_files']}")
-    report.append(f"- **{t('file_coverage_rate')}**: {format_percentage(sc['file_coverage_rate'])}")
-    report.append(f"- **{t('overall_coverage')}**: {format_percentage(sc['overall_coverage'])}\n\n")
+    if 'structure_coverage' in metrics:
+        report.append(f"## 1️⃣ {t('structure_coverage_title')}\n\n")
+        sc = metrics['structure_coverage']
+        report.append(f"- **{t('expected_directories')}**: {sc['expected_directories']}")
+        report.append(f"- **{t('actual_directories')}**: {sc['actual_directories']}")
+        report.append(f"- **{t('directory_coverage_rate')}**: {format_percentage(sc['directory_coverage_rate'])}")
+        report.append(f"- **{t('expected_files')}**: {sc['expected_files']}")
+        report.append(f"- **{t('actual_files')}**: {sc['actual_files']}")
+        report.append(f"- **{t('file_coverage_rate')}**: {format_percentage(sc['file_coverage_rate'])}")
+        report.append(f"- **{t('overall_coverage')}**: {format_percentage(sc['overall_coverage'])}\n\n")
+        indicators.append((t('structure_coverage'), sc['overall_coverage'] * 100, _status(sc['overall_coverage'], 0.95, 0.8)))
 
     # 2. 文件覆蓋率
-    report.append(f"## 2️⃣ {t('file_coverage_title')}\n\n")
-    fc = metrics['file_coverage']
-    report.append(f"- **{t('expected_files')}**: {fc['expected_count']}")
-    report.append(f"- **{t('actual_files')}**: {fc['actual_count']}")
-    report.append(f"- **{t('matched_count')}**: {fc['matched_count']}")
-    report.append(f"- **{t('file_coverage_rate')}**: {format_percentage(fc['coverage_rate'])}")
-    report.append(f"- **{t('accuracy_rate')}**: {format_percentage(fc['accuracy_rate'])}")
-    if fc['missing_files']:
-        report.append(f"\n**{t('missing_files')}** ({len(fc['missing_files'])} {t('items')}):")
-        for f in fc['missing_files'][:10]:  # 只顯示前10個
-            report.append(f"  - {f}")
-        if len(fc['missing_files']) > 10:
-            report.append(f"  - ... {t('more')} {len(fc['missing_files']) - 10} {t('items')}")
-    if fc['extra_files']:
-        report.append(f"\n**{t('extra_files')}** ({len(fc['extra_files'])} {t('items')}):")
-        for f in fc['extra_files'][:10]:
-            report.append(f"  - {f}")
-        if len(fc['extra_files']) > 10:
-            report.append(f"  - ... {t('more')} {len(fc['extra_files']) - 10} {t('items')}")
-    report.append("\n")
+    if 'file_coverage' in metrics:
+        report.append(f"## 2️⃣ {t('file_coverage_title')}\n\n")
+        fc = metrics['file_coverage']
+        report.append(f"- **{t('expected_files')}**: {fc['expected_count']}")
+        report.append(f"- **{t('actual_files')}**: {fc['actual_count']}")
+        report.append(f"- **{t('matched_count')}**: {fc['matched_count']}")
+        report.append(f"- **{t('file_coverage_rate')}**: {format_percentage(fc['coverage_rate'])}")
+        report.append(f"- **{t('accuracy_rate')}**: {format_percentage(fc['accuracy_rate'])}")
+        if fc['missing_files']:
+            report.append(f"\n**{t('missing_files')}** ({len(fc['missing_files'])} {t('items')}):")
+            for f in fc['missing_files'][:10]:  # 只顯示前10個
+                report.append(f"  - {f}")
+            if len(fc['missing_files']) > 10:
+                report.append(f"  - ... {t('more')} {len(fc['missing_files']) - 10} {t('items')}")
+        if fc['extra_files']:
+            report.append(f"\n**{t('extra_files')}** ({len(fc['extra_files'])} {t('items')}):")
+            for f in fc['extra_files'][:10]:
+                report.append(f"  - {f}")
+            if len(fc['extra_files']) > 10:
+                report.append(f"  - ... {t('more')} {len(fc['extra_files']) - 10} {t('items')}")
+        report.append("\n")
+        indicators.append((t('file_coverage'), fc['coverage_rate'] * 100, _status(fc['coverage_rate'], 0.95, 0.8)))
 
     # 3. 目錄覆蓋率
-    report.append(f"## 3️⃣ {t('directory_coverage_title')}\n\n")
-    dc = metrics['directory_coverage']
-    report.append(f"- **{t('expected_directories')}**: {dc['expected_count']}")
-    report.append(f"- **{t('actual_directories')}**: {dc['actual_count']}")
-    report.append(f"- **{t('matched_count')}**: {dc['matched_count']}")
-    report.append(f"- **{t('directory_coverage_rate')}**: {format_percentage(dc['coverage_rate'])}")
-    report.append(f"- **{t('accuracy_rate')}**: {format_percentage(dc['accuracy_rate'])}\n\n")
+    if 'directory_coverage' in metrics:
+        report.append(f"## 3️⃣ {t('directory_coverage_title')}\n\n")
+        dc = metrics['directory_coverage']
+        report.append(f"- **{t('expected_directories')}**: {dc['expected_count']}")
+        report.append(f"- **{t('actual_directories')}**: {dc['actual_count']}")
+        report.append(f"- **{t('matched_count')}**: {dc['matched_count']}")
+        report.append(f"- **{t('directory_coverage_rate')}**: {format_percentage(dc['coverage_rate'])}")
+        report.append(f"- **{t('accuracy_rate')}**: {format_percentage(dc['accuracy_rate'])}\n\n")
+        indicators.append((t('directory_coverage'), dc['coverage_rate'] * 100, _status(dc['coverage_rate'], 0.95, 0.8)))
 
     # 4. 模板準確性
-    report.append(f"## 4️⃣ {t('template_accuracy_title')}\n\n")
-    ta = metrics['template_accuracy']
-    report.append(f"- **{t('total_checks')}**: {ta['total_checks']}")
-    report.append(f"- **{t('passed_checks')}**: {ta['passed_checks']}")
-    report.append(f"- **{t('accuracy_rate')}**: {format_percentage(ta['accuracy_rate'])}\n\n")
+    if 'template_accuracy' in metrics:
+        report.append(f"## 4️⃣ {t('template_accuracy_title')}\n\n")
+        ta = metrics['template_accuracy']
+        report.append(f"- **{t('total_checks')}**: {ta['total_checks']}")
+        report.append(f"- **{t('passed_checks')}**: {ta['passed_checks']}")
+        report.append(f"- **{t('accuracy_rate')}**: {format_percentage(ta['accuracy_rate'])}\n\n")
+        indicators.append((t('template_accuracy'), ta['accuracy_rate'] * 100, _status(ta['accuracy_rate'], 0.9, 0.7)))
 
     # 5. 層級準確性
-    report.append(f"## 5️⃣ {t('hierarchy_accuracy_title')}\n\n")
-    ha = metrics['hierarchy_accuracy']
-    report.append(f"### {t('project_level')}\n")
-    pl = ha['project_level']
-    report.append(f"- **{t('passed_checks')}**: {pl['passed']}/{pl['total']}")
-    report.append(f"- **{t('accuracy_rate')}**: {format_percentage(pl['accuracy'])}\n")
-
-    report.append(f"### {t('module_level')}\n")
-    ml = ha['module_level']
-    report.append(f"- **{t('passed_checks')}**: {ml['passed']}/{ml['total']}")
-    report.append(f"- **{t('accuracy_rate')}**: {format_percentage(ml['accuracy'])}\n")
-
-    report.append(f"### {t('feature_level')}\n")
-    fl = ha['feature_level']
-    report.append(f"- **{t('passed_checks')}**: {fl['passed']}/{fl['total']}")
-    report.append(f"- **{t('accuracy_rate')}**: {format_percentage(fl['accuracy'])}\n")
-
-    report.append(f"### {t('overall_accuracy')}\n")
-    report.append(f"- **{t('overall_accuracy')}**: {format_percentage(ha['overall_accuracy'])}\n\n")
+    if 'hierarchy_accuracy' in metrics:
+        report.append(f"## 5️⃣ {t('hierarchy_accuracy_title')}\n\n")
+        ha = metrics['hierarchy_accuracy']
+        report.append(f"### {t('project_level')}\n")
+        pl = ha['project_level']
+        report.append(f"- **{t('passed_checks')}**: {pl['passed']}/{pl['total']}")
+        report.append(f"- **{t('accuracy_rate')}**: {format_percentage(pl['accuracy'])}\n")
+
+        report.append(f"### {t('module_level')}\n")
+        ml = ha['module_level']
+        report.append(f"- **{t('passed_checks')}**: {ml['passed']}/{ml['total']}")
+        report.append(f"- **{t('accuracy_rate')}**: {format_percentage(ml['accuracy'])}\n")
+
+        report.append(f"### {t('feature_level')}\n")
+        fl = ha['feature_level']
+        report.append(f"- **{t('passed_checks')}**: {fl['passed']}/{fl['total']}")
+        report.append(f"- **{t('accuracy_rate')}**: {format_percentage(fl['accuracy'])}\n")
+
+        report.append(f"### {t('overall_accuracy')}\n")
+        report.append(f"- **{t('overall_accuracy')}**: {format_percentage(ha['overall_accuracy'])}\n\n")
+        indicators.append((t('hierarchy_accuracy'), ha['overall_accuracy'] * 100, _status(ha['overall_accuracy'], 0.9, 0.7)))
 
     # 6. 註解保留率
-    report.append(f"## 6️⃣ {t('annotation_preservation_title')}\n\n")
-    ap = metrics['annotation_preservation']
-    report.append(f"- **{t('expected_annotations')}**: {ap['expected_count']}")
-    report.append(f"- **{t('preserved_annotations')}**: {ap['preserved_count']}")
-    report.append(f"- **{t('preservation_rate')}**: {format_percentage(ap['preservation_rate'])}\n\n")
+    if 'annotation_preservation' in metrics:
+        report.append(f"## 6️⃣ {t('annotation_preservation_title')}\n\n")
+        ap = metrics['annotation_preservation']
+        report.append(f"- **{t('expected_annotations')}**: {ap['expected_count']}")
+        report.append(f"- **{t('preserved_annotations')}**: {ap['preserved_count']}")
+        report.append(f"- **{t('preservation_rate')}**: {format_percentage(ap['preservation_rate'])}\n\n")
+        indicators.append((t('annotation_preservation'), ap['preservation_rate'] * 100, _status(ap['preservation_rate'], 0.8, 0.6)))
 
     # 7. 模組獨立性
-    report.append(f"## 7️⃣ {t('module_independence_title')}\n\n")
-    mi = metrics['module_independence']
-    report.append(f"- **{t('total_checks')}**: {mi['total_checks']}")
-    report.append(f"- **{t('passed_checks')}**: {mi['passed_checks']}")
-    report.append(f"- **{t('independence_rate')}**: {format_percentage(mi['independence_rate'])}\n\n")
+    if 'module_independence' in metrics:
+        report.append(f"## 7️⃣ {t('module_independence_title')}\n\n")
+        mi = metrics['module_independence']
+        report.append(f"- **{t('total_checks')}**: {mi['total_checks']}")
+        report.append(f"- **{t('passed_checks')}**: {mi['passed_checks']}")
+        report.append(f"- **{t('independence_rate')}**: {format_percentage(mi['independence_rate'])}\n\n")
+        indicators.append((t('module_independence'), mi['independence_rate'] * 100, _status(mi['independence_rate'], 0.9, 0.7)))
 
     # 總結
     report.append("---\n\n")
@@ -142,29 +166,20 @@ def generate_report(metrics: dict, output_file: str = None, lang: str = DEFAULT_
     report.append(f"| {t('metric_category')} | {t('score')} | {t('status')} |\n")
     report.append("|---------|------|------|\n")
 
-    indicators = [
-        (t('structure_coverage'), sc['overall_coverage'] * 100, '✅' if sc['overall_coverage'] >= 0.95 else '⚠️' if sc['overall_coverage'] >= 0.8 else '❌'),
-        (t('file_coverage'), fc['coverage_rate'] * 100, '✅' if fc['coverage_rate'] >= 0.95 else '⚠️' if fc['coverage_rate'] >= 0.8 else '❌'),
-        (t('directory_coverage'), dc['coverage_rate'] * 100, '✅' if dc['coverage_rate'] >= 0.95 else '⚠️' if dc['coverage_rate'] >= 0.8 else '❌'),
-        (t('template_accuracy'), ta['accuracy_rate'] * 100, '✅' if ta['accuracy_rate'] >= 0.9 else '⚠️' if ta['accuracy_rate'] >= 0.7 else '❌'),
-        (t('hierarchy_accuracy'), ha['overall_accuracy'] * 100, '✅' if ha['overall_accuracy'] >= 0.9 else '⚠️' if ha['overall_accuracy'] >= 0.7 else '❌'),
-        (t('annotation_preservation'), ap['preservation_rate'] * 100, '✅' if ap['preservation_rate'] >= 0.8 else '⚠️' if ap['preservation_rate'] >= 0.6 else '❌'),
-        (t('module_independence'), mi['independence_rate'] * 100, '✅' if mi['independence_rate'] >= 0.9 else '⚠️' if mi['independence_rate'] >= 0.7 else '❌'),
-    ]
-
     for name, score, status in indicators:
         report.append(f"| {name} | {score:.2f}% | {status} |\n")
 
-    report.append(f"\n**{t('overall_score')}**: {overall_score:.2f}/100\n")
+    if overall_score is not None:
+        report.append(f"\n**{t('overall_score')}**: {overall_score:.2f}/100\n")
 
-    if overall_score >= 90:
-        report.append(f"\n✅ **{t('excellent')}** - {t('excellent_desc')}\n")
-    elif overall_score >= 80:
-        report.append(f"\n⚠️ **{t('good')}** - {t('good_desc')}\n")
-    elif overall_score >= 70:
-        report.append(f"\n⚠️ **{t('pass')}** - {t('pass_desc')}\n")
-    else:
-        report.append(f"\n❌ **{t('fail')}** - {t('fail_desc')}\n")
+        if overall_score >= 90:
+            report.append(f"\n✅ **{t('excellent')}** - {t('excellent_desc')}\n")
+        elif overall_score >= 80:
+            report.append(f"\n⚠️ **{t('good')}** - {t('good_desc')}\n")
+        elif overall_score >= 70:
+            report.append(f"\n⚠️ **{t('pass')}** - {t('pass_desc')}\n")
+        else:
+            report.append(f"\n❌ **{t('fail')}** - {t('fail_desc')}\n")
 
     report_text = ''.join(report)
 
@@ -188,27 +203,35 @@ def main():
                        help='語言選擇: en, zh-CN, zh-TW (預設: zh-TW)')
     parser.add_argument('--all-langs', action='store_true',
                        help='生成所有語言版本的報告')
+    parser.add_argument('--block', type=str,
+                       help='只使用結構文件中的指定區塊（索引或標題）')
+    parser.add_argument('--metrics', type=str,
+                       help='只計算指定的指標（逗號分隔，例如 file_coverage,directory_coverage）；'
+                            'Markdown 報告只包含這些指標，所有計分指標都選取時才有總體分數')
+    parser.add_argument('--no-parse-cache', action='store_true',
+                       help='停用結構解析快取，每次重新解析結構文件')
+    parser.add_argument('--no-verify-cache', action='store_true',
+                       help='停用驗證結果快取，每次重新讀取所有生成的文件')
 
     args = parser.parse_args()
+    selection = None
+    if args.metrics:
+        try:
+            selection = parse_metric_selection(args.metrics)
+        except ValueError as e:
+            parser.error(str(e))
+    if args.no_parse_cache:
+        set_parse_cache_enabled(False)
+    if args.no_verify_cache:
+        set_verification_cache_enabled(False)
 
     try:
-        metrics_calculator = VerificationMetrics(args.structure, args.generated)
-        metrics = metrics_calculator.calculate_all_metrics()
-
-        # 計算總體分數
-        overall_score = (
-            metrics['structure_coverage']['overall_coverage'] * 0.3 +
-            metrics['file_coverage']['coverage_rate'] * 0.2 +
-            metrics['directory_coverage']['coverage_rate'] * 0.2 +
-            metrics['template_accuracy']['accuracy_rate'] * 0.1 +
-            metrics['hierarchy_accuracy']['overall_accuracy'] * 0.1 +
-            metrics['annotation_preservation']['preservation_rate'] * 0.05 +
-            metrics['module_independence']['independence_rate'] * 0.05
-        ) * 100
-        metrics['overall_score'] = overall_score
+        block = parse_block_selector(args.block) if args.block else None
+        # 只計算一次，所有語言版本共用
+        metrics = VerificationMetrics(args.structure, args.generated, block=block).compute(selection)
 
         if args.json:
-            output = json.dumps(metrics, indent=2, ensure_ascii=False)
+            output = json.dumps(metrics.to_dict(), indent=2, ensure_ascii=False)
             if args.output:
                 Path(args.output).write_text(output, encoding='utf-8')
             else:
@@ -4,6 +4,7 @@
 import argparse
 import sys
 from pathlib import Path
+from typing import Mapping, Optional
 
 # 設置 Windows 控制台編碼支援 UTF-8
 if sys.platform == 'win32':
@@ -18,16 +19,23 @@ if sys.platform == 'win32':
 sys.path.insert(0, str(Path(__file__).parent))
 
 from verification_metrics import VerificationMetrics
+from parse_cache import set_parse_cache_enabled
+from verification_cache import set_verification_cache_enabled
+from fenced_blocks import parse_block_selector
 from i18n import get_text, get_lang_suffix, LANG_EN, LANG_ZH_CN, LANG_ZH_TW, DEFAULT_LANG
 
 
 def generate_verification_report(structure_file: str, generated_path: str,
-                                 output_file: str = None, lang: str = DEFAULT_LANG):
-    """生成驗證報告"""
+                                 output_file: str = None, lang: str = DEFAULT_LANG,
+                                 block=None, fs=None, metrics: Optional[Mapping] = None):
+    """生成驗證報告（fs 為讀取生成結果的檔案系統，預設為磁碟）
+
+    metrics 為已計算的指標（VerificationMetrics.compute()）時不再重新計算。
+    """
     t = lambda key: get_text(key, lang)
 
-    metrics_calculator = VerificationMetrics(structure_file, generated_path)
-    metrics = metrics_calculator.calculate_all_metrics()
+    if metrics is None:
+        metrics = VerificationMetrics(structure_file, generated_path, block=block, fs=fs).compute()
 
     # 統計資訊
     sc = metrics['structure_coverage']
@@ -120,24 +128,37 @@ def main():
                        help='語言選擇: en, zh-CN, zh-TW (預設: zh-TW)')
     parser.add_argument('--all-langs', action='store_true',
                        help='生成所有語言版本的報告')
+    parser.add_argument('--block', type=str,
+                       help='只使用結構文件中的指定區塊（索引或標題）')
+    parser.add_argument('--no-parse-cache', action='store_true',
+                       help='停用結構解析快取，每次重新解析結構文件')
+    parser.add_argument('--no-verify-cache', action='store_true',
+                       help='停用驗證結果快取，每次重新讀取所有生成的文件')
 
     args = parser.parse_args()
+    if args.no_parse_cache:
+        set_parse_cache_enabled(False)
+    if args.no_verify_cache:
+        set_verification_cache_enabled(False)
+    block = parse_block_selector(args.block) if args.block else None
 
     try:
         if args.all_langs:
             languages = [LANG_ZH_TW, LANG_ZH_CN, LANG_EN]
+            metrics = VerificationMetrics(args.structure, args.generated, block=block).compute()
             for lang in languages:
                 if args.output:
                     output_file = args.output.replace('.md', '') + get_lang_suffix(lang) + '.md'
                 else:
                     output_file = f"VERIFICATION{get_lang_suffix(lang)}.md"
-                generate_verification_report(args.structure, args.generated, output_file, lang)
+                generate_verification_report(args.structure, args.generated, output_file, lang, block,
+                                             metrics=metrics)
         else:
             if args.output:
                 output_file = args.output.replace('.md', '') + get_lang_suffix(args.lang) + '.md'
             else:
                 output_file = f"VERIFICATION{get_lang_suffix(args.lang)}.md"
-            generate_verification_report(args.structure, args.generated, output_file, args.lang)
+            generate_verification_report(args.structure, args.generated, output_file, args.lang, block)
 
     except Exception as e:
         print(f"❌ 錯誤: {e}", file=sys.stderr)
@@ -0,0 +1,66 @@
+"""
+生成清單：記錄輸出目錄中由生成器寫入的文件
+
+清單存放在輸出目錄根部（.generation_manifest.json），每個文件記錄
+模板、參數雜湊與內容雜湊。增量生成時據此判斷哪些文件需要重寫、
+哪些文件已被使用者修改而應保留，以及哪些文件已從結構中移除。
+"""
+import json
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+from filesystem import FileSystem, default_filesystem
+
+MANIFEST_NAME = '.generation_manifest.json'
+MANIFEST_FORMAT = 'generation-manifest'
+MANIFEST_FORMAT_VERSION = 1
+
+
+class ManifestEntry(NamedTuple):
+    """單一生成文件的紀錄"""
+    template: Optional[str]
+    params: Optional[str]    # 模板參數雜湊
+    content: str             # 內容雜湊
+
+
+class GenerationManifest:
+    """生成清單"""
+
+    def __init__(self, files: Optional[Dict[str, ManifestEntry]] = None,
+                 directories: Optional[List[str]] = None):
+        self.files: Dict[str, ManifestEntry] = files or {}
+        self.directories: List[str] = directories or []
+
+    @staticmethod
+    def path_for(output_dir: Path) -> Path:
+        return Path(output_dir) / MANIFEST_NAME
+
+    @classmethod
+    def load(cls, output_dir: Path, fs: Optional[FileSystem] = None) -> 'GenerationManifest':
+        """讀取輸出目錄中的清單，不存在或格式不符時返回空清單"""
+        fs = fs if fs is not None else default_filesystem()
+        try:
+            data = json.loads(fs.read(cls.path_for(output_dir)))
+        except (OSError, ValueError):
+            return cls()
+        if (not isinstance(data, dict) or data.get('format') != MANIFEST_FORMAT
+                or data.get('version') != MANIFEST_FORMAT_VERSION):
+            return cls()
+
+        files = {
+            path: ManifestEntry(entry.get('template'), entry.get('params'), entry['content'])
+            for path, entry in data.get('files', {}).items()
+        }
+        return cls(files, list(data.get('directories', [])))
+
+    def save(self, output_dir: Path, fs: Optional[FileSystem] = None):
+        """寫入清單（磁碟上先寫暫存檔再取代，避免中斷時留下損壞的清單）"""
+        fs = fs if fs is not None else default_filesystem()
+        data = {
+            'format': MANIFEST_FORMAT,
+            'version': MANIFEST_FORMAT_VERSION,
+            'files': {path: entry._asdict() for path, entry in sorted(self.files.items())},
+            'directories': self.directories,
+        }
+        fs.write(self.path_for(output_dir),
+                 json.dumps(data, ensure_ascii=False, indent=1) + "\n", overwrite=True)
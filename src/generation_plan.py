@@ -0,0 +1,189 @@
+"""
+生成計畫：由解析後的結構一次計算出的有序操作列表
+
+- mkdir：建立目錄
+- write：寫入文件（內容以雜湊引用 blobs，相同內容只存一份）
+- skip：不寫入（例如被目錄自動產生的 README.md 取代）
+
+乾跑模式列出計畫、生成器依序執行計畫、驗證時將輸出目錄與計畫比對；
+計畫可存成 JSON Lines，不需重新解析結構即可檢視或重播。
+"""
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from filesystem import FileSystem, default_filesystem
+
+# 操作類型
+OP_MKDIR = 'mkdir'
+OP_WRITE = 'write'
+OP_SKIP = 'skip'
+
+# 寫入來源
+KIND_README = 'readme'   # 目錄自動產生的 README.md
+KIND_FILE = 'file'       # 結構中列出的文件
+
+# 略過原因
+SKIP_DUPLICATE = 'duplicate'
+
+PLAN_FORMAT = 'generation-plan'
+PLAN_FORMAT_VERSION = 1
+
+
+class PlanOperation(NamedTuple):
+    """計畫中的單一操作"""
+    op: str                     # OP_MKDIR / OP_WRITE / OP_SKIP
+    path: str                   # 相對於輸出目錄、以 / 連接的路徑
+    kind: Optional[str] = None  # write / skip：KIND_README 或 KIND_FILE
+    content_ref: Optional[str] = None  # write：內容雜湊
+    reason: Optional[str] = None       # skip：略過原因
+    template: Optional[str] = None     # write：使用的模板
+    params_hash: Optional[str] = None  # write：模板參數雜湊
+
+
+class PlanDiff(NamedTuple):
+    """輸出目錄與計畫的差異"""
+    missing_directories: List[str]
+    missing_files: List[str]
+    changed_files: List[str]    # 存在但內容與計畫不同（例如生成前已存在的文件）
+
+    @property
+    def ok(self) -> bool:
+        return not (self.missing_directories or self.missing_files or self.changed_files)
+
+
+def content_hash(content: str) -> str:
+    """內容雜湊（SHA-256）"""
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def params_hash(params: Dict) -> str:
+    """模板參數雜湊"""
+    return content_hash(json.dumps(params, sort_keys=True, ensure_ascii=False))
+
+
+class GenerationPlan:
+    """有序的生成操作列表"""
+
+    def __init__(self):
+        self.operations: List[PlanOperation] = []
+        self.blobs: Dict[str, str] = {}
+
+    def __iter__(self) -> Iterator[PlanOperation]:
+        return iter(self.operations)
+
+    def __len__(self) -> int:
+        return len(self.operations)
+
+    def add(self, op: PlanOperation, content: Optional[str] = None):
+        """加入已建立的操作（write 需附上內容）"""
+        if op.op == OP_WRITE:
+            self.blobs.setdefault(op.content_ref, content)
+        self.operations.append(op)
+
+    def content(self, op: PlanOperation) -> str:
+        """取得寫入操作的內容"""
+        return self.blobs[op.content_ref]
+
+    def iter_with_content(self) -> Iterator[Tuple[PlanOperation, Optional[str]]]:
+        """依序產生 (操作, 內容)，非寫入操作的內容為 None"""
+        for op in self.operations:
+            yield op, self.blobs[op.content_ref] if op.op == OP_WRITE else None
+
+    @property
+    def counts(self) -> Dict[str, int]:
+        counts = {OP_MKDIR: 0, OP_WRITE: 0, OP_SKIP: 0}
+        for op in self.operations:
+            counts[op.op] += 1
+        return counts
+
+    def describe(self) -> Iterator[str]:
+        """乾跑模式輸出的文字行"""
+        for op in self.operations:
+            if op.op == OP_MKDIR:
+                yield f"[DIR] {op.path}"
+            elif op.op == OP_WRITE:
+                yield f"[FILE] {op.path}"
+            else:
+                yield f"[SKIP] {op.path} ({op.reason})"
+        counts = self.counts
+        yield (f"\n共 {counts[OP_MKDIR]} 個目錄、{counts[OP_WRITE]} 個文件"
+               f"、略過 {counts[OP_SKIP]} 個")
+
+    def diff(self, output_dir: Path, fs: Optional[FileSystem] = None) -> PlanDiff:
+        """比對輸出目錄與計畫"""
+        output_dir = Path(output_dir)
+        fs = fs if fs is not None else default_filesystem()
+        missing_directories: List[str] = []
+        missing_files: List[str] = []
+        changed_files: List[str] = []
+
+        for op in self.operations:
+            target = output_dir / op.path
+            if op.op == OP_MKDIR:
+                if not fs.is_dir(target):
+                    missing_directories.append(op.path)
+            elif op.op == OP_WRITE:
+                try:
+                    actual = fs.read(target)
+                except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+                    missing_files.append(op.path)
+                    continue
+                except (OSError, UnicodeDecodeError):
+                    changed_files.append(op.path)
+                    continue
+                if actual != self.content(op):
+                    changed_files.append(op.path)
+
+        return PlanDiff(missing_directories, missing_files, changed_files)
+
+    def save_jsonl(self, path: Path):
+        """存成 JSON Lines：標頭、內容紀錄（首次引用前輸出一次）與操作紀錄"""
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'format': PLAN_FORMAT, 'version': PLAN_FORMAT_VERSION}) + "\n")
+            written = set()
+            for op in self.operations:
+                if op.content_ref is not None and op.content_ref not in written:
+                    written.add(op.content_ref)
+                    f.write(json.dumps({'blob': op.content_ref, 'content': self.content(op)},
+                                       ensure_ascii=False) + "\n")
+                record = {'op': op.op, 'path': op.path}
+                if op.kind is not None:
+                    record['kind'] = op.kind
+                if op.content_ref is not None:
+                    record['ref'] = op.content_ref
+                if op.reason is not None:
+                    record['reason'] = op.reason
+                if op.template is not None:
+                    record['template'] = op.template
+                if op.params_hash is not None:
+                    record['params'] = op.params_hash
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    @classmethod
+    def load_jsonl(cls, path: Path) -> 'GenerationPlan':
+        """讀取 save_jsonl 輸出的計畫"""
+        plan = cls()
+        with open(path, 'r', encoding='utf-8') as f:
+            header = json.loads(f.readline() or 'null')
+            if not isinstance(header, dict) or header.get('format') != PLAN_FORMAT:
+                raise ValueError(f"不是生成計畫文件: {path}")
+            if header.get('version') != PLAN_FORMAT_VERSION:
+                raise ValueError(f"不支援的生成計畫版本: {header.get('version')}")
+
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if 'blob' in record:
+                    plan.blobs[record['blob']] = record['content']
+                    continue
+                op = PlanOperation(record['op'], record['path'], record.get('kind'),
+                                   record.get('ref'), record.get('reason'),
+                                   record.get('template'), record.get('params'))
+                if op.op == OP_WRITE:
+                    if op.content_ref not in plan.blobs:
+                        raise ValueError(f"生成計畫缺少內容: {op.path}")
+                plan.operations.append(op)
+        return plan
@@ -5,6 +5,7 @@ import argparse
 import sys
 import os
 from pathlib import Path
+from typing import List, Mapping, Optional
 
 # 設置 Windows 控制台編碼支援 UTF-8
 if sys.platform == 'win32':
@@ -21,7 +22,14 @@ if sys.platform == 'win32':
 sys.path.insert(0, str(Path(__file__).parent))
 
 from structure_parser import StructureParser
-from project_generator import ProjectGenerator
+from parse_cache import default_parse_cache, set_parse_cache_enabled
+from verification_cache import set_verification_cache_enabled
+from fenced_blocks import parse_block_selector
+from project_generator import ProjectGenerator, DEDUP_MODES
+from generation_plan import GenerationPlan
+from archive_sink import ARCHIVE_FORMATS
+from filesystem import DirFdFileSystem, MemoryFileSystem
+from progress import PROGRESS_JSON, PROGRESS_MODES, PROGRESS_TEXT, create_reporter
 from verification_metrics import VerificationMetrics
 from generate_metrics import generate_report as generate_metrics_report
 from generate_verification import generate_verification_report
@@ -30,6 +38,11 @@ from i18n import LANG_EN, LANG_ZH_CN, LANG_ZH_TW, DEFAULT_LANG, get_lang_suffix
 
 
 def main():
+    # 子命令：generate-project parse-batch <目錄或文件...>
+    if len(sys.argv) > 1 and sys.argv[1] == 'parse-batch':
+        from batch_parser import main as parse_batch_main
+        sys.exit(parse_batch_main(sys.argv[2:]))
+
     parser = argparse.ArgumentParser(
         description="根據 README.md 中的結構描述生成專案目錄和文件"
     )
@@ -88,8 +101,103 @@ def main():
         type=str,
         help="報告輸出目錄（預設: 專案根目錄）"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="並行寫入文件的執行緒數量（預設: 1，依序寫入）"
+    )
+    parser.add_argument(
+        "--dedup",
+        type=str,
+        choices=list(DEDUP_MODES),
+        help="內容相同的文件只寫入一次，其餘以硬連結（hardlink）或 reflink 共用"
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="依生成清單只重寫內容已改變的文件（保留使用者修改過的文件）"
+    )
+    parser.add_argument(
+        "--prune",
+        action="store_true",
+        help="刪除已從結構中移除、且未被修改的生成文件與空目錄"
+    )
+    parser.add_argument(
+        "--output-format",
+        type=str,
+        default="dir",
+        choices=["dir"] + list(ARCHIVE_FORMATS),
+        help="輸出格式：dir（目錄，預設）或 tar、tar.gz、zip 壓縮檔（--output - 表示寫到 stdout）"
+    )
+    parser.add_argument(
+        "--save-plan",
+        type=str,
+        help="將生成計畫存成 JSON Lines 文件（可搭配 --dry-run）"
+    )
+    parser.add_argument(
+        "--from-plan",
+        type=str,
+        help="從 JSON Lines 生成計畫執行，不解析結構文件"
+    )
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="比對輸出目錄與生成計畫，不寫入任何文件"
+    )
+    parser.add_argument(
+        "--block",
+        type=str,
+        help="只解析結構文件中的指定圍欄區塊（索引或標題，例如 0 或 \"Backend\"）"
+    )
+    parser.add_argument(
+        "--dir-fd",
+        action="store_true",
+        help="保留目錄 fd，以相對路徑與 O_EXCL 建立文件，減少路徑解析（僅 POSIX）"
+    )
+    parser.add_argument(
+        "--in-memory",
+        action="store_true",
+        help="在記憶體中生成專案（不寫入磁碟），可搭配 --generate-reports 直接驗證"
+    )
+    parser.add_argument(
+        "--progress",
+        choices=PROGRESS_MODES,
+        default=PROGRESS_TEXT,
+        help="進度輸出：text 為定期更新的摘要，json 為輸出到 stderr 的 JSON Lines，quiet 不輸出（預設: text）"
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="逐一輸出每個建立的目錄與文件"
+    )
+    parser.add_argument(
+        "--no-parse-cache",
+        action="store_true",
+        help="停用結構解析快取，每次重新解析結構文件"
+    )
+    parser.add_argument(
+        "--no-verify-cache",
+        action="store_true",
+        help="停用驗證結果快取，每次重新讀取所有生成的文件"
+    )
 
     args = parser.parse_args()
+    if args.no_parse_cache:
+        set_parse_cache_enabled(False)
+    if args.no_verify_cache:
+        set_verification_cache_enabled(False)
+    block = parse_block_selector(args.block) if args.block else None
+
+    archive_stream = None
+    original_stdout = sys.stdout
+    if args.output_format != "dir":
+        if args.output == "-":
+            # stdout 只輸出壓縮檔內容，其他訊息改輸出到 stderr
+            archive_stream = sys.stdout.buffer
+            sys.stdout = sys.stderr
+        elif args.output == "output":
+            args.output = f"output.{args.output_format}"
 
     try:
         # 如果只生成報告（提供了 --structure 和 --generated）
@@ -108,62 +216,73 @@ def main():
             print(f"[*] 報告輸出目錄: {report_dir}")
 
             # 生成報告
-            if args.all_langs:
-                languages = [LANG_ZH_TW, LANG_ZH_CN, LANG_EN]
-                for lang in languages:
-                    suffix = get_lang_suffix(lang)
-                    print(f"\n[*] 生成 {lang} 版本報告...")
-
-                    # 指標報告
-                    metrics_file = report_dir / f"METRICS{suffix}.md"
-                    generate_metrics_report_file(args.structure, args.generated, str(metrics_file), lang)
-
-                    # 驗證報告
-                    verification_file = report_dir / f"VERIFICATION{suffix}.md"
-                    generate_verification_report(args.structure, args.generated, str(verification_file), lang)
-
-                    # 結論報告
-                    conclusion_file = report_dir / f"CONCLUSION{suffix}.md"
-                    _generate_conclusion_report(args.structure, args.generated, str(conclusion_file), lang)
-            else:
-                suffix = get_lang_suffix(args.report_lang)
-                print(f"\n[*] 生成 {args.report_lang} 版本報告...")
-
-                # 指標報告
-                metrics_file = report_dir / f"METRICS{suffix}.md"
-                generate_metrics_report_file(args.structure, args.generated, str(metrics_file), args.report_lang)
-
-                # 驗證報告
-                verification_file = report_dir / f"VERIFICATION{suffix}.md"
-                generate_verification_report(args.structure, args.generated, str(verification_file), args.report_lang)
-
-                # 結論報告
-                conclusion_file = report_dir / f"CONCLUSION{suffix}.md"
-                _generate_conclusion_report(args.structure, args.generated, str(conclusion_file), args.report_lang)
+            languages = [LANG_ZH_TW, LANG_ZH_CN, LANG_EN] if args.all_langs else [args.report_lang]
+            generate_report_files(args.structure, args.generated, report_dir, languages, block)
 
             print("\n[OK] 所有報告生成完成！")
             return
 
-        # 解析結構
-        print(f"[*] 讀取結構定義: {args.readme}")
-        parser_obj = StructureParser(args.readme)
-        structure = parser_obj.parse()
-
-        if not structure:
-            print("[X] 無法解析結構，請檢查 README.md 格式")
-            sys.exit(1)
-
-        print(f"[OK] 成功解析結構")
+        # --in-memory：生成與驗證都在記憶體檔案系統中進行，只有報告寫入磁碟
+        if args.in_memory:
+            fs = MemoryFileSystem()
+        elif args.dir_fd:
+            fs = DirFdFileSystem()
+        else:
+            fs = None
+        progress = create_reporter(args.progress, verbose=args.verbose,
+                                   stream=sys.stderr if args.progress == PROGRESS_JSON else None)
+        generator = ProjectGenerator(args.output, workers=args.workers, fs=fs, dedup=args.dedup,
+                                     progress=progress)
+
+        if args.from_plan:
+            # 直接讀取生成計畫
+            print(f"[*] 讀取生成計畫: {args.from_plan}")
+            structure = None
+            plan = GenerationPlan.load_jsonl(args.from_plan)
+        else:
+            # 解析結構
+            print(f"[*] 讀取結構定義: {args.readme}")
+            parser_obj = StructureParser(args.readme, cache=default_parse_cache(), block=block)
+            structure = parser_obj.parse()
+
+            if not structure:
+                print("[X] 無法解析結構，請檢查 README.md 格式")
+                sys.exit(1)
+
+            print(f"[OK] 成功解析結構")
+            # 壓縮檔輸出直接串流渲染內容，不需要保留完整計畫
+            needs_plan = (args.output_format == "dir" or args.save_plan
+                          or args.dry_run or args.verify)
+            plan = generator.plan(structure) if needs_plan else None
+
+        if args.save_plan:
+            plan.save_jsonl(args.save_plan)
+            print(f"[OK] 生成計畫已儲存: {args.save_plan}")
 
         if args.dry_run:
             print("\n將要生成的結構:")
-            print_structure(structure)
+            for line in plan.describe():
+                print(line)
+            return
+
+        if args.verify:
+            print(f"\n比對輸出目錄與生成計畫: {args.output}")
+            if not print_plan_diff(plan.diff(Path(args.output), fs)):
+                sys.exit(1)
+            return
+
+        if args.output_format != "dir":
+            print(f"\n開始寫入壓縮檔: {args.output}")
+            generator.write_archive(structure, archive_stream or args.output,
+                                    args.output_format, plan=plan)
+            if args.generate_reports:
+                print("[!] 壓縮檔輸出模式不支援 --generate-reports，已略過報告生成")
             return
 
         # 生成專案
-        print(f"\n開始生成專案到: {args.output}")
-        generator = ProjectGenerator(args.output)
-        generator.generate(structure, args.project_name)
+        print(f"\n開始生成專案到: {args.output}" + (" (記憶體)" if args.in_memory else ""))
+        generator.generate(structure, args.project_name, plan=plan,
+                           incremental=args.incremental, prune=args.prune)
 
         print("\n[OK] 專案生成完成！")
 
@@ -188,38 +307,8 @@ def main():
                 structure_file = args.readme
 
             # 生成報告
-            if args.all_langs:
-                languages = [LANG_ZH_TW, LANG_ZH_CN, LANG_EN]
-                for lang in languages:
-                    suffix = get_lang_suffix(lang)
-                    print(f"\n[*] 生成 {lang} 版本報告...")
-
-                    # 指標報告
-                    metrics_file = report_dir / f"METRICS{suffix}.md"
-                    generate_metrics_report_file(structure_file, str(generated_path), str(metrics_file), lang)
-
-                    # 驗證報告
-                    verification_file = report_dir / f"VERIFICATION{suffix}.md"
-                    generate_verification_report(structure_file, str(generated_path), str(verification_file), lang)
-
-                    # 結論報告
-                    conclusion_file = report_dir / f"CONCLUSION{suffix}.md"
-                    _generate_conclusion_report(structure_file, str(generated_path), str(conclusion_file), lang)
-            else:
-                suffix = get_lang_suffix(args.report_lang)
-                print(f"\n[*] 生成 {args.report_lang} 版本報告...")
-
-                # 指標報告
-                metrics_file = report_dir / f"METRICS{suffix}.md"
-                generate_metrics_report_file(structure_file, str(generated_path), str(metrics_file), args.report_lang)
-
-                # 驗證報告
-                verification_file = report_dir / f"VERIFICATION{suffix}.md"
-                generate_verification_report(structure_file, str(generated_path), str(verification_file), args.report_lang)
-
-                # 結論報告
-                conclusion_file = report_dir / f"CONCLUSION{suffix}.md"
-                _generate_conclusion_report(structure_file, str(generated_path), str(conclusion_file), args.report_lang)
+            languages = [LANG_ZH_TW, LANG_ZH_CN, LANG_EN] if args.all_langs else [args.report_lang]
+            generate_report_files(structure_file, str(generated_path), report_dir, languages, block, fs=fs)
 
             print("\n[OK] 所有報告生成完成！")
 
@@ -231,26 +320,44 @@ def main():
         import traceback
         traceback.print_exc()
         sys.exit(1)
+    finally:
+        sys.stdout = original_stdout
+
+
+def generate_report_files(structure_file: str, generated_path: str, report_dir: Path,
+                          languages: List[str], block=None, fs=None):
+    """生成各語言的指標、驗證與結論報告
+
+    指標只計算一次（解析結構文件並走訪生成的專案一次），所有報告與語言共用。
+    """
+    metrics = VerificationMetrics(structure_file, generated_path, block=block, fs=fs).compute()
+    for lang in languages:
+        suffix = get_lang_suffix(lang)
+        print(f"\n[*] 生成 {lang} 版本報告...")
+
+        # 指標報告
+        metrics_file = report_dir / f"METRICS{suffix}.md"
+        generate_metrics_report_file(structure_file, generated_path, str(metrics_file), lang, block,
+                                     fs=fs, metrics=metrics)
+
+        # 驗證報告
+        verification_file = report_dir / f"VERIFICATION{suffix}.md"
+        generate_verification_report(structure_file, generated_path, str(verification_file), lang, block,
+                                     fs=fs, metrics=metrics)
+
+        # 結論報告
+        conclusion_file = report_dir / f"CONCLUSION{suffix}.md"
+        _generate_conclusion_report(structure_file, generated_path, str(conclusion_file), lang, block,
+                                    fs=fs, metrics=metrics)
 
 
 def generate_metrics_report_file(structure_file: str, generated_path: str,
-                                  output_file: str, lang: str):
-    """生成指標報告文件"""
+                                  output_file: str, lang: str, block=None, fs=None,
+                                  metrics: Optional[Mapping] = None):
+    """生成指標報告文件（metrics 為已計算的指標時不再重新計算）"""
     try:
-        metrics_calculator = VerificationMetrics(structure_file, generated_path)
-        metrics = metrics_calculator.calculate_all_metrics()
-
-        # 計算總體分數
-        overall_score = (
-            metrics['structure_coverage']['overall_coverage'] * 0.3 +
-            metrics['file_coverage']['coverage_rate'] * 0.2 +
-            metrics['directory_coverage']['coverage_rate'] * 0.2 +
-            metrics['template_accuracy']['accuracy_rate'] * 0.1 +
-            metrics['hierarchy_accuracy']['overall_accuracy'] * 0.1 +
-            metrics['annotation_preservation']['preservation_rate'] * 0.05 +
-            metrics['module_independence']['independence_rate'] * 0.05
-        ) * 100
-        metrics['overall_score'] = overall_score
+        if metrics is None:
+            metrics = VerificationMetrics(structure_file, generated_path, block=block, fs=fs).compute()
 
         generate_metrics_report(metrics, output_file, lang)
     except Exception as e:
@@ -259,18 +366,21 @@ def generate_metrics_report_file(structure_file: str, generated_path: str,
 
 
 
-def print_structure(node: dict, indent: int = 0):
-    """遞迴打印結構"""
-    prefix = "  " * indent
-    for name, info in node.items():
-        if isinstance(info, dict):
-            node_type = "[DIR]" if info.get('type') == 'directory' else "[FILE]"
-            node_name = info.get('name', name)
-            comment = f"  <- {info.get('comment', '')}" if info.get('comment') else ""
-            print(f"{prefix}{node_type} {node_name}{comment}")
+def print_plan_diff(diff) -> bool:
+    """打印輸出目錄與生成計畫的差異，一致時返回 True"""
+    for label, paths in (("缺少目錄", diff.missing_directories),
+                         ("缺少文件", diff.missing_files),
+                         ("內容不同", diff.changed_files)):
+        for path in paths:
+            print(f"  [!] {label}: {path}")
+
+    if diff.ok:
+        print("[OK] 輸出目錄與生成計畫一致")
+        return True
 
-            if 'children' in info and info['children']:
-                print_structure(info['children'], indent + 1)
+    print(f"[X] 與生成計畫不一致：缺少 {len(diff.missing_directories)} 個目錄、"
+          f"{len(diff.missing_files)} 個文件，{len(diff.changed_files)} 個文件內容不同")
+    return False
 
 
 if __name__ == "__main__":
@@ -0,0 +1,93 @@
+"""
+多字串比對（Aho-Corasick）
+
+所有模式只建立一次自動機，之後每段文字只需掃描一次即可找出所有出現的模式，
+成本與文字長度成正比，與模式數量無關（逐一 `pattern in text` 則與兩者的乘積成正比）。
+位於根狀態時以正規表示式（C 層級）直接跳到下一個可能開始模式的字元。
+"""
+import re
+from collections import deque
+from typing import Dict, Iterable, List, Set, Tuple
+
+
+class AhoCorasick:
+    """由一組字串建立的 Aho-Corasick 自動機
+
+    - patterns: 去除重複與空字串後的模式（保留原順序）
+    - search(text): 出現在 text 中的模式索引集合
+    - matches(text): 出現在 text 中的模式字串集合
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: Tuple[str, ...] = tuple(dict.fromkeys(p for p in patterns if p))
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # 每個狀態結束的模式（已合併失敗連結上的輸出）
+        self._out: List[Tuple[int, ...]] = [()]
+        self._build()
+        # 模式的第一個字元；根狀態下其他字元都不會改變狀態
+        first = ''.join(sorted(self._goto[0]))
+        self._next_start = re.compile(f"[{re.escape(first)}]").search if first else None
+
+    def _build(self):
+        goto, out = self._goto, self._out
+        own: List[List[int]] = [[]]
+        for index, pattern in enumerate(self.patterns):
+            state = 0
+            for ch in pattern:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    own.append([])
+                state = nxt
+            own[state].append(index)
+
+        # 依廣度優先計算失敗連結，較淺的狀態先完成
+        fail = self._fail = [0] * len(goto)
+        out[:] = [()] * len(goto)
+        out[0] = tuple(own[0])
+        queue = deque(goto[0].values())
+        for state in queue:
+            out[state] = tuple(own[state])
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                out[nxt] = tuple(own[nxt]) + out[fail[nxt]]
+                queue.append(nxt)
+
+    def search(self, text: str) -> Set[int]:
+        """單次掃描 text，返回出現的模式索引"""
+        goto, fail, out = self._goto, self._fail, self._out
+        next_start = self._next_start
+        found: Set[int] = set()
+        if next_start is None:
+            return found
+        state = 0
+        i, n = 0, len(text)
+        while i < n:
+            if not state:
+                match = next_start(text, i)
+                if match is None:
+                    break
+                i = match.start()
+            ch = text[i]
+            i += 1
+            nxt = goto[state].get(ch)
+            while nxt is None and state:
+                state = fail[state]
+                nxt = goto[state].get(ch)
+            state = nxt or 0
+            if out[state]:
+                found.update(out[state])
+        return found
+
+    def matches(self, text: str) -> Set[str]:
+        """單次掃描 text，返回出現的模式字串"""
+        patterns = self.patterns
+        return {patterns[index] for index in self.search(text)}
@@ -0,0 +1,49 @@
+"""
+結構解析結果的磁碟快取
+
+以「文件內容雜湊 + 解析器版本」為鍵，將解析後的結構字典存放在快取目錄中；
+儲存格式與容量淘汰見 disk_cache。
+"""
+import hashlib
+from pathlib import Path
+from typing import Optional
+
+from disk_cache import DiskCache
+
+# 快取目錄環境變數 / 停用快取環境變數
+CACHE_DIR_ENV = 'PROJECT_STRUCTURE_CACHE_DIR'
+NO_CACHE_ENV = 'PROJECT_STRUCTURE_NO_PARSE_CACHE'
+
+_READ_CHUNK = 1024 * 1024
+
+
+class ParseCache(DiskCache):
+    """結構解析快取"""
+
+    CACHE_DIR_ENV = CACHE_DIR_ENV
+    NO_CACHE_ENV = NO_CACHE_ENV
+    SUBDIR = 'parse'
+
+    def key_for(self, source: Path, version: str, extra: str = "") -> str:
+        """計算快取鍵：解析器版本 + 額外參數 + 文件內容的 SHA-256"""
+        digest = hashlib.sha256()
+        digest.update(f"{version}\0{extra}\0".encode('utf-8'))
+        with open(source, 'rb') as f:
+            for chunk in iter(lambda: f.read(_READ_CHUNK), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+
+def default_cache_dir() -> Path:
+    """預設快取目錄（可用 PROJECT_STRUCTURE_CACHE_DIR 覆寫）"""
+    return ParseCache.default_cache_dir()
+
+
+def set_parse_cache_enabled(enabled: bool):
+    """啟用或停用預設解析快取（對應 --no-parse-cache）"""
+    ParseCache.set_enabled(enabled)
+
+
+def default_parse_cache() -> Optional[ParseCache]:
+    """返回預設解析快取，停用時返回 None"""
+    return ParseCache.default()
@@ -0,0 +1,206 @@
+"""
+生成進度回報
+
+- ProgressReporter：不輸出進度（quiet），只有警告輸出到 stderr
+- TextProgressReporter：以固定頻率更新的一行摘要（數量、大小、每秒文件數、預估剩餘時間）
+- JsonLinesProgressReporter：機器可讀的 JSON Lines 事件
+- VerboseProgressReporter：逐一輸出每個目錄與文件（--verbose）
+
+advance() 可由多個寫入執行緒同時呼叫；輸出頻率以 interval 限制，
+與節點數量無關。
+"""
+import json
+import sys
+import threading
+import time
+from typing import Dict, Optional, TextIO
+
+PROGRESS_TEXT = 'text'
+PROGRESS_JSON = 'json'
+PROGRESS_QUIET = 'quiet'
+PROGRESS_MODES = (PROGRESS_TEXT, PROGRESS_JSON, PROGRESS_QUIET)
+
+DEFAULT_INTERVAL = 0.5   # 秒
+
+
+def format_size(size: int) -> str:
+    """以 B / KiB / MiB / GiB 表示大小"""
+    value = float(size)
+    for unit in ('B', 'KiB', 'MiB'):
+        if value < 1024:
+            return f"{value:.0f} {unit}" if unit == 'B' else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GiB"
+
+
+class ProgressReporter:
+    """進度回報（基底類別即 quiet 模式）"""
+
+    # 是否需要逐一節點的訊息（生成器只在需要時組出每個節點的文字）
+    verbose = False
+
+    def __init__(self, stream: Optional[TextIO] = None, interval: float = DEFAULT_INTERVAL):
+        # stream 為 None 時使用當下的 sys.stdout
+        self._stream = stream
+        self.interval = interval
+        self._lock = threading.Lock()
+        self.total_directories = self.total_files = self.total_bytes = 0
+        self.directories = self.files = self.bytes = 0
+        self._started = self._last = time.monotonic()
+
+    @property
+    def stream(self) -> TextIO:
+        return self._stream if self._stream is not None else sys.stdout
+
+    def start(self, directories: int, files: int, total_bytes: int):
+        """開始一次生成：預計建立的目錄數、寫入的文件數與位元組數"""
+        self.total_directories, self.total_files, self.total_bytes = directories, files, total_bytes
+        self.directories = self.files = self.bytes = 0
+        self._started = self._last = time.monotonic()
+
+    def advance(self, directories: int = 0, files: int = 0, nbytes: int = 0):
+        """累計完成的項目，距上次輸出超過 interval 時輸出進度"""
+        with self._lock:
+            self.directories += directories
+            self.files += files
+            self.bytes += nbytes
+            now = time.monotonic()
+            if now - self._last < self.interval:
+                return
+            self._last = now
+            self._report(self.snapshot(now))
+
+    def snapshot(self, now: Optional[float] = None) -> Dict:
+        """目前的進度數字"""
+        elapsed = (now if now is not None else time.monotonic()) - self._started
+        rate = self.files / elapsed if elapsed > 0 else 0.0
+        remaining = self.total_files - self.files
+        return {
+            'directories': self.directories,
+            'total_directories': self.total_directories,
+            'files': self.files,
+            'total_files': self.total_files,
+            'bytes': self.bytes,
+            'total_bytes': self.total_bytes,
+            'elapsed': round(elapsed, 3),
+            'files_per_sec': round(rate, 1),
+            'eta': round(remaining / rate, 1) if rate > 0 else None,
+        }
+
+    def node(self, line: str):
+        """單一節點的訊息（只在 verbose 時輸出）"""
+
+    def info(self, message: str):
+        """一般訊息"""
+
+    def warning(self, message: str):
+        """需要使用者注意的訊息"""
+        print(message, file=sys.stderr)
+
+    def finish(self, stats: Optional[Dict[str, int]] = None):
+        """結束一次生成"""
+
+    def _report(self, snapshot: Dict):
+        """輸出進度（已持有鎖）"""
+
+
+class TextProgressReporter(ProgressReporter):
+    """人類可讀的進度：終端機上原地更新一行，否則（例如 CI 記錄）每隔 interval 輸出一行"""
+
+    def __init__(self, stream: Optional[TextIO] = None, interval: float = DEFAULT_INTERVAL):
+        super().__init__(stream, interval)
+        self._line_open = False
+
+    def _isatty(self) -> bool:
+        try:
+            return self.stream.isatty()
+        except (AttributeError, ValueError):
+            return False
+
+    def _report(self, snapshot: Dict):
+        eta = f"{snapshot['eta']:.1f} 秒" if snapshot['eta'] is not None else "-"
+        line = (f"[*] 進度: 目錄 {snapshot['directories']}/{snapshot['total_directories']}、"
+                f"文件 {snapshot['files']}/{snapshot['total_files']}、"
+                f"{format_size(snapshot['bytes'])}/{format_size(snapshot['total_bytes'])}、"
+                f"{snapshot['files_per_sec']:.0f} 文件/秒、剩餘約 {eta}")
+        if self._isatty():
+            self.stream.write("\r\033[K" + line)
+            self.stream.flush()
+            self._line_open = True
+        else:
+            print(line, file=self.stream)
+
+    def _end_line(self):
+        if self._line_open:
+            self.stream.write("\n")
+            self._line_open = False
+
+    def info(self, message: str):
+        with self._lock:
+            self._end_line()
+            print(message, file=self.stream)
+
+    def warning(self, message: str):
+        self.info(message)
+
+    def finish(self, stats: Optional[Dict[str, int]] = None):
+        with self._lock:
+            self._end_line()
+            snapshot = self.snapshot()
+            print(f"[*] 完成: {snapshot['directories']} 個目錄、{snapshot['files']} 個文件、"
+                  f"{format_size(snapshot['bytes'])}，耗時 {snapshot['elapsed']:.2f} 秒"
+                  f"（{snapshot['files_per_sec']:.0f} 文件/秒）", file=self.stream)
+
+
+class VerboseProgressReporter(TextProgressReporter):
+    """逐一輸出每個節點，不輸出週期性的進度行"""
+
+    verbose = True
+
+    def node(self, line: str):
+        print(line, file=self.stream)
+
+    def _report(self, snapshot: Dict):
+        pass
+
+
+class JsonLinesProgressReporter(ProgressReporter):
+    """JSON Lines 事件：start、progress、message、warning、done"""
+
+    def _emit(self, event: str, **fields):
+        print(json.dumps({'event': event, **fields}, ensure_ascii=False), file=self.stream)
+
+    def start(self, directories: int, files: int, total_bytes: int):
+        super().start(directories, files, total_bytes)
+        with self._lock:
+            self._emit('start', directories=directories, files=files, bytes=total_bytes)
+
+    def _report(self, snapshot: Dict):
+        self._emit('progress', **snapshot)
+
+    def info(self, message: str):
+        with self._lock:
+            self._emit('message', message=message.strip())
+
+    def warning(self, message: str):
+        with self._lock:
+            self._emit('warning', message=message.strip())
+
+    def finish(self, stats: Optional[Dict[str, int]] = None):
+        with self._lock:
+            self._emit('done', **self.snapshot(), stats=stats or {})
+
+
+def create_reporter(mode: str = PROGRESS_TEXT, verbose: bool = False,
+                    stream: Optional[TextIO] = None,
+                    interval: float = DEFAULT_INTERVAL) -> ProgressReporter:
+    """依模式建立進度回報（verbose 只影響 text 模式）"""
+    if mode == PROGRESS_JSON:
+        return JsonLinesProgressReporter(stream, interval)
+    if mode == PROGRESS_QUIET:
+        return ProgressReporter(stream, interval)
+    if mode != PROGRESS_TEXT:
+        raise ValueError(f"不支援的進度模式: {mode}")
+    if verbose:
+        return VerboseProgressReporter(stream, interval)
+    return TextProgressReporter(stream, interval)
@@ -1,21 +1,101 @@
 """
 根據解析的結構生成專案目錄和文件
 """
-import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List
-from structure_parser import StructureParser
+from typing import BinaryIO, Dict, Iterator, List, Optional, Set, Tuple, Union
+from generation_plan import (
+    GenerationPlan, PlanOperation, OP_MKDIR, OP_WRITE, OP_SKIP, KIND_README, KIND_FILE,
+    SKIP_DUPLICATE, content_hash
+)
+from archive_sink import write_archive
+from filesystem import FileSystem, default_filesystem
+from generation_manifest import GenerationManifest, ManifestEntry
+from template_engine import TemplateEngine, TemplatePack, file_suffix
+from progress import ProgressReporter, TextProgressReporter
+
+# 沒有對應模板時的預設內容（# 名稱 + 註解）
+DEFAULT_TEMPLATE = 'default'
+# 目錄自動產生的 README.md 模板
+README_TEMPLATE = 'README.md'
+
+# 內容相同的文件去重方式：硬連結，或共用資料區塊的 reflink（btrfs、XFS 等）
+DEDUP_HARDLINK = 'hardlink'
+DEDUP_REFLINK = 'reflink'
+DEDUP_MODES = (DEDUP_HARDLINK, DEDUP_REFLINK)
+
+
+def _default_params(node_name: str, comment: Optional[str], parent_name: str) -> Dict[str, str]:
+    return {'name': node_name, 'comment': comment or ''}
+
+
+def _config_params(node_name: str, comment: Optional[str], parent_name: str) -> Dict[str, str]:
+    # pyproject.toml / package.json 以所在目錄命名
+    return {'name': parent_name}
+
+
+def _module_params(node_name: str, comment: Optional[str], parent_name: str) -> Dict[str, str]:
+    return {'name': node_name.replace(file_suffix(node_name), ''),
+            'comment': comment or f"{node_name} 模組"}
+
+
+def _document_params(node_name: str, comment: Optional[str], parent_name: str) -> Dict[str, str]:
+    return {'name': node_name.replace(file_suffix(node_name), ''),
+            'comment': comment or f"{node_name} 文件"}
+
+
+# 內建模板的參數產生函式（其他模板使用 template_engine.standard_params）
+_BUILTIN_PARAMS = {
+    'pyproject.toml': _config_params,
+    'package.json': _config_params,
+    '.py': _module_params,
+    '.md': _document_params,
+}
 
 
 class ProjectGenerator:
     """專案生成器"""
 
-    def __init__(self, output_dir: str = "output"):
+    def __init__(self, output_dir: str = "output", workers: int = 1,
+                 fs: Optional[FileSystem] = None,
+                 template_packs: Optional[List[TemplatePack]] = None,
+                 dedup: Optional[str] = None,
+                 progress: Optional[ProgressReporter] = None):
         self.output_dir = Path(output_dir)
+        # 寫入文件的執行緒數量（1 表示依序寫入）
+        self.workers = workers
+        if dedup is not None and dedup not in DEDUP_MODES:
+            raise ValueError(f"不支援的去重方式: {dedup}")
+        # 內容相同的文件只寫入一次，其餘以 dedup 方式連結（None 表示不去重）
+        self.dedup = dedup
+        # 寫入目標的檔案系統（預設為磁碟；傳入 MemoryFileSystem 時完全在記憶體中生成）
+        self.fs = fs if fs is not None else default_filesystem()
+        # 進度與訊息輸出（預設為定期更新的摘要，逐一節點的訊息只在 verbose 時輸出）
+        self.progress = progress if progress is not None else TextProgressReporter()
         self.templates = self._load_templates()
+        self.engine = self._build_engine()
+        for pack in template_packs or ():
+            self.engine.register_pack(pack)
+
+    def _build_engine(self) -> TemplateEngine:
+        """由 templates 建立模板引擎：以 . 開頭的鍵為副檔名規則，其餘為完整文件名規則"""
+        engine = TemplateEngine((DEFAULT_TEMPLATE, "# {name}\n\n{comment}\n", _default_params))
+        for key, source in self.templates.items():
+            params = _BUILTIN_PARAMS.get(key)
+            if key == README_TEMPLATE:
+                engine.register(key, source)
+            elif key.startswith('.'):
+                engine.register_suffix(key, source, params)
+            else:
+                engine.register_filename(key, source, params)
+        return engine
+
+    def register_template_pack(self, pack: TemplatePack):
+        """註冊自訂模板包"""
+        self.engine.register_pack(pack)
 
     def _load_templates(self) -> Dict[str, str]:
-        """載入文件模板"""
+        """載入文件模板（鍵為完整文件名或副檔名）"""
         return {
             'pyproject.toml': self._get_pyproject_template(),
             'package.json': self._get_package_json_template(),
@@ -101,79 +181,308 @@ if __name__ == "__main__":
 
 """
 
-    def generate(self, structure: Dict, project_name: str = "project1"):
-        """生成專案結構"""
-        self.output_dir.mkdir(parents=True, exist_ok=True)
+    def _readme_template(self, node_name: str, comment: str) -> Tuple[str, Dict[str, str]]:
+        """目錄 README.md 的 (模板, 參數)"""
+        return README_TEMPLATE, {'name': node_name, 'comment': comment or f"{node_name} 模組"}
 
-        def create_structure(node: Dict, parent_path: Path):
+    def iter_plan(self, structure: Dict) -> Iterator[Tuple[PlanOperation, Optional[str]]]:
+        """依前序逐一產生 (操作, 內容)，不保留已渲染的內容（路徑相對於輸出目錄）"""
+        engine = self.engine
+
+        def write_op(path: str, kind: str, template: str, params: Dict[str, str]):
+            content, ref, params_ref = engine.render_entry(template, params)
+            op = PlanOperation(OP_WRITE, path, kind, ref, template=template, params_hash=params_ref)
+            return op, content
+
+        def walk(node: Dict, parent_rel: str, parent_name: str):
             for name, info in node.items():
                 if not isinstance(info, dict):
                     continue
 
-                current_path = parent_path / name
+                rel_path = f"{parent_rel}/{name}" if parent_rel else name
                 comment = info.get('comment', '')
                 node_name = info.get('name', name)
 
                 if info.get('type') == 'directory':
-                    # 創建目錄
-                    current_path.mkdir(parents=True, exist_ok=True)
-                    print(f"[DIR] 創建目錄: {current_path}")
-
-                    # 如果有 README.md，創建它
-                    readme_path = current_path / "README.md"
-                    if not readme_path.exists():
-                        readme_content = self.templates['README.md'].format(
-                            name=node_name,
-                            comment=comment or f"{node_name} 模組"
-                        )
-                        readme_path.write_text(readme_content, encoding='utf-8')
-                        print(f"  [FILE] 創建: {readme_path.name}")
-
-                    # 遞迴處理子項目
-                    if 'children' in info and info['children']:
-                        create_structure(info['children'], current_path)
-
+                    yield PlanOperation(OP_MKDIR, rel_path), None
+                    yield write_op(f"{rel_path}/README.md", KIND_README,
+                                   *self._readme_template(node_name, comment))
+                    if info.get('children'):
+                        yield from walk(info['children'], rel_path, name)
                 elif info.get('type') == 'file':
-                    # 創建文件
-                    if not current_path.exists():
-                        file_ext = Path(node_name).suffix
-                        template_key = file_ext if file_ext in ['.py', '.md'] else node_name
-
-                        if template_key in self.templates:
-                            if node_name == 'pyproject.toml':
-                                content = self.templates['pyproject.toml'].format(
-                                    name=parent_path.name
-                                )
-                            elif node_name == 'package.json':
-                                content = self.templates['package.json'].format(
-                                    name=parent_path.name
-                                )
-                            elif file_ext == '.py':
-                                content = self.templates['.py'].format(
-                                    name=node_name.replace(file_ext, ''),
-                                    comment=comment or f"{node_name} 模組"
-                                )
-                            elif file_ext == '.md':
-                                content = self.templates['.md'].format(
-                                    name=node_name.replace(file_ext, ''),
-                                    comment=comment or f"{node_name} 文件"
-                                )
-                            else:
-                                content = f"# {node_name}\n\n{comment or ''}\n"
-                        else:
-                            # 預設空文件
-                            content = f"# {node_name}\n\n{comment or ''}\n"
-
-                        current_path.write_text(content, encoding='utf-8')
-                        print(f"[FILE] 創建文件: {current_path}")
-
-        # 從結構中找到根目錄
-        root_name = list(structure.keys())[0] if structure else project_name
-        root_path = self.output_dir / root_name
-        root_path.mkdir(parents=True, exist_ok=True)
+                    if parent_rel and name == 'README.md':
+                        # 目錄自動產生的 README.md 優先於結構中的 README.md
+                        yield PlanOperation(OP_SKIP, rel_path, KIND_FILE, reason=SKIP_DUPLICATE), None
+                    else:
+                        yield write_op(rel_path, KIND_FILE,
+                                       *engine.select(node_name, comment, parent_name))
+
+        yield from walk(structure, "", self.output_dir.name)
+
+    def plan(self, structure: Dict) -> GenerationPlan:
+        """由結構計算生成計畫"""
+        plan = GenerationPlan()
+        for op, content in self.iter_plan(structure):
+            plan.add(op, content)
+        return plan
+
+    def write_archive(self, structure: Optional[Dict], target: Union[str, BinaryIO], fmt: str,
+                      plan: Optional[GenerationPlan] = None) -> Dict[str, int]:
+        """將結構（或計畫）直接串流寫入壓縮檔，不建立暫存目錄"""
+        operations = plan.iter_with_content() if plan is not None else self.iter_plan(structure)
+        counts = write_archive(operations, target, fmt)
+        self.progress.info(f"[OK] 已寫入 {fmt} 壓縮檔：{counts['directories']} 個目錄、{counts['files']} 個文件")
+        return counts
+
+    def generate(self, structure: Optional[Dict], project_name: str = "project1",
+                 plan: Optional[GenerationPlan] = None, incremental: bool = False,
+                 prune: bool = False):
+        """生成專案結構（提供 plan 時直接執行該計畫）
+
+        incremental: 依生成清單重寫內容已改變的文件（使用者修改過的文件保留）
+        prune: 刪除清單中已不在結構內、且未被修改的文件與空目錄
+        """
+        self.fs.mkdir(self.output_dir, parents=True, exist_ok=True)
+
+        if structure is not None:
+            # 從結構中找到根目錄
+            root_name = list(structure.keys())[0] if structure else project_name
+            root_path = self.output_dir / root_name
+            self.fs.mkdir(root_path, parents=True, exist_ok=True)
 
         # 生成結構
-        create_structure(structure, self.output_dir)
+        self.apply_plan(plan if plan is not None else self.plan(structure),
+                        incremental=incremental, prune=prune)
 
-        print(f"\n[OK] 專案已生成到: {self.output_dir}")
+        self.progress.info(f"\n[OK] 專案已生成到: {self.output_dir}")
         return self.output_dir
+
+    def apply_plan(self, plan: GenerationPlan, incremental: bool = False,
+                   prune: bool = False) -> Dict[str, int]:
+        """執行生成計畫並更新生成清單，返回各類文件數量
+
+        預設只寫入不存在的文件；incremental 時另外重寫清單中內容已改變、
+        且磁碟上的文件仍是上次生成內容的文件。
+        """
+        try:
+            return self._apply_plan(plan, incremental, prune)
+        finally:
+            # 釋放檔案系統快取的資源（例如 DirFdFileSystem 的目錄 fd）
+            self.fs.close()
+
+    def _apply_plan(self, plan: GenerationPlan, incremental: bool, prune: bool) -> Dict[str, int]:
+        fs = self.fs
+        progress = self.progress
+        manifest = GenerationManifest.load(self.output_dir, fs)
+        stats = {'created': 0, 'updated': 0, 'unchanged': 0, 'kept': 0, 'removed': 0,
+                 'linked': 0, 'bytes_saved': 0, 'inodes_saved': 0}
+        planned_files = {op.path for op in plan if op.op == OP_WRITE}
+        planned_dirs = {op.path for op in plan if op.op == OP_MKDIR}
+
+        if prune:
+            stats['removed'] = self._prune(manifest, planned_files, planned_dirs)
+
+        # 決定需要寫入的文件：(操作, 目標路徑, 是否覆寫)
+        writes: List[Tuple[PlanOperation, Path, bool]] = []
+        # 磁碟內容已是新內容、只需更新清單紀錄的文件
+        refreshed: List[PlanOperation] = []
+        for op in plan:
+            if op.op != OP_WRITE:
+                continue
+            target = self.output_dir / op.path
+            entry = manifest.files.get(op.path)
+            if not incremental:
+                writes.append((op, target, False))
+                continue
+
+            if entry is None:
+                # 不在清單中：內容與計畫相同時納入清單，否則視為使用者的文件
+                on_disk = self._file_hash(target)
+                if on_disk is None:
+                    writes.append((op, target, False))
+                elif on_disk == op.content_ref:
+                    stats['unchanged'] += 1
+                    refreshed.append(op)
+                continue
+
+            if entry.content == op.content_ref:
+                # 內容與上次生成相同：只確認文件仍存在，不讀取內容
+                if fs.exists(target):
+                    stats['unchanged'] += 1
+                else:
+                    writes.append((op, target, False))
+                continue
+
+            on_disk = self._file_hash(target)
+            if on_disk is None:
+                writes.append((op, target, False))
+            elif on_disk == op.content_ref:
+                stats['unchanged'] += 1
+                refreshed.append(op)
+            elif on_disk == entry.content:
+                writes.append((op, target, True))
+            else:
+                # 使用者修改過的文件不覆寫
+                stats['kept'] += 1
+                progress.warning(f"[!] 保留已修改的文件: {target}")
+
+        progress.start(len(planned_dirs), len(writes),
+                       sum(len(plan.content(op).encode('utf-8')) for op, _, _ in writes))
+
+        # 計畫依前序排列，父目錄一定先於子目錄建立
+        new_dirs = set()
+        for op in plan:
+            if op.op == OP_MKDIR:
+                target = self.output_dir / op.path
+                if not incremental or not fs.is_dir(target):
+                    new_dirs.add(op.path)
+                fs.mkdir(target, parents=True, exist_ok=True)
+                progress.advance(directories=1)
+
+        write_jobs = [(target, plan.content(op), overwrite) for op, target, overwrite in writes]
+        if self.dedup:
+            written = self._execute_dedup_writes(write_jobs, [op.content_ref for op, _, _ in writes], stats)
+        else:
+            written = self._execute_writes(write_jobs)
+
+        # 更新清單：本次寫入的文件使用新紀錄，其餘沿用舊紀錄
+        files = {path: entry for path, entry in manifest.files.items()
+                 if path in planned_files or not prune}
+        for op in refreshed:
+            files[op.path] = ManifestEntry(op.template, op.params_hash, op.content_ref)
+        done = {}
+        for (op, target, overwrite), ok in zip(writes, written):
+            if ok:
+                files[op.path] = ManifestEntry(op.template, op.params_hash, op.content_ref)
+                done[op.path] = overwrite
+                stats['updated' if overwrite else 'created'] += 1
+        directories = sorted(planned_dirs | (set() if prune else set(manifest.directories)))
+        GenerationManifest(files, directories).save(self.output_dir, fs)
+
+        if progress.verbose:
+            # 依計畫順序輸出每個節點的訊息
+            for op in plan:
+                target = self.output_dir / op.path
+                if op.op == OP_MKDIR and op.path in new_dirs:
+                    progress.node(f"[DIR] 創建目錄: {target}")
+                elif op.op == OP_WRITE and op.path in done:
+                    if done[op.path]:
+                        progress.node(f"[FILE] 更新文件: {target}")
+                    elif op.kind == KIND_README:
+                        progress.node(f"  [FILE] 創建: {target.name}")
+                    else:
+                        progress.node(f"[FILE] 創建文件: {target}")
+
+        if incremental or prune:
+            progress.info(f"[*] 增量生成: 新增 {stats['created']}、更新 {stats['updated']}、"
+                  f"未變更 {stats['unchanged']}、保留已修改 {stats['kept']}、刪除 {stats['removed']}")
+        if self.dedup:
+            progress.info(f"[*] 去重 ({self.dedup}): 連結 {stats['linked']} 個重複文件，"
+                  f"節省 {stats['bytes_saved']} bytes、{stats['inodes_saved']} 個 inode")
+        progress.finish(stats)
+        return stats
+
+    def _prune(self, manifest: GenerationManifest, planned_files: Set[str],
+               planned_dirs: Set[str]) -> int:
+        """刪除清單中已不在計畫內的文件（未被修改者）與空目錄，返回刪除的文件數"""
+        removed = 0
+        for path, entry in manifest.files.items():
+            if path in planned_files:
+                continue
+            target = self.output_dir / path
+            on_disk = self._file_hash(target)
+            if on_disk is None:
+                continue
+            if on_disk != entry.content:
+                self.progress.warning(f"[!] 保留已修改的文件: {target}")
+                continue
+            self.fs.remove(target)
+            removed += 1
+            self.progress.node(f"[DEL] 刪除文件: {target}")
+
+        # 由深到淺移除已空的目錄
+        for path in sorted(set(manifest.directories) - planned_dirs, key=lambda p: p.count('/'), reverse=True):
+            target = self.output_dir / path
+            try:
+                self.fs.rmdir(target)
+            except OSError:
+                continue
+            self.progress.node(f"[DEL] 刪除目錄: {target}")
+        return removed
+
+    def _execute_writes(self, writes: List[Tuple[Path, str, bool]]) -> List[bool]:
+        """執行 (路徑, 內容, 是否覆寫) 寫入，返回每個寫入是否完成"""
+        write = self.fs.write
+        advance = self.progress.advance
+
+        def write_job(job):
+            target, content, overwrite = job
+            ok = write(target, content, overwrite)
+            advance(files=1, nbytes=len(content.encode('utf-8')))
+            return ok
+
+        return self._run_jobs(write_job, writes)
+
+    def _run_jobs(self, func, jobs: List) -> List:
+        """依序或以執行緒池執行 func(job)，結果順序與 jobs 相同
+
+        workers 大於 1 時分批交給執行緒池並行執行。
+        """
+        if self.workers <= 1:
+            return [func(job) for job in jobs]
+
+        # 分批提交，減少每個文件一個 Future 的排程成本
+        chunk_size = max(1, len(jobs) // (self.workers * 8))
+        chunks = [jobs[i:i + chunk_size] for i in range(0, len(jobs), chunk_size)]
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            results = executor.map(lambda chunk: [func(job) for job in chunk], chunks)
+            return [result for chunk_results in results for result in chunk_results]
+
+    def _execute_dedup_writes(self, writes: List[Tuple[Path, str, bool]], refs: List[str],
+                              stats: Dict[str, int]) -> List[bool]:
+        """去重寫入：每個內容雜湊先寫入第一個文件，其餘文件連結到該文件
+
+        連結失敗（跨檔案系統、不支援 reflink 等）時改為一般寫入，之後不再嘗試連結。
+        """
+        primary: Dict[str, int] = {}
+        for i, ref in enumerate(refs):
+            primary.setdefault(ref, i)
+        first = [i for i, ref in enumerate(refs) if primary[ref] == i]
+        results = [False] * len(writes)
+        for i, ok in zip(first, self._execute_writes([writes[i] for i in first])):
+            results[i] = ok
+
+        link = self.fs.link if self.dedup == DEDUP_HARDLINK else self.fs.clone
+        supported = [True]
+
+        def link_or_write(job):
+            source, (target, content, overwrite) = job
+            self.progress.advance(files=1, nbytes=len(content.encode('utf-8')))
+            if source is not None and supported[0]:
+                try:
+                    return link(source, target, overwrite), True
+                except OSError:
+                    supported[0] = False
+            return self.fs.write(target, content, overwrite), False
+
+        duplicates = [i for i, ref in enumerate(refs) if primary[ref] != i]
+        # 第一個文件未寫入（例如已存在使用者的文件）時不能連結到它
+        jobs = [(writes[primary[refs[i]]][0] if results[primary[refs[i]]] else None, writes[i])
+                for i in duplicates]
+        for i, (ok, linked) in zip(duplicates, self._run_jobs(link_or_write, jobs)):
+            results[i] = ok
+            if ok and linked:
+                stats['linked'] += 1
+                stats['bytes_saved'] += len(writes[i][1].encode('utf-8'))
+                if self.dedup == DEDUP_HARDLINK:
+                    stats['inodes_saved'] += 1
+        if not supported[0]:
+            self.progress.warning(f"[!] 輸出目錄不支援 {self.dedup}，重複文件已改為一般寫入")
+        return results
+
+    def _file_hash(self, path: Path) -> Optional[str]:
+        """輸出目錄中文件的內容雜湊，不存在或無法讀取時返回 None"""
+        try:
+            return content_hash(self.fs.read(path))
+        except (OSError, UnicodeDecodeError):
+            return None
@@ -0,0 +1,84 @@
+"""
+結構路徑索引：一次走訪建立路徑對應、文件/目錄/註解列表與計數
+"""
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+
+class StructureIndex:
+    """解析後結構的路徑索引
+
+    - nodes: 完整路徑 -> 節點字典
+    - files / directories: 完整路徑列表（同 StructureParser.get_file_list / get_directory_list）
+    - relative_files / relative_directories: 略過 strip_names 目錄後的相對路徑
+      （例如略過 system、project1，使路徑相對於生成的專案根目錄）
+    - annotations: 所有節點註解
+    - counts: {'directories': n, 'files': m}
+    """
+
+    def __init__(self, structure: Dict, strip_names: Iterable[str] = ()):
+        self.strip_names: FrozenSet[str] = frozenset(strip_names)
+        self.nodes: Dict[str, Dict] = {}
+        self.files: List[Tuple[str, str]] = []
+        self.directories: List[str] = []
+        self.relative_files: List[str] = []
+        self.relative_directories: List[str] = []
+        self.annotations: List[str] = []
+        self.counts: Dict[str, int] = {'directories': 0, 'files': 0}
+
+        self._build(structure)
+
+        self.relative_file_set: FrozenSet[str] = frozenset(self.relative_files)
+        self.relative_directory_set: FrozenSet[str] = frozenset(self.relative_directories)
+
+    def _build(self, structure: Dict):
+        """單次走訪，同時計算完整路徑與相對路徑"""
+        strip_names = self.strip_names
+
+        def traverse(node: Dict, parent_path: str, relative_parent: str):
+            for name, info in node.items():
+                if not isinstance(info, dict):
+                    continue
+
+                current_path = f"{parent_path}/{name}" if parent_path else name
+                self.nodes[current_path] = info
+
+                node_type = info.get('type')
+                stripped = name in strip_names
+                relative_path = "" if stripped else (
+                    f"{relative_parent}/{name}" if relative_parent else name
+                )
+
+                if node_type == 'file':
+                    self.counts['files'] += 1
+                    self.files.append((current_path, name))
+                    if not stripped:
+                        self.relative_files.append(relative_path)
+                elif node_type == 'directory':
+                    self.counts['directories'] += 1
+                    self.directories.append(current_path)
+                    if not stripped:
+                        self.relative_directories.append(relative_path)
+
+                if info.get('comment'):
+                    self.annotations.append(info['comment'])
+
+                if info.get('children'):
+                    traverse(info['children'], current_path, relative_path)
+
+        traverse(structure, "", "")
+
+    def get(self, path: str) -> Optional[Dict]:
+        """依完整路徑取得節點"""
+        return self.nodes.get(path)
+
+    def has_path(self, path: str) -> bool:
+        """完整路徑是否存在於結構中"""
+        return path in self.nodes
+
+    def is_expected_file(self, relative_path: str) -> bool:
+        """相對路徑是否為預期文件"""
+        return relative_path in self.relative_file_set
+
+    def is_expected_directory(self, relative_path: str) -> bool:
+        """相對路徑是否為預期目錄"""
+        return relative_path in self.relative_directory_set
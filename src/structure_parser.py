@@ -1,212 +1,415 @@
 """
 解析 README.md 中的專案結構樹狀圖
 """
+import mmap
+import os
 import re
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Optional, Iterable, Iterator, NamedTuple, Union
 from pathlib import Path
+from structure_index import StructureIndex
+from parse_cache import ParseCache
+from fenced_blocks import FencedBlock, TREE_BLOCK_INFOS, scan_fenced_blocks, select_block
+from file_classifier import FileClassifier, default_classifier
+
+# 解析器輸出格式版本（解析結果改變時遞增，使舊快取失效）
+PARSER_VERSION = '7'
+
+# 解析事件類型
+EVENT_ENTER_DIR = 'enter_dir'
+EVENT_FILE = 'file'
+EVENT_LEAVE_DIR = 'leave_dir'
+
+
+class ParseEvent(NamedTuple):
+    """結構節點事件"""
+    kind: str                # EVENT_ENTER_DIR / EVENT_FILE / EVENT_LEAVE_DIR
+    path: str                # 從根節點起以 / 連接的完整路徑
+    level: int               # 樹狀圖中的縮排層級
+    name: str
+    comment: Optional[str]
+
+
+# 分支行：前綴（│、| 與空白）+ 分支符號 + 名稱 + 可選的 ← 註解
+# 支援 ├─ / └─、tree 指令的 ├── / └──，以及 ASCII 的 |-- / `-- / +--
+_BRANCH_LINE = re.compile(
+    r'(?P<prefix>[│|\s]*?)'
+    r'(?P<branch>[├└]─*|[|`+\\]-{2,})'
+    r'[├└│─\s]*'
+    r'(?P<name>[^←]*)'
+    r'(?:←(?P<comment>[^←]*))?'
+)
+# 非分支行：以前導空白計算層級，其餘樹狀符號略過
+_PLAIN_LINE = re.compile(
+    r'(?P<indent>\s*)'
+    r'[├└│|─\s]*'
+    r'(?P<name>[^←]*)'
+    r'(?:←(?P<comment>[^←]*))?'
+)
+# 進入結構區塊的樹狀符號
+_TREE_GLYPH = re.compile(r'[├└│]|[|`+\\]--')
+# 結構區塊內可繼續解析的樹狀符號
+_TREE_GLYPH_OR_LINE = re.compile(r'[├└│─]|[|`+\\]--')
+# 看起來像路徑的文字
+_PATH_HINT = re.compile(r'/|\.(?:py|md|toml|json)')
+# tree 指令的根目錄行（`tree myproj` 的第一行只有目錄名稱，`.` 表示目前目錄不建立根節點）
+_TREE_ROOT = re.compile(r'[\w.@+~-]+')
+# tree 指令結尾的統計行，例如 "3 directories, 5 files"
+_TREE_SUMMARY = re.compile(r'\d+ director(?:y|ies)(?:, \d+ files?)?')
+
+# 超過此大小（位元組）的文件以 mmap 讀取，只解碼結構區塊的行
+MMAP_THRESHOLD = 1024 * 1024
+# 可能開始結構區塊的位元組：方框符號（├ └ │ 等）的 UTF-8 前綴、ASCII 分支的 -- 與 /
+_STRUCTURE_START_NEEDLES = (b'\xe2\x94', b'--', b'/')
+# 圍欄代碼行（結構區塊在此結束）
+_FENCE_LINE_BYTES = re.compile(rb'^[ \t]*```', re.MULTILINE)
 
 
 class StructureParser:
     """解析目錄樹狀結構"""
 
-    def __init__(self, readme_path: str = "README.md"):
+    def __init__(self, readme_path: str = "README.md", cache: Optional[ParseCache] = None,
+                 block: Optional[Union[int, str]] = None,
+                 classifier: Optional[FileClassifier] = None):
         self.readme_path = Path(readme_path)
+        self.cache = cache
+        # 文件 / 目錄分類規則（預設載入所有內建語言包）
+        self.classifier = classifier or default_classifier()
+        # 只解析指定的圍欄區塊（索引或標題），None 表示整份文件
+        self.block = block
+        self.mmap_threshold = MMAP_THRESHOLD
+        self._blocks: Optional[List[FencedBlock]] = None
         self.structure = {}
+        self._index: Optional[StructureIndex] = None
+        self._index_source: Optional[Dict] = None
+
+    def _split_line(self, line: str) -> Tuple[int, bool, str, Optional[str]]:
+        """單次比對切出 (欄位, 是否為分支行, 原始名稱, 原始註解)
+
+        分支行的欄位是分支符號（├ └ |-- 等）所在的欄位；非分支行是名稱開始的欄位。
+        """
+        match = _BRANCH_LINE.match(line)
+        if match:
+            return len(match.group('prefix')), True, match.group('name'), match.group('comment')
+        match = _PLAIN_LINE.match(line)
+        return match.start('name'), False, match.group('name'), match.group('comment')
+
+    def _tokenize(self, line: str) -> Optional[Tuple[int, bool, str, Optional[str], bool]]:
+        """將一行樹狀圖轉為 (欄位, 是否為分支行, 名稱, 註解, 是否為目錄)，沒有名稱時返回 None"""
+        column, branch, name, comment = self._split_line(line)
+
+        # 移除名稱末尾的斜線（如果有），斜線優先視為目錄
+        name = name.strip()
+        trailing_slash = name.endswith('/')
+        if trailing_slash:
+            name = name.rstrip('/')
+        if not name:
+            return None
+
+        if comment is not None:
+            comment = comment.strip()
+
+        return column, branch, name, comment, self.classifier.is_directory(name, trailing_slash)
 
     def _calculate_level(self, line: str) -> int:
-        """計算縮排層級"""
-        # 計算前導空格
-        stripped = line.lstrip()
-        indent = len(line) - len(stripped)
-
-        # 檢查是否有樹狀符號
-        has_tree_chars = any(char in line for char in ['├', '└', '│'])
-
-        if not has_tree_chars:
-            # 沒有樹狀符號，使用空格計算（每3個空格一層）
-            return indent // 3
-
-        # 有樹狀符號的情況
-        # 計算 ├ 或 └ 的數量（每個表示一個層級）
-        # 但需要考慮前面的空格
-        level = 0
-
-        # 計算 ├ 或 └ 的數量
-        branch_count = line.count('├') + line.count('└')
-
-        # 如果沒有分支符號，可能是純 │ 行（這種情況不應該出現在結構定義中）
-        if branch_count == 0:
-            # 使用空格計算
-            level = indent // 3
-        else:
-            # 有分支符號，層級 = 分支符號前的空格層級 + 分支符號數量
-            # 找到第一個 ├ 或 └ 的位置
-            first_branch_pos = -1
-            for i, char in enumerate(line):
-                if char in ['├', '└']:
-                    first_branch_pos = i
-                    break
-
-            if first_branch_pos > 0:
-                # 分支符號前的空格層級
-                space_level = first_branch_pos // 3
-                level = space_level + branch_count
-            else:
-                level = branch_count
+        """單行的縮排層級估計（每 3 個字元一層，分支行再加一層）
 
-        return level
+        解析時不使用此值：巢狀關係由各行的欄位與已開啟目錄的欄位比較決定。
+        """
+        match = _BRANCH_LINE.match(line)
+        if match:
+            return len(match.group('prefix')) // 3 + 1
+        return len(_PLAIN_LINE.match(line).group('indent')) // 3
 
     def _extract_name_and_comment(self, line: str) -> Tuple[Optional[str], Optional[str]]:
         """提取文件名/目錄名和註解"""
-        # 移除樹狀符號和空格
-        # 匹配開頭的樹狀符號：├─, └─, │, ─, 空格
-        cleaned = re.sub(r'^[├└│─\s]+', '', line)
-
-        # 分離路徑和註解
-        parts = cleaned.split('←')
-        name_part = parts[0].strip()
-        comment = parts[1].strip() if len(parts) > 1 else None
-
-        # 移除名稱末尾的斜線（如果有）
-        if name_part.endswith('/'):
-            name_part = name_part.rstrip('/')
-
-        # 移除註解中的 emoji 和清理
-        if comment:
-            comment = comment.strip()
-
-        if not name_part:
+        token = self._tokenize(line)
+        if token is None:
             return None, None
-
-        return name_part, comment
+        return token[2], token[3]
 
     def _is_directory(self, name: str) -> bool:
-        """判斷是否為目錄"""
-        # 有副檔名的通常是文件
-        if '.' in name and name.split('.')[-1] in ['py', 'md', 'toml', 'json', 'js', 'ts', 'tsx', 'jsx', 'yml', 'yaml']:
-            return False
-        return True
+        """判斷是否為目錄（依分類規則）"""
+        return self.classifier.is_directory(name)
 
-    def parse(self) -> Dict:
-        """解析 README.md 並返回結構字典"""
+    def parse_iter(self) -> Iterator[ParseEvent]:
+        """逐行讀取結構文件，依序產生節點事件（進入目錄、文件、離開目錄）"""
         if not self.readme_path.exists():
             raise FileNotFoundError(f"找不到文件: {self.readme_path}")
 
+        if self.block is not None:
+            return self._iter_block_events(self.select_block(self.block))
+        return self._iter_file_events()
+
+    def _iter_file_events(self) -> Iterator[ParseEvent]:
+        """惰性讀取文件內容並產生事件（大型文件改用 mmap）"""
+        size = os.path.getsize(self.readme_path)
+        if size and size >= self.mmap_threshold:
+            yield from self._iter_mmap_events()
+            return
         with open(self.readme_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
+            yield from self._iter_events(f)
+
+    def _iter_mmap_events(self) -> Iterator[ParseEvent]:
+        """以位元組搜尋定位結構區塊，只解碼區塊內的行"""
+        with open(self.readme_path, 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = self._find_structure_start(mm)
+            if start < 0:
+                return
+            fence = _FENCE_LINE_BYTES.search(mm, start)
+            end = fence.start() if fence else len(mm)
+            # 一併解碼前兩行：可能是開頭圍欄與 tree 指令輸出的根目錄名稱
+            for _ in range(2):
+                if start:
+                    start = mm.rfind(b'\n', 0, start - 1) + 1
+            yield from self._iter_events(self._iter_mmap_lines(mm, start, end))
+
+    @classmethod
+    def _find_structure_start(cls, mm: mmap.mmap) -> int:
+        """返回第一個結構行的起始位元組偏移，找不到時返回 -1
+
+        以 mmap.find 搜尋候選位元組（每個 needle 只在越過上次位置後才重新搜尋），
+        只解碼候選所在的行再以文字規則確認。
+        """
+        size = len(mm)
+        hits = [mm.find(needle) for needle in _STRUCTURE_START_NEEDLES]
+        pos = 0
+        while True:
+            for i, needle in enumerate(_STRUCTURE_START_NEEDLES):
+                if 0 <= hits[i] < pos:
+                    hits[i] = mm.find(needle, pos)
+            candidates = [hit for hit in hits if hit >= 0]
+            if not candidates:
+                return -1
+            hit = min(candidates)
+            line_start = mm.rfind(b'\n', 0, hit) + 1
+            line_end = mm.find(b'\n', hit)
+            if line_end < 0:
+                line_end = size
+            line = mm[line_start:line_end].decode('utf-8').rstrip()
+            if cls._is_structure_start(line, line.lstrip()):
+                return line_start
+            pos = line_end + 1
+
+    @staticmethod
+    def _iter_mmap_lines(mm: mmap.mmap, start: int, end: int) -> Iterator[str]:
+        """逐行解碼 mm[start:end]"""
+        pos = start
+        while pos < end:
+            line_end = mm.find(b'\n', pos, end)
+            if line_end < 0:
+                line_end = end
+            yield mm[pos:line_end].decode('utf-8')
+            pos = line_end + 1
+
+    @staticmethod
+    def _is_structure_start(line: str, stripped: str) -> bool:
+        """是否進入結構區塊（包含樹狀符號或看起來像路徑）"""
+        return bool(_TREE_GLYPH.search(line)) or ('/' in line and not stripped.startswith('#'))
+
+    def list_blocks(self) -> List[FencedBlock]:
+        """文件中所有圍欄代碼區塊（單次掃描後快取）"""
+        if self._blocks is None:
+            if not self.readme_path.exists():
+                raise FileNotFoundError(f"找不到文件: {self.readme_path}")
+            self._blocks = scan_fenced_blocks(self.readme_path)
+        return self._blocks
+
+    def select_block(self, selector: Union[int, str]) -> FencedBlock:
+        """依索引或標題選取圍欄區塊"""
+        return select_block(self.list_blocks(), selector)
+
+    def _iter_block_events(self, block: FencedBlock) -> Iterator[ParseEvent]:
+        """只讀取指定區塊的位元組範圍並產生事件"""
+        with open(self.readme_path, 'rb') as f:
+            f.seek(block.start)
+            yield from self._iter_events(self._read_range(f, block.end - block.start), in_fence=True)
+
+    @staticmethod
+    def _read_range(f, remaining: int) -> Iterator[str]:
+        """從目前位置逐行讀取 remaining 個位元組並解碼"""
+        while remaining > 0:
+            raw = f.readline(remaining)
+            if not raw:
+                break
+            remaining -= len(raw)
+            yield raw.decode('utf-8')
+
+    def parse_blocks(self) -> Dict[str, Dict]:
+        """解析所有樹狀結構區塊，返回 {區塊名稱: 結構字典}
+
+        只解析資訊字串為空或 text/tree 等純文字的區塊，空結構不列入。
+        """
+        results: Dict[str, Dict] = {}
+        for block in self.list_blocks():
+            if block.info not in TREE_BLOCK_INFOS:
+                continue
+            structure = self._build_structure(self._iter_block_events(block))
+            if not structure:
+                continue
+            name = block.name if block.name not in results else f"{block.name} #{block.index}"
+            results[name] = structure
+        return results
 
-        structure = {}
-        path_stack = []  # 追蹤當前路徑層級
+    def _iter_events(self, lines: Iterable[str], in_fence: bool = False) -> Iterator[ParseEvent]:
+        """從文字行產生節點事件
+
+        in_fence 表示第一行就是圍欄區塊的第一行（以 --block 讀取區塊內容時）。
+        """
+        # 追蹤當前開啟的目錄 (name, path, 欄位深度, 層級)
+        path_stack: List[Tuple[str, str, int, int]] = []
         in_structure_block = False  # 是否在結構區塊中
+        fence_open = in_fence  # 結構區塊之前是否位於圍欄區塊內
+        first_in_fence = in_fence  # 目前這一行是否為圍欄區塊的第一行
+        candidate: Optional[str] = None  # 圍欄區塊第一行的單一名稱（可能是 tree 指令的根目錄）
+        # tree 指令的根目錄：區塊以統計行結尾時才成立，確認前先暫存事件
+        tree_root: Optional[str] = None
+        pending: List[ParseEvent] = []
+        ends_with_summary = False
+
+        def emit(event: ParseEvent) -> Iterator[ParseEvent]:
+            if tree_root is None:
+                yield event
+            else:
+                pending.append(event)
 
         for line in lines:
-            original_line = line
             line = line.rstrip()
+            stripped = line.lstrip()
+            is_first, first_in_fence = first_in_fence, False
 
             # 跳過空行
-            if not line.strip():
-                if in_structure_block:
-                    continue  # 在結構區塊中的空行可以繼續
-                else:
-                    continue
+            if not stripped:
+                candidate = None
+                continue
 
-            # 檢查是否進入結構區塊（包含樹狀符號或看起來像路徑）
+            # 檢查是否進入結構區塊
             if not in_structure_block:
-                # 檢查是否包含樹狀符號（├, └, │）或看起來像路徑（包含 / 或 .py/.md 等）
-                if any(char in line for char in ['├', '└', '│']) or ('/' in line and not line.strip().startswith('#')):
-                    in_structure_block = True
-                else:
+                if not self._is_structure_start(line, stripped):
+                    candidate = stripped if is_first and _TREE_ROOT.fullmatch(stripped) else None
+                    if stripped.startswith('```'):
+                        fence_open = not fence_open
+                        first_in_fence = fence_open
                     continue
+                in_structure_block = True
+                # tree 指令輸出：圍欄區塊第一行只有名稱、下一行是第一層分支時視為根目錄候選
+                if candidate and candidate != '.' and self._split_line(line)[:2] == (0, True):
+                    tree_root = candidate
+
+            # tree 指令的統計行不是節點
+            if _TREE_SUMMARY.fullmatch(stripped):
+                ends_with_summary = True
+                continue
+
+            # 如果遇到明顯的非結構行（如代碼塊、標題等），停止
+            if stripped.startswith('```'):
+                break
+            # 沒有樹狀符號、沒有註解、沒有縮排也不像路徑的純文字描述，停止
+            if (not _TREE_GLYPH_OR_LINE.search(line) and '←' not in line
+                    and not line.startswith((' ', '\t')) and not _PATH_HINT.search(stripped)):
+                break
 
-            # 如果已經在結構區塊中
-            if in_structure_block:
-                # 如果遇到明顯的非結構行（如代碼塊、標題等），停止
-                stripped = line.strip()
-                if stripped.startswith('```'):
-                    break
-                # 如果是不包含樹狀符號的普通文字行，且不是結構的一部分，停止
-                if not any(char in line for char in ['├', '└', '│', '─']) and not stripped.startswith(' ') and len(stripped) > 0:
-                    # 但如果是註解行（包含 ←），繼續
-                    if '←' not in line:
-                        # 檢查是否是純文字描述（沒有縮排）
-                        if not line.startswith((' ', '\t')) and stripped and not any(c in stripped for c in ['/', '.py', '.md', '.toml', '.json']):
-                            break
-
-            level = self._calculate_level(line)
-            name, comment = self._extract_name_and_comment(line)
-
-            if not name:
+            token = self._tokenize(line)
+            if token is None:
                 continue
+            ends_with_summary = False
+            column, branch, name, comment, is_dir = token
+            # 分支符號位於父目錄名稱所在的欄位，因此同一欄位的分支行比非分支行深一層
+            depth = column * 2 + branch
+
+            # 關閉欄位不小於當前節點的目錄（不依賴固定的縮排寬度）
+            while path_stack and path_stack[-1][2] >= depth:
+                dir_name, dir_path, _, dir_level = path_stack.pop()
+                yield from emit(ParseEvent(EVENT_LEAVE_DIR, dir_path, dir_level, dir_name, None))
+
+            if path_stack:
+                path = f"{path_stack[-1][1]}/{name}"
+                level = path_stack[-1][3] + 1
+            else:
+                path = name
+                level = int(branch)
+            if is_dir:
+                yield from emit(ParseEvent(EVENT_ENTER_DIR, path, level, name, comment))
+                path_stack.append((name, path, depth, level))
+            else:
+                yield from emit(ParseEvent(EVENT_FILE, path, level, name, comment))
+
+        # 關閉剩餘的目錄
+        while path_stack:
+            dir_name, dir_path, _, dir_level = path_stack.pop()
+            yield from emit(ParseEvent(EVENT_LEAVE_DIR, dir_path, dir_level, dir_name, None))
+
+        if tree_root is None:
+            return
+        if not ends_with_summary:
+            # 不是 tree 指令輸出：第一行只是說明文字
+            yield from pending
+            return
+        # 第一層分支的層級本來就是 1，只需在路徑前加上根目錄
+        yield ParseEvent(EVENT_ENTER_DIR, tree_root, 0, tree_root, None)
+        for event in pending:
+            yield event._replace(path=f"{tree_root}/{event.path}")
+        yield ParseEvent(EVENT_LEAVE_DIR, tree_root, 0, tree_root, None)
+
+    def parse(self) -> Dict:
+        """解析 README.md 並返回結構字典（有快取時優先讀取快取）"""
+        if self.cache is None:
+            self.structure = self._build_structure(self.parse_iter())
+            return self.structure
+
+        if not self.readme_path.exists():
+            raise FileNotFoundError(f"找不到文件: {self.readme_path}")
 
-            is_dir = self._is_directory(name)
+        extra = f"block={self.block!r};classifier={self.classifier.fingerprint()}"
+        key = self.cache.key_for(self.readme_path, PARSER_VERSION, extra)
+        structure = self.cache.get(key)
+        if structure is None:
+            structure = self._build_structure(self.parse_iter())
+            self.cache.put(key, structure)
 
-            # 調整路徑堆疊到正確層級
-            while len(path_stack) > level:
-                path_stack.pop()
+        self.structure = structure
+        return structure
+
+    def _build_structure(self, events: Iterable[ParseEvent]) -> Dict:
+        """由節點事件建立巢狀結構字典"""
+        structure = {}
+        # 當前開啟目錄的 children 字典，新節點直接掛到堆疊頂端
+        parents: List[Dict] = [structure]
+
+        for event in events:
+            if event.kind == EVENT_LEAVE_DIR:
+                parents.pop()
+                continue
+
+            is_dir = event.kind == EVENT_ENTER_DIR
 
             # 建立當前節點
             node = {
                 'type': 'directory' if is_dir else 'file',
-                'name': name,
-                'comment': comment,
+                'name': event.name,
+                'comment': event.comment,
                 'children': {} if is_dir else None
             }
+            parents[-1][event.name] = node
 
-            # 插入到結構中
-            if level == 0:
-                # 根節點
-                structure[name] = node
-                path_stack = [name]
-            else:
-                # 子節點
-                current = structure
-                for part in path_stack:
-                    if part not in current:
-                        current[part] = {
-                            'type': 'directory',
-                            'name': part,
-                            'comment': None,
-                            'children': {}
-                        }
-                    current = current[part]['children']
-
-                current[name] = node
-
-                # 如果是目錄，加入路徑堆疊
-                if is_dir:
-                    path_stack.append(name)
+            # 如果是目錄，後續子節點掛在它的 children 下
+            if is_dir:
+                parents.append(node['children'])
 
-        self.structure = structure
         return structure
 
+    @property
+    def index(self) -> StructureIndex:
+        """當前結構的路徑索引（首次使用時建立，結構變更後重建）"""
+        if self._index is None or self._index_source is not self.structure:
+            self._index = StructureIndex(self.structure)
+            self._index_source = self.structure
+        return self._index
+
     def get_file_list(self) -> List[Tuple[str, str]]:
         """返回所有文件的列表 (full_path, type)"""
-        files = []
-
-        def traverse(node: Dict, parent_path: str = ""):
-            for name, info in node.items():
-                if isinstance(info, dict):
-                    current_path = f"{parent_path}/{name}" if parent_path else name
-                    if info.get('type') == 'file':
-                        files.append((current_path, name))
-                    elif 'children' in info and info['children']:
-                        traverse(info['children'], current_path)
-
-        traverse(self.structure)
-        return files
+        return list(self.index.files)
 
     def get_directory_list(self) -> List[str]:
         """返回所有目錄的列表"""
-        directories = []
-
-        def traverse(node: Dict, parent_path: str = ""):
-            for name, info in node.items():
-                if isinstance(info, dict):
-                    current_path = f"{parent_path}/{name}" if parent_path else name
-                    if info.get('type') == 'directory':
-                        directories.append(current_path)
-                    if 'children' in info and info['children']:
-                        traverse(info['children'], current_path)
-
-        traverse(self.structure)
-        return directories
+        return list(self.index.directories)
@@ -0,0 +1,161 @@
+"""
+模板引擎
+
+- 每個模板只編譯一次：str.format 語法轉成 % 格式字串，渲染時只做一次 C 層級的格式化
+- 文件依「完整文件名 → 副檔名 → 預設模板」選擇，各為一次字典查詢
+- 渲染結果（連同內容與參數雜湊）依 (模板, 參數) 快取：大量文件（__init__.py、
+  預設註解的 README.md）內容相同時只渲染與雜湊一次
+- 可註冊自訂模板包（TemplatePack）
+"""
+import string
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+
+from generation_plan import content_hash, params_hash
+
+# 由 (文件名, 註解, 父目錄名稱) 產生模板參數
+ParamsBuilder = Callable[[str, Optional[str], str], Dict[str, str]]
+
+DEFAULT_CACHE_SIZE = 4096
+
+
+class TemplatePack(NamedTuple):
+    """一組自訂模板：完整文件名與副檔名（含點）對應到 str.format 模板"""
+    filenames: Dict[str, str] = {}
+    suffixes: Dict[str, str] = {}
+
+
+class Rendered(NamedTuple):
+    """渲染結果"""
+    content: str
+    content_hash: str
+    params_hash: str
+
+
+def standard_params(node_name: str, comment: Optional[str], parent_name: str) -> Dict[str, str]:
+    """自訂模板可使用的參數：name（去掉副檔名）、filename、comment、parent"""
+    suffix = file_suffix(node_name)
+    return {
+        'name': node_name[:-len(suffix)] if suffix else node_name,
+        'filename': node_name,
+        'comment': comment or '',
+        'parent': parent_name,
+    }
+
+
+def file_suffix(name: str) -> str:
+    """副檔名（規則與 Path.suffix 相同，不建立 Path 物件）"""
+    i = name.rfind('.')
+    if 0 < i < len(name) - 1:
+        return name[i:]
+    return ''
+
+
+class CompiledTemplate:
+    """編譯後的模板"""
+
+    __slots__ = ('source', 'fields', '_compiled', '_simple')
+
+    def __init__(self, source: str):
+        self.source = source
+        fields = []
+        compiled = []
+        simple = True
+        for literal, field, spec, conversion in string.Formatter().parse(source):
+            compiled.append(literal.replace('%', '%%'))
+            if field is None:
+                continue
+            if spec or conversion or not field.isidentifier():
+                # 格式規格、轉換或屬性存取：保留 str.format
+                simple = False
+            fields.append(field)
+            compiled.append(f"%({field})s")
+        self.fields = tuple(fields)
+        self._compiled = ''.join(compiled)
+        self._simple = simple
+
+    def render(self, params: Dict[str, str]) -> str:
+        if self._simple:
+            return self._compiled % params
+        return self.source.format(**params)
+
+
+class TemplateEngine:
+    """依文件名選擇模板並快取渲染結果"""
+
+    def __init__(self, default: Tuple[str, str, ParamsBuilder],
+                 cache_size: int = DEFAULT_CACHE_SIZE):
+        """default 為沒有規則符合時使用的 (模板 ID, 模板, 參數產生函式)"""
+        self._templates: Dict[str, CompiledTemplate] = {}
+        self._filenames: Dict[str, Tuple[str, ParamsBuilder]] = {}
+        self._suffixes: Dict[str, Tuple[str, ParamsBuilder]] = {}
+        self._cache: Dict[Tuple, Rendered] = {}
+        self.cache_size = cache_size
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        template_id, source, params = default
+        self.register(template_id, source)
+        self._default = (template_id, params)
+
+    def register(self, template_id: str, source: str):
+        """註冊（或取代）模板，不建立選擇規則"""
+        self._templates[template_id] = CompiledTemplate(source)
+        self._cache.clear()
+
+    def register_filename(self, filename: str, source: str,
+                          params: Optional[ParamsBuilder] = None,
+                          template_id: Optional[str] = None):
+        """完整文件名規則（優先於副檔名）"""
+        template_id = template_id or filename
+        self.register(template_id, source)
+        self._filenames[filename] = (template_id, params or standard_params)
+
+    def register_suffix(self, suffix: str, source: str,
+                        params: Optional[ParamsBuilder] = None,
+                        template_id: Optional[str] = None):
+        """副檔名規則（含開頭的點，例如 .ts）"""
+        template_id = template_id or suffix
+        self.register(template_id, source)
+        self._suffixes[suffix] = (template_id, params or standard_params)
+
+    def register_pack(self, pack: TemplatePack):
+        """註冊自訂模板包（取代同名的既有規則）"""
+        for filename, source in pack.filenames.items():
+            self.register_filename(filename, source)
+        for suffix, source in pack.suffixes.items():
+            if not suffix.startswith('.'):
+                raise ValueError(f"副檔名需以 . 開頭: {suffix}")
+            self.register_suffix(suffix, source)
+
+    def select(self, node_name: str, comment: Optional[str],
+               parent_name: str) -> Tuple[str, Dict[str, str]]:
+        """依完整文件名、副檔名、預設模板的順序選擇 (模板 ID, 參數)"""
+        rule = self._filenames.get(node_name)
+        if rule is None:
+            rule = self._suffixes.get(file_suffix(node_name), self._default)
+        template_id, params = rule
+        return template_id, params(node_name, comment, parent_name)
+
+    def render(self, template_id: str, params: Dict[str, str]) -> str:
+        """渲染模板（相同模板與參數只渲染一次）"""
+        return self.render_entry(template_id, params).content
+
+    def render_entry(self, template_id: str, params: Dict[str, str]) -> Rendered:
+        """渲染模板並附上內容與參數雜湊（相同模板與參數只計算一次）"""
+        key = (template_id, *params.items())
+        try:
+            rendered = self._cache[key]
+        except KeyError:
+            pass
+        else:
+            self.cache_hits += 1
+            return rendered
+
+        self.cache_misses += 1
+        content = self._templates[template_id].render(params)
+        rendered = Rendered(content, content_hash(content), params_hash(params))
+        if len(self._cache) >= self.cache_size:
+            # 淘汰最早加入的項目，快取大小固定
+            del self._cache[next(iter(self._cache))]
+        self._cache[key] = rendered
+        return rendered
@@ -0,0 +1,86 @@
+"""
+生成結果的目錄樹快照：一次 FileSystem.scan 走訪取得所有路徑、類型、大小與 mtime
+"""
+import fnmatch
+import os
+import re
+import time
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Optional, Union
+
+from filesystem import FileSystem, ScanEntry, default_filesystem
+
+
+class TreeSnapshot:
+    """目錄樹快照
+
+    - root_exists: 根目錄是否存在
+    - files / directories: 相對於根目錄的路徑列表（以 / 分隔，依走訪順序）
+    - file_set / directory_set: 同上的集合
+    - entries: 相對路徑 -> ScanEntry（大小、mtime_ns、inode）
+    - scanned_ns: 開始走訪的時間（time.time_ns）
+    """
+
+    def __init__(self, root: Union[str, Path], fs: Optional[FileSystem] = None):
+        self.root = Path(root)
+        self.fs = fs if fs is not None else default_filesystem()
+        self.files: List[str] = []
+        self.directories: List[str] = []
+        self.entries: Dict[str, ScanEntry] = {}
+        self._names: List[str] = []
+        self._matches: Dict[str, List[str]] = {}
+        self._case_names: Optional[List[str]] = None
+
+        self.scanned_ns = time.time_ns()
+        self.root_exists = self.fs.is_dir(self.root)
+        if self.root_exists:
+            self._build()
+
+        self.file_set: FrozenSet[str] = frozenset(self.files)
+        self.directory_set: FrozenSet[str] = frozenset(self.directories)
+
+    def _build(self):
+        """單次走訪，記錄每個項目的相對路徑與 stat 資訊"""
+        root = os.fspath(self.root)
+        for dirpath, dirs, files in self.fs.scan(root):
+            relative = os.path.relpath(dirpath, root).replace('\\', '/')
+            prefix = '' if relative == '.' else relative + '/'
+            for entry in dirs:
+                path = prefix + entry.name
+                self.directories.append(path)
+                self.entries[path] = entry
+            for entry in files:
+                path = prefix + entry.name
+                self.files.append(path)
+                self._names.append(entry.name)
+                self.entries[path] = entry
+
+    def files_matching(self, pattern: str) -> List[str]:
+        """文件名稱符合 pattern（fnmatch）的相對路徑，依走訪順序"""
+        try:
+            return self._matches[pattern]
+        except KeyError:
+            pass
+        match = re.compile(fnmatch.translate(os.path.normcase(pattern))).match
+        if self._case_names is None:
+            # 與 fnmatch 相同，依平台規則比較大小寫（POSIX 上不變）
+            self._case_names = [os.path.normcase(name) for name in self._names]
+        matched = [path for path, name in zip(self.files, self._case_names) if match(name)]
+        self._matches[pattern] = matched
+        return matched
+
+    def full_path(self, relative_path: str) -> str:
+        """相對路徑對應的完整路徑"""
+        return os.path.join(self.root, relative_path)
+
+    def exists(self, relative_path: str = '') -> bool:
+        """相對路徑是否存在（空字串為根目錄）"""
+        if not relative_path:
+            return self.root_exists
+        return relative_path in self.entries
+
+    def is_dir(self, relative_path: str = '') -> bool:
+        """相對路徑是否為目錄（空字串為根目錄）"""
+        if not relative_path:
+            return self.root_exists
+        return relative_path in self.directory_set
@@ -0,0 +1,63 @@
+"""
+驗證結果的磁碟快取
+
+以 (相對路徑, inode, 大小, mtime_ns) 為鍵保存每個文件的內容檢查結果
+（模板檢查與命中的預期註解）；再次驗證同一個生成目錄時只重新讀取改變過的文件。
+
+每個生成目錄對應一個快取項目，鍵為「目錄絕對路徑 + 檢查規則版本 + 額外參數
+（讀取上限、預期註解摘要）」的 SHA-256；儲存格式與容量淘汰見 disk_cache。
+mtime 距離走訪時間不到 RACY_WINDOW_NS 的文件不寫入快取：同一個時間刻度內
+再次修改的文件，大小與 mtime 可能都不會改變。
+"""
+import hashlib
+import os
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+from disk_cache import DiskCache
+
+# 快取目錄環境變數 / 停用快取環境變數
+CACHE_DIR_ENV = 'PROJECT_STRUCTURE_VERIFY_CACHE_DIR'
+NO_CACHE_ENV = 'PROJECT_STRUCTURE_NO_VERIFY_CACHE'
+
+# mtime 與走訪時間相距不到此值（奈秒）的文件不寫入快取
+RACY_WINDOW_NS = 2 * 1000 ** 3
+
+# 快取項目：相對路徑 -> (inode, 大小, mtime_ns, 檢查結果, 命中的註解)
+CacheEntry = Tuple[int, int, int, Dict, Tuple[str, ...]]
+
+
+class VerificationCache(DiskCache):
+    """以文件 stat 資訊為鍵的驗證結果快取"""
+
+    CACHE_DIR_ENV = CACHE_DIR_ENV
+    NO_CACHE_ENV = NO_CACHE_ENV
+    SUBDIR = 'verify'
+
+    def key_for_tree(self, root: Path, version: str, extra: Iterable[str] = ()) -> str:
+        """計算生成目錄的快取鍵：絕對路徑 + 檢查規則版本 + 額外參數"""
+        digest = hashlib.sha256()
+        digest.update(f"{os.path.abspath(root)}\0{version}\0".encode('utf-8'))
+        for value in extra:
+            digest.update(f"{value}\0".encode('utf-8'))
+        return digest.hexdigest()
+
+    def load(self, key: str) -> Dict[str, CacheEntry]:
+        """讀取生成目錄的快取項目，未命中或格式不符時返回空字典"""
+        entries = self.get(key)
+        return entries if isinstance(entries, dict) else {}
+
+    def save(self, key: str, entries: Dict[str, CacheEntry], scanned_ns: int):
+        """寫入快取項目，略過 mtime 太接近走訪時間的文件"""
+        limit = scanned_ns - RACY_WINDOW_NS
+        self.put(key, {path: entry for path, entry in entries.items() if entry[2] < limit})
+
+
+def set_verification_cache_enabled(enabled: bool):
+    """啟用或停用預設驗證快取（對應 --no-verify-cache）"""
+    VerificationCache.set_enabled(enabled)
+
+
+def default_verification_cache() -> Optional[VerificationCache]:
+    """返回預設驗證快取，停用時返回 None"""
+    return VerificationCache.default()
@@ -1,34 +1,284 @@
 """
 專案結構生成驗證指標計算器
+
+生成的專案只走訪一次（TreeSnapshot），所有指標都由同一份快照計算；
+compute() 返回唯讀的 MetricsResult，供所有報告與語言共用。
+每個指標都登記在 METRICS 中並宣告所需的共用輸入（預期結構索引、目錄樹快照、文件內容），
+只選取部分指標時（compute(['file_coverage'])）只準備這些指標需要的輸入。
+磁碟上的文件內容檢查結果以 stat 資訊為鍵快取（VerificationCache），未改變的文件不再重新讀取。
 """
-import os
+import hashlib
+from collections.abc import Mapping
 from pathlib import Path
-from typing import Dict, List, Tuple
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+from filesystem import DiskFileSystem, FileSystem, default_filesystem
 from structure_parser import StructureParser
+from structure_index import StructureIndex
+from parse_cache import default_parse_cache
+from multi_pattern import AhoCorasick
+from content_checks import (
+    ContentChecker, ContentResult, ContentRule, DEFAULT_MAX_BYTES, DEFAULT_WORKERS
+)
+from tree_snapshot import TreeSnapshot
+from verification_cache import VerificationCache, default_verification_cache
+
+# 預期結構中的外層目錄，其內容相對於生成的專案根目錄
+PROJECT_ROOT_NAMES = ('system', 'project1')
+
+# 總體分數：(指標, 比率鍵, 權重)
+SCORE_WEIGHTS = (
+    ('structure_coverage', 'overall_coverage', 0.3),
+    ('file_coverage', 'coverage_rate', 0.2),
+    ('directory_coverage', 'coverage_rate', 0.2),
+    ('template_accuracy', 'accuracy_rate', 0.1),
+    ('hierarchy_accuracy', 'overall_accuracy', 0.1),
+    ('annotation_preservation', 'preservation_rate', 0.05),
+    ('module_independence', 'independence_rate', 0.05),
+)
+
+
+def overall_score(metrics: Mapping) -> float:
+    """各指標比率依權重加總的總體分數（0-100）"""
+    return sum(metrics[name][key] * weight for name, key, weight in SCORE_WEIGHTS) * 100
+
+
+# 模板檢查：(文件名稱樣式, 內容檢查規則)；README.md 與 Python 文件同時比對註解
+# 修改規則時須遞增 CONTENT_RULES_VERSION，使驗證快取失效
+CONTENT_RULES_VERSION = '1'
+CONTENT_RULES = (
+    ('pyproject.toml', ContentRule(
+        ('[project]', 'name =', '[build-system]'),
+        lambda found, _: {
+            'passed': found['[project]'] and found['name ='],
+            'has_build_system': found['[build-system]'],
+            'has_project_section': found['[project]'],
+        })),
+    ('package.json', ContentRule(
+        ('"name"', '"version"'),
+        lambda found, _: {
+            'passed': found['"name"'] and found['"version"'],
+            'has_name': found['"name"'],
+            'has_version': found['"version"'],
+        })),
+    ('*.py', ContentRule(
+        ('def main()', '"""'),
+        lambda found, _: {
+            'passed': found['def main()'] or found['"""'],
+            'has_docstring': found['"""'],
+            'has_main': found['def main()'],
+        }, annotations=True)),
+    ('README.md', ContentRule(
+        (),
+        lambda _, has_content: {'passed': has_content, 'has_content': has_content},
+        annotations=True)),
+)
+
+
+# 指標計算所需的共用輸入（VerificationMetrics 上同名的屬性，第一次使用時計算）
+INPUT_EXPECTED = 'expected_index'   # 預期結構索引（解析結構文件）
+INPUT_SNAPSHOT = 'snapshot'         # 生成專案的目錄樹快照（走訪目錄）
+INPUT_CONTENTS = 'contents'         # 文件內容檢查結果（讀取文件）
+
+
+class MetricSpec(NamedTuple):
+    """已登記的指標：計算方法名稱與所需輸入"""
+    method: str
+    inputs: Tuple[str, ...]
+
+
+# 指標名稱 -> MetricSpec，依登記順序（即報告與 calculate_all_metrics 的順序）
+METRICS: Dict[str, MetricSpec] = {}
+
+
+def metric(name: str, *inputs: str) -> Callable:
+    """將 VerificationMetrics 的計算方法登記為指標"""
+    def register(method: Callable) -> Callable:
+        METRICS[name] = MetricSpec(method.__name__, inputs)
+        return method
+    return register
+
+
+def select_metrics(names: Iterable[str]) -> Tuple[str, ...]:
+    """檢查指標名稱並依登記順序返回（去除重複）"""
+    selected = set(names)
+    unknown = sorted(selected - METRICS.keys())
+    if unknown:
+        raise ValueError(f"未知的指標: {', '.join(unknown)}（可用: {', '.join(METRICS)}）")
+    if not selected:
+        raise ValueError(f"未指定指標（可用: {', '.join(METRICS)}）")
+    return tuple(name for name in METRICS if name in selected)
+
+
+def parse_metric_selection(value: str) -> Tuple[str, ...]:
+    """將逗號分隔的指標名稱轉為指標選擇（對應 --metrics）"""
+    return select_metrics(name.strip() for name in value.split(',') if name.strip())
+
+
+def _freeze(value: Any) -> Any:
+    """字典轉為唯讀映射、列表轉為 tuple"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """_freeze 的反向轉換"""
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+class MetricsResult(Mapping):
+    """計算完成的驗證指標（唯讀）
+
+    鍵與 calculate_all_metrics() 相同，overall_score 已計算（只選取部分指標時只包含
+    選取的指標，且所有計分指標都在時才有 overall_score）。報告只讀取指標，
+    同一個結果可直接用於所有報告與語言；to_dict() 返回可修改的副本（例如輸出 JSON）。
+    """
+
+    def __init__(self, metrics: Dict):
+        metrics = dict(metrics)
+        if all(name in metrics for name, _, _ in SCORE_WEIGHTS):
+            metrics['overall_score'] = overall_score(metrics)
+        self._metrics = _freeze(metrics)
+
+    def __getitem__(self, key: str) -> Any:
+        return self._metrics[key]
+
+    def __iter__(self):
+        return iter(self._metrics)
+
+    def __len__(self) -> int:
+        return len(self._metrics)
+
+    def to_dict(self) -> Dict:
+        return _thaw(self._metrics)
 
 
 class VerificationMetrics:
     """驗證指標計算器"""
 
-    def __init__(self, structure_file: str, generated_path: str):
+    def __init__(self, structure_file: str, generated_path: str,
+                 block: Optional[Union[int, str]] = None, fs: Optional[FileSystem] = None,
+                 workers: int = DEFAULT_WORKERS, max_content_bytes: Optional[int] = DEFAULT_MAX_BYTES,
+                 cache: Optional[VerificationCache] = None):
         self.structure_file = Path(structure_file)
         self.generated_path = Path(generated_path)
-        self.parser = StructureParser(structure_file)
+        # 讀取生成結果的檔案系統（預設為磁碟；可傳入 MemoryFileSystem）
+        self.fs = fs if fs is not None else default_filesystem()
+        self.project_path = self.generated_path / 'system' / 'project1'
+        self.parser = StructureParser(structure_file, cache=default_parse_cache(), block=block)
         self.expected_structure = self.parser.parse()
+        self.expected_index = StructureIndex(self.expected_structure, PROJECT_ROOT_NAMES)
+        self._snapshot: Optional[TreeSnapshot] = None
+        self._annotation_matcher: Optional[AhoCorasick] = None
+        # 讀取文件內容的執行緒數量與每個文件最多讀取的位元組數（None 表示不限制）
+        self.workers = workers
+        self.max_content_bytes = max_content_bytes
+        self._content: Optional[Dict[str, ContentResult]] = None
+        # 內容檢查結果快取（僅用於磁碟；停用時為 None）與最近一次的命中統計
+        if cache is None and isinstance(self.fs, DiskFileSystem):
+            cache = default_verification_cache()
+        self.cache = cache
+        self.cache_stats = {'hits': 0, 'misses': 0}
+
+    @property
+    def snapshot(self) -> TreeSnapshot:
+        """生成專案的目錄樹快照（第一次使用時走訪，之後共用）"""
+        if self._snapshot is None:
+            self._snapshot = TreeSnapshot(self.project_path, self.fs)
+        return self._snapshot
+
+    @property
+    def annotation_matcher(self) -> AhoCorasick:
+        """預期註解的多字串比對自動機（只建立一次）"""
+        if self._annotation_matcher is None:
+            self._annotation_matcher = AhoCorasick(self.expected_index.annotations)
+        return self._annotation_matcher
+
+    @property
+    def contents(self) -> Dict[str, ContentResult]:
+        """文件內容檢查結果：相對路徑 -> ContentResult（第一次使用時讀取文件）"""
+        return self._content_results()
+
+    def refresh_snapshot(self):
+        """生成的專案已改變時，重新走訪目錄樹並重新讀取文件內容"""
+        self._snapshot = None
+        self._content = None
+
+    def _content_results(self) -> Dict[str, ContentResult]:
+        """所有需要檢查內容的文件只讀取一次（並行、只讀取判斷所需的前綴）
+
+        有快取時，inode、大小與 mtime_ns 都未改變的文件直接沿用上次的結果。
+        """
+        if self._content is None:
+            snapshot = self.snapshot
+            targets = [(relative_path, rule)
+                       for pattern, rule in CONTENT_RULES
+                       for relative_path in snapshot.files_matching(pattern)]
+            if self.cache is None:
+                cached, key = {}, None
+            else:
+                key = self.cache.key_for_tree(self.project_path, CONTENT_RULES_VERSION, (
+                    str(self.max_content_bytes),
+                    hashlib.sha256('\0'.join(self.annotation_matcher.patterns).encode('utf-8')).hexdigest(),
+                ))
+                cached = self.cache.load(key)
+
+            results: Dict[str, ContentResult] = {}
+            stale = []
+            entries = snapshot.entries
+            for relative_path, rule in targets:
+                entry = entries[relative_path]
+                hit = cached.get(relative_path)
+                if hit is not None and hit[:3] == (entry.inode, entry.size, entry.mtime_ns):
+                    results[relative_path] = ContentResult({'file': relative_path, **hit[3]}, frozenset(hit[4]))
+                else:
+                    stale.append((relative_path, snapshot.full_path(relative_path), rule))
+            checker = ContentChecker(self.fs, self.annotation_matcher, self.workers, self.max_content_bytes)
+            for job, result in zip(stale, checker.run(stale)):
+                results[job[0]] = result
+            self._content = {relative_path: results[relative_path] for relative_path, _ in targets}
+            self.cache_stats = {'hits': len(targets) - len(stale), 'misses': len(stale)}
+
+            if key is not None and (stale or len(cached) != len(targets)):
+                updated = {}
+                for relative_path, result in self._content.items():
+                    entry = entries[relative_path]
+                    check = {name: value for name, value in result.check.items() if name != 'file'}
+                    updated[relative_path] = (entry.inode, entry.size, entry.mtime_ns,
+                                              check, tuple(sorted(result.annotations)))
+                self.cache.save(key, updated, snapshot.scanned_ns)
+        return self._content
+
+    def _content_checks(self, pattern: str) -> Dict:
+        """名稱符合 pattern 的文件的模板檢查結果"""
+        results = self._content_results()
+        return {'checks': [dict(results[path].check) for path in self.snapshot.files_matching(pattern)]}
+
+    def calculate_metrics(self, names: Optional[Iterable[str]] = None) -> Dict:
+        """計算選取的指標（None 為全部），只準備這些指標宣告的輸入"""
+        selected = tuple(METRICS) if names is None else select_metrics(names)
+        for source in dict.fromkeys(source for name in selected for source in METRICS[name].inputs):
+            getattr(self, source)
+        return {name: getattr(self, METRICS[name].method)() for name in selected}
 
     def calculate_all_metrics(self) -> Dict:
         """計算所有驗證指標"""
-        return {
-            'structure_coverage': self.calculate_structure_coverage(),
-            'file_coverage': self.calculate_file_coverage(),
-            'directory_coverage': self.calculate_directory_coverage(),
-            'template_accuracy': self.calculate_template_accuracy(),
-            'hierarchy_accuracy': self.calculate_hierarchy_accuracy(),
-            'annotation_preservation': self.calculate_annotation_preservation(),
-            'module_independence': self.calculate_module_independence(),
-            'overall_score': 0.0
-        }
+        return {**self.calculate_metrics(), 'overall_score': 0.0}
 
+    def compute(self, metrics: Optional[Iterable[str]] = None) -> MetricsResult:
+        """計算驗證指標（預設全部，含總體分數），返回唯讀結果"""
+        if metrics is None:
+            return MetricsResult(self.calculate_all_metrics())
+        return MetricsResult(self.calculate_metrics(metrics))
+
+    @metric('structure_coverage', INPUT_EXPECTED, INPUT_SNAPSHOT)
     def calculate_structure_coverage(self) -> Dict:
         """計算結構覆蓋率"""
         expected = self._count_expected_items()
@@ -46,44 +296,49 @@ class VerificationMetrics:
 
         return coverage
 
+    @metric('file_coverage', INPUT_EXPECTED, INPUT_SNAPSHOT)
     def calculate_file_coverage(self) -> Dict:
         """計算文件覆蓋率"""
-        expected_files = self._get_expected_files()
-        actual_files = self._get_actual_files()
+        expected_files = self.expected_index.relative_file_set
+        expected_count = len(self.expected_index.relative_files)
+        actual_files = self.snapshot.file_set
 
-        matched = set(actual_files) & set(expected_files)
-        missing = set(expected_files) - set(actual_files)
-        extra = set(actual_files) - set(expected_files)
+        matched = actual_files & expected_files
+        missing = expected_files - actual_files
+        extra = actual_files - expected_files
 
         return {
-            'expected_count': len(expected_files),
+            'expected_count': expected_count,
             'actual_count': len(actual_files),
             'matched_count': len(matched),
             'missing_files': list(missing),
             'extra_files': list(extra),
-            'coverage_rate': len(matched) / len(expected_files) if expected_files else 0.0,
+            'coverage_rate': len(matched) / expected_count if expected_count else 0.0,
             'accuracy_rate': len(matched) / len(actual_files) if actual_files else 0.0
         }
 
+    @metric('directory_coverage', INPUT_EXPECTED, INPUT_SNAPSHOT)
     def calculate_directory_coverage(self) -> Dict:
         """計算目錄覆蓋率"""
-        expected_dirs = self._get_expected_directories()
-        actual_dirs = self._get_actual_directories()
+        expected_dirs = self.expected_index.relative_directory_set
+        expected_count = len(self.expected_index.relative_directories)
+        actual_dirs = self.snapshot.directory_set
 
-        matched = set(actual_dirs) & set(expected_dirs)
-        missing = set(expected_dirs) - set(actual_dirs)
-        extra = set(actual_dirs) - set(expected_dirs)
+        matched = actual_dirs & expected_dirs
+        missing = expected_dirs - actual_dirs
+        extra = actual_dirs - expected_dirs
 
         return {
-            'expected_count': len(expected_dirs),
+            'expected_count': expected_count,
             'actual_count': len(actual_dirs),
             'matched_count': len(matched),
             'missing_directories': list(missing),
             'extra_directories': list(extra),
-            'coverage_rate': len(matched) / len(expected_dirs) if expected_dirs else 0.0,
+            'coverage_rate': len(matched) / expected_count if expected_count else 0.0,
             'accuracy_rate': len(matched) / len(actual_dirs) if actual_dirs else 0.0
         }
 
+    @metric('template_accuracy', INPUT_SNAPSHOT, INPUT_CONTENTS)
     def calculate_template_accuracy(self) -> Dict:
         """計算模板準確性"""
         template_files = {
@@ -103,6 +358,7 @@ class VerificationMetrics:
             'accuracy_rate': passed_checks / total_checks if total_checks > 0 else 0.0
         }
 
+    @metric('hierarchy_accuracy', INPUT_SNAPSHOT)
     def calculate_hierarchy_accuracy(self) -> Dict:
         """計算層級準確性"""
         # 驗證三層級結構
@@ -117,35 +373,38 @@ class VerificationMetrics:
             'overall_accuracy': (project_level['accuracy'] + module_level['accuracy'] + feature_level['accuracy']) / 3
         }
 
+    @metric('annotation_preservation', INPUT_EXPECTED, INPUT_SNAPSHOT, INPUT_CONTENTS)
     def calculate_annotation_preservation(self) -> Dict:
         """計算註解保留率"""
         expected_annotations = self._get_expected_annotations()
         preserved_annotations = self._check_annotation_preservation()
+        preserved_set = set(preserved_annotations)
 
         return {
             'expected_count': len(expected_annotations),
             'preserved_count': len(preserved_annotations),
             'preservation_rate': len(preserved_annotations) / len(expected_annotations) if expected_annotations else 0.0,
-            'missing_annotations': [a for a in expected_annotations if a not in preserved_annotations]
+            'missing_annotations': [a for a in expected_annotations if a not in preserved_set]
         }
 
+    @metric('module_independence', INPUT_SNAPSHOT)
     def calculate_module_independence(self) -> Dict:
         """計算模組獨立性"""
         modules = ['core', 'backend', 'jobs', 'cli', 'frontend']
         independence_checks = {}
 
+        exists = self.snapshot.exists
         for module in modules:
-            module_path = self.generated_path / 'system' / 'project1' / module
             checks = {
-                'has_readme': (module_path / 'README.md').exists(),
+                'has_readme': exists(f"{module}/README.md"),
                 'has_config': False,
-                'has_src': (module_path / 'src').exists() if module != 'frontend' else (module_path / 'src').exists()
+                'has_src': exists(f"{module}/src")
             }
 
             if module != 'frontend':
-                checks['has_config'] = (module_path / 'pyproject.toml').exists()
+                checks['has_config'] = exists(f"{module}/pyproject.toml")
             else:
-                checks['has_config'] = (module_path / 'package.json').exists()
+                checks['has_config'] = exists(f"{module}/package.json")
 
             independence_checks[module] = checks
 
@@ -161,245 +420,66 @@ class VerificationMetrics:
 
     def _count_expected_items(self) -> Dict[str, int]:
         """計算預期項目數量"""
-        def count_items(node: Dict, counts: Dict[str, int] = None):
-            if counts is None:
-                counts = {'directories': 0, 'files': 0}
-
-            for name, info in node.items():
-                if isinstance(info, dict):
-                    if info.get('type') == 'directory':
-                        counts['directories'] += 1
-                        if 'children' in info and info['children']:
-                            count_items(info['children'], counts)
-                    elif info.get('type') == 'file':
-                        counts['files'] += 1
-
-            return counts
-
-        return count_items(self.expected_structure)
+        return dict(self.expected_index.counts)
 
     def _count_actual_items(self) -> Dict[str, int]:
         """計算實際項目數量"""
-        project_path = self.generated_path / 'system' / 'project1'
-        if not project_path.exists():
-            return {'directories': 0, 'files': 0}
-
-        directories = sum(1 for _ in project_path.rglob('*') if _.is_dir())
-        files = sum(1 for _ in project_path.rglob('*') if _.is_file())
-
-        return {'directories': directories, 'files': files}
+        snapshot = self.snapshot
+        return {'directories': len(snapshot.directories), 'files': len(snapshot.files)}
 
     def _get_expected_files(self) -> List[str]:
         """獲取預期文件列表"""
-        files = []
-
-        def traverse(node: Dict, parent_path: str = ""):
-            for name, info in node.items():
-                if isinstance(info, dict):
-                    # 跳過 system 和 project1 根目錄，從 project1 內部開始
-                    if name in ['system', 'project1']:
-                        if 'children' in info and info['children']:
-                            traverse(info['children'], "")
-                        continue
-
-                    current_path = f"{parent_path}/{name}" if parent_path else name
-                    if info.get('type') == 'file':
-                        files.append(current_path)
-                    elif 'children' in info and info['children']:
-                        traverse(info['children'], current_path)
-
-        traverse(self.expected_structure)
-        return files
+        return list(self.expected_index.relative_files)
 
     def _get_actual_files(self) -> List[str]:
         """獲取實際文件列表"""
-        project_path = self.generated_path / 'system' / 'project1'
-        if not project_path.exists():
-            return []
-
-        files = []
-        for file_path in project_path.rglob('*'):
-            if file_path.is_file():
-                relative_path = file_path.relative_to(project_path)
-                # 標準化路徑格式
-                file_str = str(relative_path).replace('\\', '/')
-                files.append(file_str)
-
-        return files
+        return list(self.snapshot.files)
 
     def _get_expected_directories(self) -> List[str]:
         """獲取預期目錄列表"""
-        directories = []
-
-        def traverse(node: Dict, parent_path: str = ""):
-            for name, info in node.items():
-                if isinstance(info, dict):
-                    # 跳過 system 和 project1 根目錄，從 project1 內部開始
-                    if name in ['system', 'project1']:
-                        if 'children' in info and info['children']:
-                            traverse(info['children'], "")
-                        continue
-
-                    current_path = f"{parent_path}/{name}" if parent_path else name
-                    if info.get('type') == 'directory':
-                        directories.append(current_path)
-                        if 'children' in info and info['children']:
-                            traverse(info['children'], current_path)
-
-        traverse(self.expected_structure)
-        return directories
+        return list(self.expected_index.relative_directories)
 
     def _get_actual_directories(self) -> List[str]:
         """獲取實際目錄列表"""
-        project_path = self.generated_path / 'system' / 'project1'
-        if not project_path.exists():
-            return []
-
-        directories = []
-        for dir_path in project_path.rglob('*'):
-            if dir_path.is_dir():
-                relative_path = dir_path.relative_to(project_path)
-                directories.append(str(relative_path).replace('\\', '/'))
-
-        return directories
+        return list(self.snapshot.directories)
 
     def _get_expected_annotations(self) -> List[str]:
         """獲取預期註解列表"""
-        annotations = []
-
-        def traverse(node: Dict):
-            for name, info in node.items():
-                if isinstance(info, dict):
-                    if info.get('comment'):
-                        annotations.append(info['comment'])
-                    if 'children' in info and info['children']:
-                        traverse(info['children'])
-
-        traverse(self.expected_structure)
-        return annotations
+        return list(self.expected_index.annotations)
 
     def _check_annotation_preservation(self) -> List[str]:
-        """檢查註解保留情況"""
-        preserved = []
-        expected = self._get_expected_annotations()
-        project_path = self.generated_path / 'system' / 'project1'
-
-        # 檢查 README 文件中的註解
-        for readme_file in project_path.rglob('README.md'):
-            try:
-                content = readme_file.read_text(encoding='utf-8')
-                for annotation in expected:
-                    if annotation in content:
-                        preserved.append(annotation)
-            except:
-                pass
-
-        # 檢查 Python 文件中的註解
-        for py_file in project_path.rglob('*.py'):
-            try:
-                content = py_file.read_text(encoding='utf-8')
-                for annotation in expected:
-                    if annotation in content:
-                        preserved.append(annotation)
-            except:
-                pass
-
-        return list(set(preserved))
+        """檢查註解保留情況（README 文件與 Python 文件）"""
+        results = self._content_results()
+        preserved = set()
+        for pattern in ('README.md', '*.py'):
+            for path in self.snapshot.files_matching(pattern):
+                preserved |= results[path].annotations
+
+        return list(preserved)
 
     def _check_pyproject_toml(self) -> Dict:
         """檢查 pyproject.toml 文件"""
-        checks = []
-        project_path = self.generated_path / 'system' / 'project1'
-
-        for toml_file in project_path.rglob('pyproject.toml'):
-            try:
-                content = toml_file.read_text(encoding='utf-8')
-                checks.append({
-                    'file': str(toml_file.relative_to(project_path)),
-                    'passed': '[project]' in content and 'name =' in content,
-                    'has_build_system': '[build-system]' in content,
-                    'has_project_section': '[project]' in content
-                })
-            except:
-                checks.append({
-                    'file': str(toml_file.relative_to(project_path)),
-                    'passed': False
-                })
-
-        return {'checks': checks}
+        return self._content_checks('pyproject.toml')
 
     def _check_package_json(self) -> Dict:
         """檢查 package.json 文件"""
-        checks = []
-        project_path = self.generated_path / 'system' / 'project1'
-
-        for json_file in project_path.rglob('package.json'):
-            try:
-                content = json_file.read_text(encoding='utf-8')
-                checks.append({
-                    'file': str(json_file.relative_to(project_path)),
-                    'passed': '"name"' in content and '"version"' in content,
-                    'has_name': '"name"' in content,
-                    'has_version': '"version"' in content
-                })
-            except:
-                checks.append({
-                    'file': str(json_file.relative_to(project_path)),
-                    'passed': False
-                })
-
-        return {'checks': checks}
+        return self._content_checks('package.json')
 
     def _check_python_files(self) -> Dict:
         """檢查 Python 文件"""
-        checks = []
-        project_path = self.generated_path / 'system' / 'project1'
-
-        for py_file in project_path.rglob('*.py'):
-            try:
-                content = py_file.read_text(encoding='utf-8')
-                checks.append({
-                    'file': str(py_file.relative_to(project_path)),
-                    'passed': 'def main()' in content or '"""' in content,
-                    'has_docstring': '"""' in content,
-                    'has_main': 'def main()' in content
-                })
-            except:
-                checks.append({
-                    'file': str(py_file.relative_to(project_path)),
-                    'passed': False
-                })
-
-        return {'checks': checks}
+        return self._content_checks('*.py')
 
     def _check_readme_files(self) -> Dict:
         """檢查 README 文件"""
-        checks = []
-        project_path = self.generated_path / 'system' / 'project1'
-
-        for readme_file in project_path.rglob('README.md'):
-            try:
-                content = readme_file.read_text(encoding='utf-8')
-                checks.append({
-                    'file': str(readme_file.relative_to(project_path)),
-                    'passed': len(content.strip()) > 0,
-                    'has_content': len(content.strip()) > 0
-                })
-            except:
-                checks.append({
-                    'file': str(readme_file.relative_to(project_path)),
-                    'passed': False
-                })
-
-        return {'checks': checks}
+        return self._content_checks('README.md')
 
     def _verify_project_level(self) -> Dict:
         """驗證專案層級"""
-        project_path = self.generated_path / 'system' / 'project1'
+        exists = self.snapshot.exists
         checks = {
-            'has_project_root': (project_path).exists(),
-            'has_project_readme': (project_path / 'README.md').exists(),
-            'has_docs': (project_path / 'docs').exists()
+            'has_project_root': exists(),
+            'has_project_readme': exists('README.md'),
+            'has_docs': exists('docs')
         }
 
         passed = sum(1 for v in checks.values() if v)
@@ -413,15 +493,14 @@ class VerificationMetrics:
     def _verify_module_level(self) -> Dict:
         """驗證模組層級"""
         modules = ['core', 'backend', 'jobs', 'cli', 'frontend']
-        project_path = self.generated_path / 'system' / 'project1'
+        exists = self.snapshot.exists
 
         module_checks = {}
         for module in modules:
-            module_path = project_path / module
             module_checks[module] = {
-                'exists': module_path.exists(),
-                'has_readme': (module_path / 'README.md').exists(),
-                'has_config': (module_path / 'pyproject.toml').exists() if module != 'frontend' else (module_path / 'package.json').exists()
+                'exists': exists(module),
+                'has_readme': exists(f"{module}/README.md"),
+                'has_config': exists(f"{module}/pyproject.toml") if module != 'frontend' else exists(f"{module}/package.json")
             }
 
         total_checks = sum(len(checks) for checks in module_checks.values())
@@ -436,16 +515,16 @@ class VerificationMetrics:
 
     def _verify_feature_level(self) -> Dict:
         """驗證功能層級"""
-        project_path = self.generated_path / 'system' / 'project1'
+        exists = self.snapshot.exists
 
         feature_checks = {
-            'core_core': (project_path / 'core' / 'src' / 'core').exists(),
-            'core_domain': (project_path / 'core' / 'src' / 'domain').exists(),
-            'backend_api': (project_path / 'backend' / 'src' / 'api').exists(),
-            'backend_domain': (project_path / 'backend' / 'src' / 'domain').exists(),
-            'jobs_tasks': (project_path / 'jobs' / 'src' / 'tasks').exists(),
-            'cli_commands': (project_path / 'cli' / 'src' / 'commands').exists(),
-            'frontend_components': (project_path / 'frontend' / 'src' / 'components').exists()
+            'core_core': exists('core/src/core'),
+            'core_domain': exists('core/src/domain'),
+            'backend_api': exists('backend/src/api'),
+            'backend_domain': exists('backend/src/domain'),
+            'jobs_tasks': exists('jobs/src/tasks'),
+            'cli_commands': exists('cli/src/commands'),
+            'frontend_components': exists('frontend/src/components')
         }
 
         passed = sum(1 for v in feature_checks.values() if v)
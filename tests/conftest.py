@@ -43,3 +43,10 @@ def temp_generated_project(tmp_path):
     (project_dir / "README.md").write_text("# README\n", encoding='utf-8')
 
     return project_dir
+
+
+@pytest.fixture(autouse=True)
+def isolated_parse_cache(tmp_path, monkeypatch):
+    """將解析快取與驗證快取導向臨時目錄，避免寫入使用者快取"""
+    monkeypatch.setenv("PROJECT_STRUCTURE_CACHE_DIR", str(tmp_path / "parse_cache"))
+    monkeypatch.setenv("PROJECT_STRUCTURE_VERIFY_CACHE_DIR", str(tmp_path / "verify_cache"))
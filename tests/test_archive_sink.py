@@ -0,0 +1,121 @@
+"""
+壓縮檔輸出測試
+"""
+import unittest
+import sys
+import io
+import tarfile
+import tempfile
+import shutil
+import zipfile
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+# 添加 src 目錄到路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from archive_sink import write_archive
+from project_generator import ProjectGenerator
+from structure_parser import StructureParser
+
+EXAMPLES_DIR = Path(__file__).parent.parent / "examples"
+
+
+class UnseekableStream(io.RawIOBase):
+    """只能循序寫入的串流（模擬 stdout / 管線）"""
+
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.buffer.extend(data)
+        return len(data)
+
+
+class TestArchiveSink(unittest.TestCase):
+    """壓縮檔輸出測試"""
+
+    def setUp(self):
+        """設置測試環境"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.structure = StructureParser(
+            str(EXAMPLES_DIR / "python_project_structure_example.md")).parse()
+        self.generator = ProjectGenerator(str(self.temp_dir / "out"))
+
+        with patch('sys.stdout', new=StringIO()):
+            self.generator.generate(self.structure)
+        root = self.temp_dir / "out"
+        self.expected = {
+            str(path.relative_to(root)).replace('\\', '/'):
+                None if path.is_dir() else path.read_bytes()
+            for path in root.rglob('*') if path.name != '.generation_manifest.json'
+        }
+
+    def tearDown(self):
+        """清理測試環境"""
+        shutil.rmtree(self.temp_dir)
+
+    def _write(self, target, fmt):
+        with patch('sys.stdout', new=StringIO()):
+            return self.generator.write_archive(self.structure, target, fmt)
+
+    def test_tar_formats_match_directory_output(self):
+        """測試 tar / tar.gz 內容與目錄輸出相同"""
+        for fmt in ('tar', 'tar.gz'):
+            archive_path = self.temp_dir / f"out.{fmt}"
+            self._write(str(archive_path), fmt)
+            with tarfile.open(archive_path) as tar:
+                actual = {
+                    member.name: None if member.isdir() else tar.extractfile(member).read()
+                    for member in tar.getmembers()
+                }
+            self.assertEqual(actual, self.expected, fmt)
+
+    def test_zip_matches_directory_output(self):
+        """測試 zip 內容與目錄輸出相同，且包含目錄項目"""
+        archive_path = self.temp_dir / "out.zip"
+        counts = self._write(str(archive_path), 'zip')
+        with zipfile.ZipFile(archive_path) as archive:
+            actual = {
+                info.filename.rstrip('/'): None if info.is_dir() else archive.read(info)
+                for info in archive.infolist()
+            }
+        self.assertEqual(actual, self.expected)
+        self.assertEqual(counts['directories'], sum(1 for v in self.expected.values() if v is None))
+
+    def test_unseekable_stream(self):
+        """測試寫入不可 seek 的串流"""
+        for fmt in ('tar.gz', 'zip'):
+            stream = UnseekableStream()
+            self._write(stream, fmt)
+            data = io.BytesIO(bytes(stream.buffer))
+            if fmt == 'zip':
+                with zipfile.ZipFile(data) as archive:
+                    self.assertIsNone(archive.testzip())
+                    names = set(archive.namelist())
+            else:
+                with tarfile.open(fileobj=data, mode='r:gz') as tar:
+                    names = set(tar.getnames())
+            self.assertIn('README.md', {name.rsplit('/', 1)[-1] for name in names})
+
+    def test_from_plan(self):
+        """測試由已儲存的計畫輸出壓縮檔"""
+        archive_path = self.temp_dir / "plan.zip"
+        with patch('sys.stdout', new=StringIO()):
+            self.generator.write_archive(None, str(archive_path), 'zip',
+                                         plan=self.generator.plan(self.structure))
+        with zipfile.ZipFile(archive_path) as archive:
+            self.assertEqual(len(archive.namelist()), len(self.expected))
+
+    def test_unknown_format(self):
+        """測試不支援的格式"""
+        with self.assertRaises(ValueError):
+            write_archive([], io.BytesIO(), 'rar')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+"""
+批次解析測試
+"""
+import unittest
+import sys
+import tempfile
+import shutil
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+# 添加 src 目錄到路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from batch_parser import parse_batch, find_structure_files, main as batch_main
+from structure_parser import StructureParser
+
+
+class TestBatchParser(unittest.TestCase):
+    """批次解析測試"""
+
+    def setUp(self):
+        """設置測試環境"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        for i in range(5):
+            (self.temp_dir / f"s{i}.md").write_text(f"""```
+project{i}/
+├─ src/
+│  └─ main.py
+{"".join(f"├─ f{j}.py{chr(10)}" for j in range(i))}└─ README.md
+```
+""", encoding='utf-8')
+        (self.temp_dir / "empty.md").write_text("# 沒有結構\n", encoding='utf-8')
+
+    def tearDown(self):
+        """清理測試環境"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_find_structure_files_sorted(self):
+        """測試目錄展開後排序且不重複"""
+        files = find_structure_files([str(self.temp_dir), str(self.temp_dir / "s0.md")])
+        self.assertEqual([f.name for f in files],
+                         ["empty.md", "s0.md", "s1.md", "s2.md", "s3.md", "s4.md"])
+
+    def test_results_match_single_parser_in_order(self):
+        """測試多程序結果與單獨解析相同且順序與輸入一致"""
+        paths = [self.temp_dir / f"s{i}.md" for i in (3, 0, 4, 1, 2)]
+        results = parse_batch(paths, workers=2, use_cache=False)
+
+        self.assertEqual([r.path for r in results], [str(p) for p in paths])
+        for path, result in zip(paths, results):
+            self.assertTrue(result.ok)
+            self.assertEqual(result.structure, StructureParser(str(path)).parse())
+        self.assertEqual([r.files for r in results], [5, 2, 6, 3, 4])
+
+    def test_errors_do_not_abort_batch(self):
+        """測試單一文件失敗不影響其他文件"""
+        paths = [self.temp_dir / "s1.md", self.temp_dir / "missing.md", self.temp_dir / "empty.md"]
+        results = parse_batch(paths, workers=1, use_cache=False, include_structure=False)
+
+        self.assertTrue(results[0].ok)
+        self.assertIsNone(results[0].structure)
+        self.assertIn("FileNotFoundError", results[1].error)
+        self.assertEqual(results[2].error, "無法解析結構")
+
+    def test_cli_reports_and_exit_code(self):
+        """測試命令列輸出與結束碼"""
+        with patch('sys.stdout', new=StringIO()) as out:
+            code = batch_main([str(self.temp_dir), '--workers', '1', '--no-parse-cache'])
+        self.assertEqual(code, 1)
+        self.assertIn("[OK]", out.getvalue())
+        self.assertIn("[X]", out.getvalue())
+        self.assertIn("失敗 1", out.getvalue())
+
+    def test_main_dispatches_parse_batch(self):
+        """測試 generate-project parse-batch 子命令"""
+        import main as main_module
+        argv = ['generate-project', 'parse-batch', str(self.temp_dir / "s0.md"), '--json']
+        with patch.object(sys, 'argv', argv), patch('sys.stdout', new=StringIO()) as out:
+            with self.assertRaises(SystemExit) as cm:
+                main_module.main()
+        self.assertEqual(cm.exception.code, 0)
+        self.assertIn('"ok": true', out.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+"""
+測試緊湊結構樹
+"""
+import unittest
+import sys
+import tempfile
+import shutil
+from pathlib import Path
+
+# 添加 src 目錄到路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from compact_tree import CompactTree, NO_PARENT
+from structure_parser import StructureParser
+
+
+class TestCompactTree(unittest.TestCase):
+    """測試緊湊結構樹"""
+
+    def setUp(self):
+        """設置測試環境"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.structure_file = self.temp_dir / "structure.md"
+        self.structure_file.write_text("""```
+project/
+├─ core/
+│  ├─ __init__.py
+│  └─ models.py ← 資料模型
+├─ api/
+│  └─ __init__.py
+└─ README.md ← 說明文件
+```""", encoding='utf-8')
+
+    def tearDown(self):
+        """清理測試環境"""
+        if self.temp_dir.exists():
+            shutil.rmtree(self.temp_dir)
+
+    def test_from_file_matches_parser_lists(self):
+        """測試文件與目錄列表與 StructureParser 相同"""
+        parser = StructureParser(str(self.structure_file))
+        parser.parse()
+        tree = CompactTree.from_file(str(self.structure_file))
+
+        self.assertEqual(tree.get_file_list(), parser.get_file_list())
+        self.assertEqual(tree.get_directory_list(), parser.get_directory_list())
+
+    def test_to_dict_matches_legacy_structure(self):
+        """測試轉換回舊版巢狀字典"""
+        structure = StructureParser(str(self.structure_file)).parse()
+        tree = CompactTree.from_file(str(self.structure_file))
+
+        self.assertEqual(tree.to_dict(), structure)
+        self.assertEqual(CompactTree.from_structure(structure).to_dict(), structure)
+
+    def test_strings_are_interned(self):
+        """測試重複名稱只儲存一次"""
+        tree = CompactTree.from_file(str(self.structure_file))
+
+        self.assertEqual(len(tree), 7)
+        self.assertEqual(tree.strings.count('__init__.py'), 1)
+
+    def test_node_accessors(self):
+        """測試節點存取"""
+        tree = CompactTree.from_file(str(self.structure_file))
+        paths = dict((path, index) for index, path in tree.iter_paths())
+
+        models = paths['project/core/models.py']
+        self.assertEqual(tree.name(models), 'models.py')
+        self.assertEqual(tree.comment(models), '資料模型')
+        self.assertFalse(tree.is_dir(models))
+        self.assertTrue(tree.is_dir(paths['project/core']))
+        self.assertEqual(tree.parents[paths['project']], NO_PARENT)
+        self.assertIsNone(tree.comment(paths['project']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+文件內容檢查引擎測試
+"""
+import unittest
+import sys
+import tempfile
+import shutil
+from pathlib import Path
+
+# 添加 src 目錄到路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from content_checks import ContentChecker, ContentRule
+from filesystem import DiskFileSystem, MemoryFileSystem
+from multi_pattern import AhoCorasick
+
+RULE = ContentRule(('[project]', 'name ='), lambda found, has_content: {
+    'passed': found['[project]'] and found['name ='], 'has_content': has_content})
+
+
+class CountingFileSystem(DiskFileSystem):
+    """記錄讀取了幾段內容"""
+
+    def __init__(self):
+        self.chunks = 0
+
+    def read_chunks(self, path, chunk_size=4096, max_bytes=None):
+        for chunk in super().read_chunks(path, chunk_size, max_bytes):
+            self.chunks += 1
+            yield chunk
+
+
+class TestContentChecker(unittest.TestCase):
+    """文件內容檢查引擎測試"""
+
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _write(self, name, data: bytes) -> str:
+        path = self.temp_dir / name
+        path.write_bytes(data)
+        return str(path)
+
+    def test_stops_after_markers(self):
+        """測試標記都找到後不再讀取（之後的無效 UTF-8 不影響結果）"""
+        path = self._write("pyproject.toml", b'[project]\nname = "x"\n' + b'\n' * 100 + b'\xff' * 100)
+        fs = CountingFileSystem()
+        result = ContentChecker(fs, chunk_size=12).check("pyproject.toml", path, RULE)
+        self.assertEqual(result.check, {'file': "pyproject.toml", 'passed': True, 'has_content': True})
+        self.assertEqual(fs.chunks, 2)
+
+    def test_marker_across_chunks(self):
+        """測試跨段的標記與多位元組字元"""
+        path = self._write("pyproject.toml", "中文[proj".encode('utf-8') + b'ect]\nname = 1\n')
+        for chunk_size in (1, 2, 3, 7):
+            result = ContentChecker(DiskFileSystem(), chunk_size=chunk_size).check("p", path, RULE)
+            self.assertTrue(result.check['passed'], chunk_size)
+
+    def test_max_bytes(self):
+        """測試超過上限的標記視為不存在"""
+        path = self._write("pyproject.toml", b' ' * 100 + b'[project]\nname = 1\n')
+        self.assertFalse(ContentChecker(DiskFileSystem(), max_bytes=64).check("p", path, RULE).check['passed'])
+        self.assertTrue(ContentChecker(DiskFileSystem(), max_bytes=None).check("p", path, RULE).check['passed'])
+
+    def test_unreadable(self):
+        """測試無法讀取的文件"""
+        result = ContentChecker(DiskFileSystem()).check("x", str(self.temp_dir / "missing"), RULE)
+        self.assertEqual(result.check, {'file': "x", 'passed': False})
+        path = self._write("bad.toml", b'\xff\xfe')
+        self.assertFalse(ContentChecker(DiskFileSystem()).check("bad", path, RULE).check['passed'])
+
+    def test_annotations_and_workers(self):
+        """測試註解比對，並行與依序的結果相同"""
+        fs = MemoryFileSystem()
+        fs.mkdir("out")
+        rule = ContentRule((), lambda _, has_content: {'passed': has_content}, annotations=True)
+        jobs = []
+        for i in range(50):
+            fs.write(f"out/{i}.md", f"# {i}\n\n註解 {i % 5}\n" if i % 7 else "   \n")
+            jobs.append((f"{i}.md", f"out/{i}.md", rule))
+        matcher = AhoCorasick([f"註解 {i}" for i in range(5)])
+
+        sequential = ContentChecker(fs, matcher, workers=1).run(jobs)
+        self.assertEqual(sequential, ContentChecker(fs, matcher, workers=4).run(jobs))
+        self.assertEqual(sequential[1].annotations, frozenset({"註解 1"}))
+        self.assertEqual(sequential[0], ({'file': "0.md", 'passed': False}, frozenset()))
+
+
+if __name__ == '__main__':
+    unittest.main()
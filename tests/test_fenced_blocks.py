@@ -0,0 +1,119 @@
+"""
+測試圍欄區塊索引與多區塊解析
+"""
+import unittest
+import sys
+import tempfile
+import shutil
+from pathlib import Path
+
+# 添加 src 目錄到路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from fenced_blocks import scan_fenced_blocks, select_block, parse_block_selector
+from structure_parser import StructureParser
+
+
+DESIGN_DOC = """# 系統設計
+
+說明文字，包含路徑 docs/overview.md
+
+## Backend
+
+```text
+backend/
+├─ src/
+│  └─ app.py ← 進入點
+└─ pyproject.toml
+```
+
+## Frontend 服務
+
+```
+frontend/
+├─ src/
+│  └─ main.tsx
+└─ package.json
+```
+
+## 執行
+
+```bash
+python -m src.main --readme docs/design.md
+```
+"""
+
+
+class TestFencedBlocks(unittest.TestCase):
+    """測試圍欄區塊索引與多區塊解析"""
+
+    def setUp(self):
+        """設置測試環境"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.doc = self.temp_dir / "design.md"
+        self.doc.write_text(DESIGN_DOC, encoding='utf-8')
+
+    def tearDown(self):
+        """清理測試環境"""
+        if self.temp_dir.exists():
+            shutil.rmtree(self.temp_dir)
+
+    def test_scan_records_offsets_and_headings(self):
+        """測試掃描記錄位元組偏移與標題"""
+        blocks = scan_fenced_blocks(self.doc)
+
+        self.assertEqual([b.heading for b in blocks], ['Backend', 'Frontend 服務', '執行'])
+        self.assertEqual([b.info for b in blocks], ['text', '', 'bash'])
+        content = self.doc.read_bytes()[blocks[0].start:blocks[0].end].decode('utf-8')
+        self.assertTrue(content.startswith('backend/'))
+        self.assertNotIn('```', content)
+
+    def test_unterminated_block_extends_to_end(self):
+        """測試未關閉的區塊延伸到文件結尾"""
+        self.doc.write_text("```\nproject/\n└─ a.py\n", encoding='utf-8')
+        blocks = scan_fenced_blocks(self.doc)
+
+        self.assertEqual(len(blocks), 1)
+        self.assertEqual(blocks[0].end, len(self.doc.read_bytes()))
+        self.assertEqual(blocks[0].name, 'block-0')
+
+    def test_select_block(self):
+        """測試依索引與標題選取區塊"""
+        blocks = scan_fenced_blocks(self.doc)
+
+        self.assertEqual(select_block(blocks, 1).heading, 'Frontend 服務')
+        self.assertEqual(select_block(blocks, 'Backend').index, 0)
+        self.assertEqual(select_block(blocks, 'frontend').index, 1)
+        with self.assertRaises(ValueError):
+            select_block(blocks, 'Jobs')
+        with self.assertRaises(ValueError):
+            select_block(blocks, 5)
+
+    def test_parse_block_selector(self):
+        """測試命令列區塊選擇器轉換"""
+        self.assertEqual(parse_block_selector("2"), 2)
+        self.assertEqual(parse_block_selector("Backend"), "Backend")
+
+    def test_parser_with_block(self):
+        """測試解析指定區塊"""
+        structure = StructureParser(str(self.doc), block="Frontend").parse()
+
+        self.assertEqual(list(structure), ['frontend'])
+        self.assertIn('main.tsx', structure['frontend']['children']['src']['children'])
+
+    def test_parser_without_block_uses_first_tree(self):
+        """測試未指定區塊時維持原本行為"""
+        structure = StructureParser(str(self.doc)).parse()
+        self.assertNotIn('frontend', structure)
+
+    def test_parse_blocks(self):
+        """測試解析所有樹狀區塊為具名結構"""
+        results = StructureParser(str(self.doc)).parse_blocks()
+
+        self.assertEqual(list(results), ['Backend', 'Frontend 服務'])
+        app = results['Backend']['backend']['children']['src']['children']['app.py']
+        self.assertEqual(app['comment'], '進入點')
+
+
+if __name__ == '__main__':
+    unittest.main()
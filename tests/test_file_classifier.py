@@ -0,0 +1,79 @@
+"""
+文件 / 目錄分類規則測試
+"""
+import unittest
+import sys
+from pathlib import Path
+
+# 添加 src 目錄到路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from file_classifier import FileClassifier, LanguagePack, default_classifier
+from structure_parser import StructureParser
+
+EXAMPLES_DIR = Path(__file__).parent.parent / "examples"
+
+
+class TestFileClassifier(unittest.TestCase):
+    """文件 / 目錄分類規則測試"""
+
+    def setUp(self):
+        """設置測試環境"""
+        self.classifier = default_classifier()
+
+    def test_language_pack_suffixes(self):
+        """測試各語言包的副檔名"""
+        for name in ("main.py", "main.rs", "core.c", "core.h", "app.cpp", "app.hpp",
+                     "App.tsx", "index.html", "global.css", "Cargo.toml", "Cargo.lock",
+                     "CMakeLists.txt", "README.MD"):
+            self.assertFalse(self.classifier.is_directory(name), name)
+
+    def test_exact_filenames(self):
+        """測試沒有副檔名的文件名"""
+        for name in ("Makefile", ".gitignore", "Dockerfile", "LICENSE"):
+            self.assertFalse(self.classifier.is_directory(name), name)
+
+    def test_directories(self):
+        """測試目錄名稱"""
+        for name in ("src", "tests", ".github", "v1.0", "config.d"):
+            self.assertTrue(self.classifier.is_directory(name), name)
+
+    def test_trailing_slash_takes_precedence(self):
+        """測試名稱以 / 結尾時一律視為目錄"""
+        self.assertTrue(self.classifier.is_directory("static.css", trailing_slash=True))
+
+    def test_custom_registration(self):
+        """測試自訂規則與語言包"""
+        classifier = FileClassifier(packs=['python'])
+        self.assertTrue(classifier.is_directory("main.go"))
+        fingerprint = classifier.fingerprint()
+
+        classifier.register_suffixes(".go")
+        classifier.register_filenames("Justfile")
+        classifier.register_pack(LanguagePack(frozenset({'proto'}), frozenset()))
+        self.assertFalse(classifier.is_directory("main.go"))
+        self.assertFalse(classifier.is_directory("justfile"))
+        self.assertFalse(classifier.is_directory("api.proto"))
+        self.assertNotEqual(classifier.fingerprint(), fingerprint)
+
+        with self.assertRaises(ValueError):
+            classifier.register_pack("cobol")
+
+    def test_examples_have_no_misclassified_files(self):
+        """測試範例結構中的文件都被分類為文件"""
+        for example in ("rust", "cpp", "c"):
+            parser = StructureParser(str(EXAMPLES_DIR / f"{example}_project_structure_example.md"))
+            parser.parse()
+            names = {name for _, name in parser.get_file_list()}
+            directories = {path.rsplit('/', 1)[-1] for path in parser.get_directory_list()}
+            self.assertTrue({"README.md", ".gitignore"} <= names, example)
+            self.assertFalse({n for n in directories if '.' in n.lstrip('.')}, example)
+
+    def test_parser_uses_custom_classifier(self):
+        """測試解析器使用指定的分類規則"""
+        parser = StructureParser(classifier=FileClassifier(packs=[]))
+        self.assertTrue(parser._is_directory("main.py"))
+
+
+if __name__ == '__main__':
+    unittest.main()
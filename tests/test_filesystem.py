@@ -0,0 +1,224 @@
+"""
+檔案系統介面測試
+"""
+import unittest
+import sys
+import tempfile
+import shutil
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+# 添加 src 目錄到路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from filesystem import DiskFileSystem, DirFdFileSystem, MemoryFileSystem, DIR_FD_SUPPORTED
+from generation_manifest import GenerationManifest
+from project_generator import ProjectGenerator
+from verification_metrics import VerificationMetrics
+
+
+STRUCTURE_CONTENT = """```
+system/
+└─ project1/
+   ├─ core/                ← 核心模組
+   │  ├─ pyproject.toml
+   │  └─ src/
+   │     └─ main.py        ← 主程式
+   └─ README.md
+```"""
+
+
+class TestMemoryFileSystem(unittest.TestCase):
+    """記憶體檔案系統測試"""
+
+    def setUp(self):
+        self.fs = MemoryFileSystem()
+
+    def test_mkdir_and_write(self):
+        """測試建立目錄與寫入文件"""
+        self.fs.mkdir("out/a/b")
+        self.assertTrue(self.fs.is_dir("out/a"))
+        self.assertTrue(self.fs.write("out/a/b/x.py", "x"))
+        self.assertEqual(self.fs.read(Path("out") / "a" / "b" / "x.py"), "x")
+        self.assertTrue(self.fs.is_file("out/a/b/x.py"))
+        self.assertFalse(self.fs.exists("out/a/missing"))
+
+    def test_write_exclusive(self):
+        """測試不覆寫時保留既有內容"""
+        self.fs.mkdir("out")
+        self.fs.write("out/x", "old")
+        self.assertFalse(self.fs.write("out/x", "new"))
+        self.assertEqual(self.fs.read("out/x"), "old")
+        self.assertTrue(self.fs.write("out/x", "new", overwrite=True))
+        self.assertEqual(self.fs.read("out/x"), "new")
+
+    def test_errors(self):
+        """測試與磁碟相同的錯誤類型"""
+        with self.assertRaises(FileNotFoundError):
+            self.fs.write("missing/x", "x")
+        with self.assertRaises(FileNotFoundError):
+            self.fs.read("x")
+        with self.assertRaises(FileNotFoundError):
+            self.fs.mkdir("a/b", parents=False)
+        self.fs.mkdir("a")
+        self.fs.write("a/x", "x")
+        with self.assertRaises(OSError):
+            self.fs.rmdir("a")
+        self.fs.remove("a/x")
+        self.fs.rmdir("a")
+        self.assertFalse(self.fs.exists("a"))
+
+    def test_walk_matches_disk(self):
+        """測試走訪結果與磁碟一致"""
+        temp_dir = Path(tempfile.mkdtemp())
+        try:
+            for fs, root in ((DiskFileSystem(), temp_dir / "out"), (self.fs, Path("out"))):
+                fs.mkdir(root / "b" / "c")
+                fs.mkdir(root / "a")
+                fs.write(root / "z.md", "z")
+                fs.write(root / "b" / "y.py", "y")
+            disk = [(str(Path(d).relative_to(temp_dir)), dirs, files)
+                    for d, dirs, files in DiskFileSystem().walk(temp_dir / "out")]
+            self.assertEqual(list(self.fs.walk("out")), disk)
+            self.assertEqual(list(self.fs.walk("missing")), [])
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_scan_matches_disk(self):
+        """測試 scan 的名稱與大小和磁碟一致，並附上 mtime"""
+        temp_dir = Path(tempfile.mkdtemp())
+        try:
+            for fs, root in ((DiskFileSystem(), temp_dir / "out"), (self.fs, Path("out"))):
+                fs.mkdir(root / "b")
+                fs.write(root / "a.md", "中文")
+                fs.write(root / "b" / "y.py", "y")
+
+            def names(fs, root):
+                return [(str(Path(d).relative_to(root)), [e.name for e in dirs],
+                         [(e.name, e.size) for e in files]) for d, dirs, files in fs.scan(root)]
+
+            self.assertEqual(names(self.fs, "out"), names(DiskFileSystem(), temp_dir / "out"))
+            self.assertEqual(names(self.fs, "out")[0][2], [("a.md", 6)])
+            before = next(self.fs.scan("out/b"))[2][0].mtime_ns
+            self.fs.write("out/b/y.py", "z", overwrite=True)
+            self.assertGreater(next(self.fs.scan("out/b"))[2][0].mtime_ns, before)
+        finally:
+            shutil.rmtree(temp_dir)
+
+
+@unittest.skipUnless(DIR_FD_SUPPORTED, "需要 dir_fd 支援")
+class TestDirFdFileSystem(unittest.TestCase):
+    """目錄 fd 檔案系統測試"""
+
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.fs = DirFdFileSystem(max_open_dirs=2)
+
+    def tearDown(self):
+        self.fs.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_write_exclusive(self):
+        """測試 O_EXCL 建立與覆寫"""
+        self.fs.mkdir(self.temp_dir / "a" / "b")
+        target = self.temp_dir / "a" / "b" / "x.py"
+        self.assertTrue(self.fs.write(target, "舊"))
+        self.assertFalse(self.fs.write(target, "新"))
+        self.assertEqual(target.read_text(encoding='utf-8'), "舊")
+        self.assertTrue(self.fs.write(target, "新", overwrite=True))
+        self.assertEqual(target.read_text(encoding='utf-8'), "新")
+        self.assertTrue(self.fs.is_file(target))
+        self.assertTrue(self.fs.is_dir(target.parent))
+        self.assertFalse(self.fs.exists(target.parent / "missing" / "y"))
+        with self.assertRaises(FileNotFoundError):
+            self.fs.write(self.temp_dir / "missing" / "x", "x")
+
+    def test_mkdir(self):
+        """測試建立目錄的錯誤語意與磁碟相同"""
+        self.fs.mkdir(self.temp_dir / "a")
+        with self.assertRaises(FileExistsError):
+            self.fs.mkdir(self.temp_dir / "a", exist_ok=False)
+        with self.assertRaises(FileNotFoundError):
+            self.fs.mkdir(self.temp_dir / "x" / "y", parents=False)
+        self.fs.write(self.temp_dir / "f", "x")
+        with self.assertRaises(FileExistsError):
+            self.fs.mkdir(self.temp_dir / "f")
+
+    def test_fd_cache_bounded(self):
+        """測試目錄 fd 數量固定，刪除與 close 時釋放"""
+        for name in "abcd":
+            self.fs.mkdir(self.temp_dir / name)
+            self.fs.write(self.temp_dir / name / "x", name)
+        self.assertEqual(len(self.fs._cache()), 2)
+
+        self.fs.remove(self.temp_dir / "d" / "x")
+        self.fs.rmdir(self.temp_dir / "d")
+        self.fs.mkdir(self.temp_dir / "d")
+        self.assertTrue(self.fs.write(self.temp_dir / "d" / "x", "新"))
+        self.assertEqual((self.temp_dir / "d" / "x").read_text(encoding='utf-8'), "新")
+
+        self.fs.close()
+        self.assertEqual(len(self.fs._cache()), 0)
+
+    def test_generate_matches_disk(self):
+        """測試生成結果與依路徑寫入相同"""
+        structure_file = self.temp_dir / "structure.md"
+        structure_file.write_text(STRUCTURE_CONTENT, encoding='utf-8')
+        from structure_parser import StructureParser
+        structure = StructureParser(str(structure_file)).parse()
+
+        outputs = {}
+        for label, fs in (("path", None), ("dir_fd", DirFdFileSystem())):
+            output_dir = self.temp_dir / label
+            with patch('sys.stdout', new=StringIO()):
+                ProjectGenerator(str(output_dir), workers=2, fs=fs).generate(structure)
+            outputs[label] = {str(p.relative_to(output_dir)): None if p.is_dir() else p.read_bytes()
+                              for p in output_dir.rglob('*')}
+        self.assertEqual(outputs["path"], outputs["dir_fd"])
+
+
+class TestInMemoryGeneration(unittest.TestCase):
+    """記憶體中生成與驗證測試"""
+
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.structure_file = self.temp_dir / "structure.md"
+        self.structure_file.write_text(STRUCTURE_CONTENT, encoding='utf-8')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _generate(self, output_dir, fs=None):
+        from structure_parser import StructureParser
+        structure = StructureParser(str(self.structure_file)).parse()
+        with patch('sys.stdout', new=StringIO()):
+            ProjectGenerator(str(output_dir), fs=fs).generate(structure)
+
+    def test_generate_in_memory(self):
+        """測試生成不寫入磁碟，清單也存在記憶體中"""
+        fs = MemoryFileSystem()
+        output_dir = self.temp_dir / "output"
+        self._generate(output_dir, fs)
+
+        self.assertFalse(output_dir.exists())
+        self.assertIn('"""', fs.read(output_dir / "system/project1/core/src/main.py"))
+        manifest = GenerationManifest.load(output_dir, fs)
+        self.assertIn('system/project1/core/src/main.py', manifest.files)
+
+    def test_metrics_match_disk(self):
+        """測試記憶體與磁碟的驗證指標相同"""
+        fs = MemoryFileSystem()
+        memory_dir = self.temp_dir / "memory"
+        disk_dir = self.temp_dir / "disk"
+        self._generate(memory_dir, fs)
+        self._generate(disk_dir)
+
+        in_memory = VerificationMetrics(str(self.structure_file), str(memory_dir), fs=fs)
+        on_disk = VerificationMetrics(str(self.structure_file), str(disk_dir))
+        self.assertEqual(in_memory.calculate_all_metrics(), on_disk.calculate_all_metrics())
+        self.assertEqual(in_memory.calculate_file_coverage()['coverage_rate'], 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
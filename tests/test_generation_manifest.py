@@ -0,0 +1,116 @@
+"""
+生成清單與增量生成測試
+"""
+import unittest
+import sys
+import tempfile
+import shutil
+import json
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+# 添加 src 目錄到路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from generation_manifest import GenerationManifest, MANIFEST_NAME
+from project_generator import ProjectGenerator
+
+
+def make_structure(modules, comment="核心"):
+    """建立 project/<module>/main.py 的結構字典"""
+    children = {
+        module: {'name': module, 'type': 'directory', 'comment': comment if module == 'core' else None,
+                 'children': {'main.py': {'name': 'main.py', 'type': 'file', 'comment': None}}}
+        for module in modules
+    }
+    return {'project': {'name': 'project', 'type': 'directory', 'comment': None, 'children': children}}
+
+
+class TestGenerationManifest(unittest.TestCase):
+    """生成清單與增量生成測試"""
+
+    def setUp(self):
+        """設置測試環境"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.output_dir = self.temp_dir / "output"
+
+    def tearDown(self):
+        """清理測試環境"""
+        shutil.rmtree(self.temp_dir)
+
+    def _apply(self, structure, **kwargs):
+        generator = ProjectGenerator(str(self.output_dir))
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        with patch('sys.stdout', new=StringIO()):
+            return generator.apply_plan(generator.plan(structure), **kwargs)
+
+    def test_manifest_written(self):
+        """測試生成後寫入清單"""
+        self._apply(make_structure(['core']))
+        manifest = GenerationManifest.load(self.output_dir)
+
+        self.assertEqual(set(manifest.files), {
+            'project/README.md', 'project/core/README.md', 'project/core/main.py'
+        })
+        entry = manifest.files['project/core/main.py']
+        self.assertEqual(entry.template, '.py')
+        self.assertEqual(len(entry.params), 64)
+        self.assertEqual(manifest.directories, ['project', 'project/core'])
+        data = json.loads((self.output_dir / MANIFEST_NAME).read_text(encoding='utf-8'))
+        self.assertEqual(data['format'], 'generation-manifest')
+
+    def test_incremental_rewrites_only_changed(self):
+        """測試增量生成只重寫內容改變的文件"""
+        modules = [f"m{i}" for i in range(20)] + ['core']
+        self._apply(make_structure(modules))
+
+        stats = self._apply(make_structure(modules, comment="核心模組"), incremental=True)
+        self.assertEqual(stats['updated'], 1)
+        self.assertEqual(stats['created'], 0)
+        self.assertEqual(stats['unchanged'], len(modules) * 2)
+        readme = (self.output_dir / "project" / "core" / "README.md").read_text(encoding='utf-8')
+        self.assertIn("核心模組", readme)
+
+    def test_incremental_keeps_user_edits(self):
+        """測試使用者修改過的文件不被覆寫"""
+        self._apply(make_structure(['core']))
+        readme = self.output_dir / "project" / "core" / "README.md"
+        readme.write_text("自訂內容\n", encoding='utf-8')
+
+        stats = self._apply(make_structure(['core'], comment="新註解"), incremental=True)
+        self.assertEqual(stats['kept'], 1)
+        self.assertEqual(readme.read_text(encoding='utf-8'), "自訂內容\n")
+
+    def test_default_mode_does_not_overwrite(self):
+        """測試非增量模式仍只寫入不存在的文件"""
+        self._apply(make_structure(['core']))
+        stats = self._apply(make_structure(['core'], comment="新註解"))
+        self.assertEqual(stats['created'], 0)
+        readme = (self.output_dir / "project" / "core" / "README.md").read_text(encoding='utf-8')
+        self.assertIn("核心", readme)
+        self.assertNotIn("新註解", readme)
+
+    def test_prune_removes_dropped_entries(self):
+        """測試移除結構中已刪除的文件與空目錄"""
+        self._apply(make_structure(['core', 'old']))
+        (self.output_dir / "project" / "core" / "notes.txt").write_text("x", encoding='utf-8')
+
+        stats = self._apply(make_structure(['core']), incremental=True, prune=True)
+        self.assertEqual(stats['removed'], 2)
+        self.assertFalse((self.output_dir / "project" / "old").exists())
+        self.assertTrue((self.output_dir / "project" / "core" / "notes.txt").exists())
+        self.assertNotIn('project/old/main.py', GenerationManifest.load(self.output_dir).files)
+
+    def test_adopts_existing_output_without_manifest(self):
+        """測試沒有清單的既有輸出，內容相同的文件會被納入清單"""
+        self._apply(make_structure(['core']))
+        (self.output_dir / MANIFEST_NAME).unlink()
+
+        stats = self._apply(make_structure(['core']), incremental=True)
+        self.assertEqual(stats['unchanged'], 3)
+        self.assertEqual(len(GenerationManifest.load(self.output_dir).files), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+"""
+生成計畫測試
+"""
+import unittest
+import sys
+import tempfile
+import shutil
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+# 添加 src 目錄到路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from generation_plan import (
+    GenerationPlan, PlanOperation, OP_MKDIR, OP_WRITE, OP_SKIP, KIND_README, KIND_FILE,
+    SKIP_DUPLICATE, content_hash
+)
+from project_generator import ProjectGenerator
+
+
+STRUCTURE = {
+    'project': {'name': 'project', 'type': 'directory', 'comment': '專案', 'children': {
+        'README.md': {'name': 'README.md', 'type': 'file', 'comment': None},
+        'core': {'name': 'core', 'type': 'directory', 'comment': None, 'children': {
+            'a.py': {'name': 'a.py', 'type': 'file', 'comment': None},
+            'b.py': {'name': 'b.py', 'type': 'file', 'comment': None},
+            'pyproject.toml': {'name': 'pyproject.toml', 'type': 'file', 'comment': None},
+        }},
+    }},
+}
+
+
+class TestGenerationPlan(unittest.TestCase):
+    """生成計畫測試"""
+
+    def setUp(self):
+        """設置測試環境"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.output_dir = self.temp_dir / "output"
+        self.generator = ProjectGenerator(str(self.output_dir))
+
+    def tearDown(self):
+        """清理測試環境"""
+        shutil.rmtree(self.temp_dir)
+
+    def _generate(self, plan=None, structure=STRUCTURE):
+        with patch('sys.stdout', new=StringIO()):
+            self.generator.generate(structure, plan=plan)
+
+    def test_plan_operations_in_order(self):
+        """測試操作順序與重複 README.md 的略過"""
+        plan = self.generator.plan(STRUCTURE)
+        self.assertEqual([(op.op, op.path, op.kind) for op in plan], [
+            (OP_MKDIR, 'project', None),
+            (OP_WRITE, 'project/README.md', KIND_README),
+            (OP_SKIP, 'project/README.md', KIND_FILE),
+            (OP_MKDIR, 'project/core', None),
+            (OP_WRITE, 'project/core/README.md', KIND_README),
+            (OP_WRITE, 'project/core/a.py', KIND_FILE),
+            (OP_WRITE, 'project/core/b.py', KIND_FILE),
+            (OP_WRITE, 'project/core/pyproject.toml', KIND_FILE),
+        ])
+        self.assertEqual(plan.operations[2].reason, SKIP_DUPLICATE)
+        self.assertIn('name = "core"', plan.content(plan.operations[-1]))
+
+    def test_identical_content_stored_once(self):
+        """測試相同內容只存一份"""
+        plan = GenerationPlan()
+        for path in ('a/README.md', 'b/README.md'):
+            plan.add(PlanOperation(OP_WRITE, path, KIND_README, content_hash("# same\n")), "# same\n")
+        self.assertEqual(plan.operations[0].content_ref, plan.operations[1].content_ref)
+        self.assertEqual(len(plan.blobs), 1)
+
+    def test_jsonl_round_trip(self):
+        """測試 JSON Lines 存取"""
+        plan = self.generator.plan(STRUCTURE)
+        plan_file = self.temp_dir / "plan.jsonl"
+        plan.save_jsonl(plan_file)
+        loaded = GenerationPlan.load_jsonl(plan_file)
+
+        self.assertEqual(loaded.operations, plan.operations)
+        self.assertEqual(loaded.blobs, plan.blobs)
+        self.assertEqual(len(plan_file.read_text(encoding='utf-8').splitlines()),
+                         1 + len(plan.blobs) + len(plan))
+
+    def test_load_rejects_other_files(self):
+        """測試讀取非計畫文件時報錯"""
+        other = self.temp_dir / "other.jsonl"
+        other.write_text('{"op": "mkdir", "path": "x"}\n', encoding='utf-8')
+        with self.assertRaises(ValueError):
+            GenerationPlan.load_jsonl(other)
+
+    def test_generate_from_loaded_plan(self):
+        """測試重播計畫的結果與由結構生成相同"""
+        plan_file = self.temp_dir / "plan.jsonl"
+        self.generator.plan(STRUCTURE).save_jsonl(plan_file)
+        self._generate(plan=GenerationPlan.load_jsonl(plan_file), structure=None)
+
+        diff = self.generator.plan(STRUCTURE).diff(self.output_dir)
+        self.assertTrue(diff.ok)
+
+    def test_diff_reports_missing_and_changed(self):
+        """測試比對缺少與內容不同的文件"""
+        self._generate()
+        (self.output_dir / "project" / "core" / "a.py").write_text("changed\n", encoding='utf-8')
+        (self.output_dir / "project" / "core" / "b.py").unlink()
+
+        diff = self.generator.plan(STRUCTURE).diff(self.output_dir)
+        self.assertFalse(diff.ok)
+        self.assertEqual(diff.missing_directories, [])
+        self.assertEqual(diff.missing_files, ['project/core/b.py'])
+        self.assertEqual(diff.changed_files, ['project/core/a.py'])
+
+    def test_main_dry_run_and_verify(self):
+        """測試命令列乾跑、儲存計畫與驗證"""
+        from main import main
+        structure_file = self.temp_dir / "structure.md"
+        structure_file.write_text("```\nproject/\n├─ core/\n│  └─ a.py\n└─ README.md\n```\n",
+                                  encoding='utf-8')
+        plan_file = self.temp_dir / "plan.jsonl"
+        base_args = ['main.py', '--readme', str(structure_file), '--output', str(self.output_dir)]
+
+        with patch.object(sys, 'argv', base_args + ['--dry-run', '--save-plan', str(plan_file)]), \
+                patch('sys.stdout', new=StringIO()) as out:
+            main()
+        self.assertIn("[FILE] project/core/a.py", out.getvalue())
+        self.assertFalse(self.output_dir.exists())
+
+        with patch.object(sys, 'argv', base_args + ['--from-plan', str(plan_file), '--verify']), \
+                patch('sys.stdout', new=StringIO()):
+            with self.assertRaises(SystemExit) as cm:
+                main()
+        self.assertEqual(cm.exception.code, 1)
+
+        with patch.object(sys, 'argv', base_args + ['--from-plan', str(plan_file)]), \
+                patch('sys.stdout', new=StringIO()):
+            main()
+        with patch.object(sys, 'argv', base_args + ['--verify']), \
+                patch('sys.stdout', new=StringIO()) as out:
+            main()
+        self.assertIn("[OK] 輸出目錄與生成計畫一致", out.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
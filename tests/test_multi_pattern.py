@@ -0,0 +1,47 @@
+"""
+多字串比對測試
+"""
+import random
+import unittest
+import sys
+from pathlib import Path
+
+# 添加 src 目錄到路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from multi_pattern import AhoCorasick
+
+
+class TestAhoCorasick(unittest.TestCase):
+    """Aho-Corasick 自動機測試"""
+
+    def test_overlapping_patterns(self):
+        """測試重疊與互為子字串的模式都能找到"""
+        matcher = AhoCorasick(["he", "she", "his", "hers"])
+        self.assertEqual(matcher.matches("ushers"), {"he", "she", "hers"})
+        self.assertEqual(matcher.matches("xyz"), set())
+
+    def test_unicode(self):
+        """測試中文註解"""
+        matcher = AhoCorasick(["核心模組", "核心", "模組說明"])
+        self.assertEqual(matcher.matches('"""\n核心模組說明\n"""'), {"核心模組", "核心", "模組說明"})
+
+    def test_duplicates_and_empty(self):
+        """測試重複與空字串模式"""
+        matcher = AhoCorasick(["a", "", "a", "b"])
+        self.assertEqual(matcher.patterns, ("a", "b"))
+        self.assertEqual(matcher.search("ba"), {0, 1})
+        self.assertEqual(AhoCorasick([]).matches("anything"), set())
+
+    def test_matches_substring_check(self):
+        """測試結果與逐一 in 檢查相同"""
+        rng = random.Random(0)
+        for _ in range(500):
+            patterns = ["".join(rng.choice("ab中") for _ in range(rng.randint(1, 4)))
+                        for _ in range(rng.randint(1, 8))]
+            text = "".join(rng.choice("ab中") for _ in range(rng.randint(0, 30)))
+            self.assertEqual(AhoCorasick(patterns).matches(text), {p for p in patterns if p in text})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+"""
+測試結構解析快取
+"""
+import unittest
+import sys
+import os
+import tempfile
+import shutil
+from pathlib import Path
+from unittest.mock import patch
+
+# 添加 src 目錄到路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import parse_cache
+from parse_cache import ParseCache, default_parse_cache, set_parse_cache_enabled
+from structure_parser import StructureParser
+
+
+class TestParseCache(unittest.TestCase):
+    """測試結構解析快取"""
+
+    def setUp(self):
+        """設置測試環境"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.cache = ParseCache(str(self.temp_dir / "cache"))
+        self.structure_file = self.temp_dir / "structure.md"
+        self.structure_file.write_text("""```
+project/
+├─ src/
+│  └─ main.py ← 主程式
+└─ README.md
+```""", encoding='utf-8')
+
+    def tearDown(self):
+        """清理測試環境"""
+        set_parse_cache_enabled(True)
+        if self.temp_dir.exists():
+            shutil.rmtree(self.temp_dir)
+
+    def test_cached_parse_matches_fresh_parse(self):
+        """測試快取結果與直接解析相同"""
+        fresh = StructureParser(str(self.structure_file)).parse()
+        first = StructureParser(str(self.structure_file), cache=self.cache).parse()
+        second = StructureParser(str(self.structure_file), cache=self.cache).parse()
+
+        self.assertEqual(first, fresh)
+        self.assertEqual(second, fresh)
+        self.assertEqual(len(list((self.temp_dir / "cache").iterdir())), 1)
+
+    def test_cache_hit_skips_parsing(self):
+        """測試命中快取時不重新解析"""
+        StructureParser(str(self.structure_file), cache=self.cache).parse()
+
+        parser = StructureParser(str(self.structure_file), cache=self.cache)
+        parser.parse_iter = None  # 命中快取時不應被呼叫
+        structure = parser.parse()
+        self.assertIn('project', structure)
+
+    def test_content_change_invalidates(self):
+        """測試內容改變時重新解析"""
+        StructureParser(str(self.structure_file), cache=self.cache).parse()
+        self.structure_file.write_text("""```
+other/
+└─ main.py
+```""", encoding='utf-8')
+
+        structure = StructureParser(str(self.structure_file), cache=self.cache).parse()
+        self.assertIn('other', structure)
+
+    def test_key_depends_on_version(self):
+        """測試解析器版本影響快取鍵"""
+        key_a = self.cache.key_for(self.structure_file, '1')
+        key_b = self.cache.key_for(self.structure_file, '2')
+        self.assertNotEqual(key_a, key_b)
+
+    def test_corrupt_entry_is_ignored(self):
+        """測試損壞的快取項目會被忽略並移除"""
+        key = self.cache.key_for(self.structure_file, '1')
+        self.cache.put(key, {'a': None})
+        entry = self.temp_dir / "cache" / f"{key}.marshal"
+        entry.write_bytes(b'\x00garbage')
+
+        self.assertIsNone(self.cache.get(key))
+        self.assertFalse(entry.exists())
+
+    def test_lru_eviction(self):
+        """測試超過容量時淘汰最久未使用的項目"""
+        cache = ParseCache(str(self.temp_dir / "small"))
+        cache.put('old', {'a': 'x' * 100})
+        cache.put('mid', {'b': 'y' * 100})
+        old_entry = self.temp_dir / "small" / "old.marshal"
+        os.utime(old_entry, ns=(1, 1))
+
+        # 容量不足三個項目，寫入第三個時淘汰最久未使用的 old（降到上限的 80% 以下即停止）
+        cache.max_bytes = old_entry.stat().st_size * 3 - 1
+        cache.put('new', {'c': 'z' * 100})
+
+        self.assertIsNone(cache.get('old'))
+        self.assertIsNotNone(cache.get('mid'))
+        self.assertIsNotNone(cache.get('new'))
+
+    def test_put_scans_only_when_over_capacity(self):
+        """測試只有第一次寫入與超過容量時才掃描快取目錄"""
+        cache_dir = self.temp_dir / "scan"
+        with patch('disk_cache.os.scandir', side_effect=os.scandir) as scandir:
+            for i in range(50):
+                ParseCache(str(cache_dir)).put(f"k{i}", {'v': 'x' * 100})
+        self.assertEqual(scandir.call_count, 1)
+
+        entry_size = (cache_dir / "k0.marshal").stat().st_size
+        cache = ParseCache(str(cache_dir), max_bytes=entry_size * 50)
+        with patch('disk_cache.os.scandir', side_effect=os.scandir) as scandir:
+            cache.put('k50', {'v': 'x' * 100})
+        self.assertEqual(scandir.call_count, 1)
+        # 淘汰到上限的 80%：保留 40 個項目，最新寫入的保留
+        self.assertEqual(len(list(cache_dir.glob("*.marshal"))), 40)
+        self.assertIsNotNone(cache.get('k50'))
+
+    def test_default_cache_can_be_disabled(self):
+        """測試 --no-parse-cache 對應的停用開關"""
+        self.assertIsInstance(default_parse_cache(), ParseCache)
+        set_parse_cache_enabled(False)
+        self.assertIsNone(default_parse_cache())
+
+    def test_default_cache_dir_env(self):
+        """測試快取目錄環境變數"""
+        os.environ[parse_cache.CACHE_DIR_ENV] = str(self.temp_dir / "env_cache")
+        try:
+            self.assertEqual(parse_cache.default_cache_dir(), self.temp_dir / "env_cache")
+        finally:
+            del os.environ[parse_cache.CACHE_DIR_ENV]
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+"""
+生成進度回報測試
+"""
+import json
+import unittest
+import sys
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+# 添加 src 目錄到路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from filesystem import MemoryFileSystem
+from progress import (
+    JsonLinesProgressReporter, ProgressReporter, TextProgressReporter, VerboseProgressReporter,
+    create_reporter, format_size
+)
+from project_generator import ProjectGenerator
+
+
+def make_structure(count):
+    children = {f"m{i}.py": {'name': f"m{i}.py", 'type': 'file', 'comment': None} for i in range(count)}
+    return {'app': {'name': 'app', 'type': 'directory', 'comment': None, 'children': children}}
+
+
+class TestProgressReporter(unittest.TestCase):
+    """進度回報測試"""
+
+    def test_rate_limited(self):
+        """測試輸出次數受 interval 限制，與節點數量無關"""
+        stream = StringIO()
+        reporter = TextProgressReporter(stream, interval=3600)
+        reporter.start(0, 1000, 1000)
+        for _ in range(1000):
+            reporter.advance(files=1, nbytes=1)
+        self.assertEqual(stream.getvalue(), "")
+        self.assertEqual((reporter.files, reporter.bytes), (1000, 1000))
+
+        reporter.finish()
+        self.assertEqual(len(stream.getvalue().splitlines()), 1)
+        self.assertIn("1000 個文件", stream.getvalue())
+
+    def test_snapshot(self):
+        """測試每秒文件數與預估剩餘時間"""
+        reporter = ProgressReporter(interval=3600)
+        with patch('progress.time.monotonic', return_value=100.0):
+            reporter.start(2, 10, 100)
+        reporter.advance(directories=2, files=4, nbytes=40)
+        snapshot = reporter.snapshot(now=102.0)
+        self.assertEqual(snapshot['files_per_sec'], 2.0)
+        self.assertEqual(snapshot['eta'], 3.0)
+        self.assertEqual(snapshot['total_bytes'], 100)
+
+    def test_json_lines(self):
+        """測試 JSON Lines 事件"""
+        stream = StringIO()
+        reporter = JsonLinesProgressReporter(stream, interval=0)
+        reporter.start(1, 2, 20)
+        reporter.advance(files=1, nbytes=10)
+        reporter.warning("[!] 注意")
+        reporter.finish({'created': 2})
+
+        events = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual([e['event'] for e in events], ['start', 'progress', 'warning', 'done'])
+        self.assertEqual(events[1]['files'], 1)
+        self.assertEqual(events[3]['stats'], {'created': 2})
+
+    def test_create_reporter(self):
+        """測試依模式建立進度回報"""
+        self.assertIsInstance(create_reporter('text', verbose=True), VerboseProgressReporter)
+        self.assertIsInstance(create_reporter('json'), JsonLinesProgressReporter)
+        self.assertIs(type(create_reporter('quiet')), ProgressReporter)
+        with self.assertRaises(ValueError):
+            create_reporter('xml')
+
+    def test_format_size(self):
+        """測試大小格式"""
+        self.assertEqual(format_size(512), "512 B")
+        self.assertEqual(format_size(1536), "1.5 KiB")
+        self.assertEqual(format_size(3 * 1024 ** 3), "3.0 GiB")
+
+
+class TestGeneratorProgress(unittest.TestCase):
+    """生成器進度輸出測試"""
+
+    def _generate(self, progress):
+        generator = ProjectGenerator("out", fs=MemoryFileSystem(), progress=progress)
+        with patch('sys.stdout', new=StringIO()) as out:
+            generator.generate(make_structure(50))
+        return out.getvalue()
+
+    def test_default_has_no_per_node_lines(self):
+        """測試預設不逐一輸出節點"""
+        output = self._generate(None)
+        self.assertNotIn("[FILE]", output)
+        self.assertIn("[*] 完成: 1 個目錄、51 個文件", output)
+
+    def test_verbose(self):
+        """測試 verbose 時逐一輸出節點"""
+        output = self._generate(VerboseProgressReporter())
+        self.assertEqual(output.count("[FILE] 創建文件"), 50)
+        self.assertIn("[DIR] 創建目錄", output)
+
+    def test_quiet(self):
+        """測試 quiet 模式不輸出"""
+        self.assertEqual(self._generate(ProgressReporter()), "")
+
+    def test_concurrent_counts(self):
+        """測試並行寫入時數量正確"""
+        reporter = ProgressReporter()
+        generator = ProjectGenerator("out", workers=4, fs=MemoryFileSystem(), progress=reporter)
+        generator.generate(make_structure(200))
+        self.assertEqual((reporter.files, reporter.total_files), (201, 201))
+        self.assertEqual(reporter.bytes, reporter.total_bytes)
+
+
+if __name__ == '__main__':
+    unittest.main()
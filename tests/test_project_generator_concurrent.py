@@ -0,0 +1,87 @@
+"""
+專案生成器並行寫入測試
+"""
+import unittest
+import sys
+import tempfile
+import shutil
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+# 添加 src 目錄到路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from progress import VerboseProgressReporter
+from project_generator import ProjectGenerator
+from structure_parser import StructureParser
+
+EXAMPLES_DIR = Path(__file__).parent.parent / "examples"
+
+
+def snapshot(root: Path):
+    """目錄樹快照：相對路徑 -> 文件內容（目錄為 None）"""
+    return {
+        str(path.relative_to(root)): None if path.is_dir() else path.read_text(encoding='utf-8')
+        for path in root.rglob('*')
+    }
+
+
+class TestProjectGeneratorConcurrent(unittest.TestCase):
+    """並行寫入與依序寫入的結果應相同"""
+
+    def setUp(self):
+        """設置測試環境"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        """清理測試環境"""
+        shutil.rmtree(self.temp_dir)
+
+    def _generate(self, structure, name, workers):
+        output_dir = self.temp_dir / name
+        with patch('sys.stdout', new=StringIO()) as out:
+            ProjectGenerator(str(output_dir), workers=workers,
+                             progress=VerboseProgressReporter()).generate(structure)
+        # 完成摘要含耗時，不列入比較
+        lines = [line for line in out.getvalue().splitlines() if not line.startswith("[*] 完成")]
+        return snapshot(output_dir), "\n".join(lines).replace(str(output_dir), '<out>')
+
+    def test_same_output_as_sequential(self):
+        """測試範例結構的文件與輸出訊息相同"""
+        for example in ("python", "rust"):
+            structure = StructureParser(
+                str(EXAMPLES_DIR / f"{example}_project_structure_example.md")).parse()
+            sequential = self._generate(structure, f"{example}_seq", 1)
+            concurrent = self._generate(structure, f"{example}_par", 8)
+            self.assertEqual(concurrent, sequential)
+
+    def test_directory_readme_takes_precedence(self):
+        """測試目錄自動產生的 README.md 優先於結構中的 README.md"""
+        structure = {
+            'pkg': {'name': 'pkg', 'type': 'directory', 'comment': '套件', 'children': {
+                'README.md': {'name': 'README.md', 'type': 'file', 'comment': '子項目註解'},
+            }},
+        }
+        files, _ = self._generate(structure, "out", 4)
+        self.assertIn('套件', files['pkg/README.md'])
+        self.assertNotIn('子項目註解', files['pkg/README.md'])
+
+    def test_existing_files_are_kept(self):
+        """測試已存在的文件不會被覆寫"""
+        structure = {
+            'pkg': {'name': 'pkg', 'type': 'directory', 'comment': None, 'children': {
+                'main.py': {'name': 'main.py', 'type': 'file', 'comment': None},
+            }},
+        }
+        existing = self.temp_dir / "out" / "pkg" / "main.py"
+        existing.parent.mkdir(parents=True)
+        existing.write_text("keep\n", encoding='utf-8')
+
+        files, output = self._generate(structure, "out", 4)
+        self.assertEqual(files['pkg/main.py'], "keep\n")
+        self.assertNotIn("main.py", output)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+"""
+專案生成器去重寫入測試
+"""
+import os
+import unittest
+import sys
+import tempfile
+import shutil
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+# 添加 src 目錄到路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from filesystem import MemoryFileSystem
+from project_generator import ProjectGenerator
+
+
+def make_structure(modules):
+    """每個模組都有內容相同的 __init__.py"""
+    children = {
+        module: {'name': module, 'type': 'directory', 'comment': None,
+                 'children': {'__init__.py': {'name': '__init__.py', 'type': 'file', 'comment': '套件'}}}
+        for module in modules
+    }
+    return {'project': {'name': 'project', 'type': 'directory', 'comment': None, 'children': children}}
+
+
+class TestProjectGeneratorDedup(unittest.TestCase):
+    """去重寫入測試"""
+
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _apply(self, generator, structure, **kwargs):
+        generator.fs.mkdir(generator.output_dir)
+        with patch('sys.stdout', new=StringIO()):
+            return generator.apply_plan(generator.plan(structure), **kwargs)
+
+    @unittest.skipUnless(hasattr(os, 'link'), "需要硬連結")
+    def test_hardlink(self):
+        """測試重複文件以硬連結寫入並回報節省量"""
+        for workers in (1, 4):
+            output_dir = self.temp_dir / f"w{workers}"
+            generator = ProjectGenerator(str(output_dir), workers=workers, dedup='hardlink')
+            stats = self._apply(generator, make_structure(['a', 'b', 'c']))
+
+            inits = [output_dir / 'project' / m / '__init__.py' for m in 'abc']
+            self.assertEqual(len({path.stat().st_ino for path in inits}), 1)
+            self.assertEqual(inits[0].stat().st_nlink, 3)
+            self.assertEqual(stats['created'], 7)
+            self.assertEqual(stats['linked'], 2)
+            self.assertEqual(stats['inodes_saved'], 2)
+            self.assertEqual(stats['bytes_saved'], 2 * len(inits[0].read_bytes()))
+
+    def test_fallback_when_unsupported(self):
+        """測試無法連結時改為一般寫入"""
+        generator = ProjectGenerator(str(self.temp_dir / "out"), dedup='reflink')
+        with patch.object(generator.fs, 'clone', side_effect=OSError(95, "Operation not supported")) as clone:
+            stats = self._apply(generator, make_structure(['a', 'b', 'c']))
+
+        self.assertEqual(clone.call_count, 1)
+        self.assertEqual(stats['created'], 7)
+        self.assertEqual(stats['linked'], 0)
+        self.assertEqual((self.temp_dir / "out/project/c/__init__.py").read_text(encoding='utf-8'),
+                         (self.temp_dir / "out/project/a/__init__.py").read_text(encoding='utf-8'))
+
+    def test_existing_primary_not_linked(self):
+        """測試第一個文件已存在（使用者的文件）時不連結到它"""
+        output_dir = self.temp_dir / "out"
+        (output_dir / 'project' / 'a').mkdir(parents=True)
+        (output_dir / 'project' / 'a' / '__init__.py').write_text("user", encoding='utf-8')
+
+        generator = ProjectGenerator(str(output_dir), dedup='hardlink')
+        self._apply(generator, make_structure(['a', 'b']))
+
+        self.assertEqual((output_dir / 'project/a/__init__.py').read_text(encoding='utf-8'), "user")
+        self.assertIn('套件', (output_dir / 'project/b/__init__.py').read_text(encoding='utf-8'))
+
+    def test_memory_filesystem(self):
+        """測試記憶體檔案系統共用同一個字串"""
+        fs = MemoryFileSystem()
+        generator = ProjectGenerator("out", fs=fs, dedup='hardlink')
+        stats = self._apply(generator, make_structure(['a', 'b']))
+
+        self.assertEqual(stats['linked'], 1)
+        self.assertIs(fs.read("out/project/a/__init__.py"), fs.read("out/project/b/__init__.py"))
+
+    def test_invalid_mode(self):
+        """測試不支援的去重方式"""
+        with self.assertRaises(ValueError):
+            ProjectGenerator(str(self.temp_dir), dedup='copy')
+
+
+if __name__ == '__main__':
+    unittest.main()
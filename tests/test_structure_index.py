@@ -0,0 +1,82 @@
+"""
+測試結構路徑索引
+"""
+import unittest
+import sys
+from pathlib import Path
+
+# 添加 src 目錄到路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from structure_index import StructureIndex
+
+
+class TestStructureIndex(unittest.TestCase):
+    """測試結構路徑索引"""
+
+    def setUp(self):
+        """設置測試環境"""
+        self.structure = {
+            'system': {
+                'type': 'directory', 'name': 'system', 'comment': None,
+                'children': {
+                    'project1': {
+                        'type': 'directory', 'name': 'project1', 'comment': '專案',
+                        'children': {
+                            'backend': {
+                                'type': 'directory', 'name': 'backend', 'comment': None,
+                                'children': {
+                                    'src': {
+                                        'type': 'directory', 'name': 'src', 'comment': None,
+                                        'children': {
+                                            'api': {'type': 'directory', 'name': 'api', 'comment': 'API 層', 'children': {}},
+                                            'main.py': {'type': 'file', 'name': 'main.py', 'comment': None, 'children': None},
+                                        }
+                                    }
+                                }
+                            },
+                            'README.md': {'type': 'file', 'name': 'README.md', 'comment': None, 'children': None},
+                        }
+                    },
+                    'README.md': {'type': 'file', 'name': 'README.md', 'comment': None, 'children': None},
+                }
+            }
+        }
+
+    def test_full_paths(self):
+        """測試完整路徑列表"""
+        index = StructureIndex(self.structure)
+
+        self.assertIn('system/project1/backend/src/api', index.directories)
+        self.assertIn(('system/project1/backend/src/main.py', 'main.py'), index.files)
+        self.assertTrue(index.has_path('system/project1/backend/src/api'))
+        self.assertEqual(index.get('system/project1')['comment'], '專案')
+
+    def test_relative_paths_strip_root_names(self):
+        """測試略過外層目錄的相對路徑"""
+        index = StructureIndex(self.structure, ('system', 'project1'))
+
+        self.assertEqual(index.relative_directories, ['backend', 'backend/src', 'backend/src/api'])
+        self.assertEqual(index.relative_files, ['backend/src/main.py', 'README.md', 'README.md'])
+        self.assertTrue(index.is_expected_directory('backend/src/api'))
+        self.assertTrue(index.is_expected_file('README.md'))
+        self.assertFalse(index.is_expected_file('system/README.md'))
+
+    def test_counts_and_annotations(self):
+        """測試計數與註解"""
+        index = StructureIndex(self.structure, ('system', 'project1'))
+
+        self.assertEqual(index.counts, {'directories': 5, 'files': 3})
+        self.assertEqual(index.annotations, ['專案', 'API 層'])
+
+    def test_empty_structure(self):
+        """測試空結構"""
+        index = StructureIndex({})
+
+        self.assertEqual(index.files, [])
+        self.assertEqual(index.directories, [])
+        self.assertEqual(index.counts, {'directories': 0, 'files': 0})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+"""
+結構解析器事件串流測試
+"""
+import unittest
+import sys
+import tempfile
+import shutil
+from pathlib import Path
+
+# 添加 src 目錄到路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from structure_parser import (
+    StructureParser, EVENT_ENTER_DIR, EVENT_FILE, EVENT_LEAVE_DIR
+)
+
+
+class TestStructureParserIter(unittest.TestCase):
+    """結構解析器事件串流測試"""
+
+    def setUp(self):
+        """設置測試環境"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.structure_file = self.temp_dir / "structure.md"
+        self.structure_file.write_text("""```
+project/
+├─ src/
+│  ├─ main.py ← 主程式
+│  └─ utils.py
+└─ README.md
+```""", encoding='utf-8')
+
+    def tearDown(self):
+        """清理測試環境"""
+        if self.temp_dir.exists():
+            shutil.rmtree(self.temp_dir)
+
+    def test_parse_iter_event_order(self):
+        """測試事件順序"""
+        parser = StructureParser(str(self.structure_file))
+        events = [(e.kind, e.path) for e in parser.parse_iter()]
+
+        self.assertEqual(events, [
+            (EVENT_ENTER_DIR, 'project'),
+            (EVENT_ENTER_DIR, 'project/src'),
+            (EVENT_FILE, 'project/src/main.py'),
+            (EVENT_FILE, 'project/src/utils.py'),
+            (EVENT_LEAVE_DIR, 'project/src'),
+            (EVENT_FILE, 'project/README.md'),
+            (EVENT_LEAVE_DIR, 'project'),
+        ])
+
+    def test_parse_iter_level_and_comment(self):
+        """測試事件包含層級與註解"""
+        parser = StructureParser(str(self.structure_file))
+        main_event = [e for e in parser.parse_iter() if e.name == 'main.py'][0]
+
+        self.assertEqual(main_event.level, 2)
+        self.assertEqual(main_event.comment, '主程式')
+
+    def test_parse_iter_is_lazy(self):
+        """測試事件可以在解析完成前逐一取得"""
+        parser = StructureParser(str(self.structure_file))
+        events = parser.parse_iter()
+
+        first = next(events)
+        self.assertEqual(first.kind, EVENT_ENTER_DIR)
+        self.assertEqual(first.name, 'project')
+        events.close()
+
+    def test_parse_iter_file_not_found(self):
+        """測試文件不存在時立即拋出錯誤"""
+        parser = StructureParser(str(self.temp_dir / "missing.md"))
+        with self.assertRaises(FileNotFoundError):
+            parser.parse_iter()
+
+    def test_parse_consumes_events(self):
+        """測試 parse 由事件串流建立結構"""
+        parser = StructureParser(str(self.structure_file))
+        structure = parser.parse()
+
+        src = structure['project']['children']['src']
+        self.assertEqual(set(src['children']), {'main.py', 'utils.py'})
+        self.assertIn('README.md', structure['project']['children'])
+
+    def test_parse_deep_tree(self):
+        """測試深層結構直接掛載到父目錄"""
+        depth = 60
+        lines = ["```", "root/"]
+        for level in range(1, depth + 1):
+            lines.append("│  " * (level - 1) + f"├─ d{level}/")
+        lines.append("│  " * depth + "└─ leaf.py")
+        lines.append("```")
+        deep_file = self.temp_dir / "deep.md"
+        deep_file.write_text("\n".join(lines), encoding='utf-8')
+
+        structure = StructureParser(str(deep_file)).parse()
+
+        node = structure['root']
+        for level in range(1, depth + 1):
+            node = node['children'][f"d{level}"]
+        self.assertEqual(node['children']['leaf.py']['type'], 'file')
+
+
+if __name__ == '__main__':
+    unittest.main()
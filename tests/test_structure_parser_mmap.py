@@ -0,0 +1,96 @@
+"""
+結構解析器 mmap 讀取路徑測試
+"""
+import unittest
+import sys
+import tempfile
+import shutil
+from pathlib import Path
+from unittest.mock import patch
+
+# 添加 src 目錄到路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from structure_parser import StructureParser
+
+
+class TestStructureParserMmap(unittest.TestCase):
+    """大型文件以 mmap 讀取時結果應與文字模式相同"""
+
+    def setUp(self):
+        """設置測試環境"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        """清理測試環境"""
+        shutil.rmtree(self.temp_dir)
+
+    def _parse_both(self, content: bytes):
+        path = self.temp_dir / "structure.md"
+        path.write_bytes(content)
+        text_parser = StructureParser(str(path))
+        text_parser.mmap_threshold = len(content) + 1
+        mmap_parser = StructureParser(str(path))
+        mmap_parser.mmap_threshold = 0
+        return text_parser.parse(), mmap_parser.parse()
+
+    def test_skips_prose_before_structure(self):
+        """測試略過含 / 的標題與 -- 文字後找到結構"""
+        content = """# 設計 / 架構
+
+說明文字 -- 不是結構。
+
+```
+project/
+├─ src/ ← 原始碼
+│  └─ main.py
+└─ README.md
+```
+
+後續說明 a/b
+""".encode('utf-8')
+        text_result, mmap_result = self._parse_both(content)
+        self.assertEqual(mmap_result, text_result)
+        self.assertIn('main.py', mmap_result['project']['children']['src']['children'])
+
+    def test_tree_command_named_root(self):
+        """測試 tree 指令輸出的根目錄行（位於第一個結構行之前）"""
+        content = "說明\n\n```\nmyproj\n├── src\n│   └── main.py\n└── README.md\n\n1 directory, 2 files\n```\n".encode('utf-8')
+        text_result, mmap_result = self._parse_both(content)
+        self.assertEqual(mmap_result, text_result)
+        self.assertEqual(set(mmap_result['myproj']['children']), {'src', 'README.md'})
+
+    def test_fenced_label_without_summary(self):
+        """測試沒有統計行的區塊第一行不是根目錄"""
+        content = "```\nLayout\n├── src\n│   └── main.py\n└── README.md\n```\n".encode('utf-8')
+        text_result, mmap_result = self._parse_both(content)
+        self.assertEqual(mmap_result, text_result)
+        self.assertEqual(set(mmap_result), {'src', 'README.md'})
+
+    def test_crlf_and_missing_trailing_newline(self):
+        """測試 CRLF 換行與結尾沒有換行"""
+        content = "project/\r\n|-- src/\r\n|   `-- main.py\r\n`-- README.md".encode('utf-8')
+        text_result, mmap_result = self._parse_both(content)
+        self.assertEqual(mmap_result, text_result)
+        self.assertEqual(set(mmap_result['project']['children']), {'src', 'README.md'})
+
+    def test_no_structure(self):
+        """測試沒有結構的文件"""
+        text_result, mmap_result = self._parse_both("# 標題\n\n只有說明\n".encode('utf-8'))
+        self.assertEqual(mmap_result, {})
+        self.assertEqual(text_result, {})
+
+    def test_large_file_uses_mmap_by_default(self):
+        """測試超過門檻的文件預設走 mmap 路徑"""
+        path = self.temp_dir / "large.md"
+        path.write_text("說明\n" * 10 + "```\nproject/\n└─ a.py\n```\n", encoding='utf-8')
+        parser = StructureParser(str(path))
+        parser.mmap_threshold = 16
+        with patch.object(parser, '_iter_mmap_events', wraps=parser._iter_mmap_events) as spy:
+            events = list(parser.parse_iter())
+        spy.assert_called_once()
+        self.assertEqual([e.name for e in events], ['project', 'a.py', 'project'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,201 @@
+"""
+結構解析器分詞器測試
+"""
+import unittest
+import sys
+import tempfile
+import shutil
+from pathlib import Path
+
+# 添加 src 目錄到路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from structure_parser import StructureParser
+
+
+class TestStructureParserTokenizer(unittest.TestCase):
+    """結構解析器分詞器測試"""
+
+    def setUp(self):
+        """設置測試環境"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.parser = StructureParser(str(self.temp_dir / "structure.md"))
+
+    def tearDown(self):
+        """清理測試環境"""
+        if self.temp_dir.exists():
+            shutil.rmtree(self.temp_dir)
+
+    def _parse_text(self, text: str) -> dict:
+        structure_file = self.temp_dir / "structure.md"
+        structure_file.write_text(text, encoding='utf-8')
+        return StructureParser(str(structure_file)).parse()
+
+    def test_tokenize_unicode_tree_line(self):
+        """測試 ├─ 格式的單行分詞（欄位為分支符號所在位置）"""
+        self.assertEqual(
+            self.parser._tokenize("│  │  ├─ main.py ← 主程式"),
+            (6, True, 'main.py', '主程式', False)
+        )
+        self.assertEqual(self.parser._tokenize("└─ src/"), (0, True, 'src', None, True))
+
+    def test_tokenize_plain_line(self):
+        """測試沒有樹狀符號的行"""
+        self.assertEqual(self.parser._tokenize("project/"), (0, False, 'project', None, True))
+        self.assertEqual(self.parser._tokenize("      main.py"), (6, False, 'main.py', None, False))
+
+    def test_tokenize_empty_name(self):
+        """測試只有樹狀符號的行"""
+        self.assertIsNone(self.parser._tokenize("│"))
+        self.assertIsNone(self.parser._tokenize("│  │"))
+
+    def test_tokenize_tree_command_line(self):
+        """測試 tree 指令輸出格式"""
+        self.assertEqual(self.parser._tokenize("├── src"), (0, True, 'src', None, True))
+        self.assertEqual(self.parser._tokenize("│   │   └── app.py"), (8, True, 'app.py', None, False))
+        # tree 指令使用不換行空白縮排
+        self.assertEqual(self.parser._tokenize("│\u00a0\u00a0 └── app.py"), (4, True, 'app.py', None, False))
+
+    def test_tokenize_ascii_line(self):
+        """測試 ASCII 樹狀格式"""
+        self.assertEqual(self.parser._tokenize("|-- src/"), (0, True, 'src', None, True))
+        self.assertEqual(self.parser._tokenize("|   `-- util.py ← 工具"), (4, True, 'util.py', '工具', False))
+
+    def test_parse_ascii_tree(self):
+        """測試解析 ASCII 樹"""
+        structure = self._parse_text("""```
+project/
+|-- src/
+|   |-- main.py
+|   `-- config
+`-- README.md
+```""")
+
+        project = structure['project']['children']
+        self.assertIn('main.py', project['src']['children'])
+        self.assertIn('config', project['src']['children'])
+        self.assertIn('README.md', project)
+
+    def test_parse_tree_glyphs_with_three_column_indent(self):
+        """測試 ├── 分支搭配每層 3 個字元的縮排"""
+        structure = self._parse_text("""```
+proj/
+├── src/
+│  ├── a.py
+│  └── lib/
+│     └── b.py
+└── README.md
+```""")
+
+        proj = structure['proj']['children']
+        self.assertEqual(set(proj), {'src', 'README.md'})
+        self.assertIn('a.py', proj['src']['children'])
+        self.assertIn('b.py', proj['src']['children']['lib']['children'])
+
+    def test_parse_ascii_tree_with_two_column_indent(self):
+        """測試 ASCII |-- 分支搭配每層 2 個字元的縮排"""
+        structure = self._parse_text("""```
+proj/
+|-- src/
+| |-- a.py
+| `-- lib/
+|   `-- b.py
+`-- README.md
+```""")
+
+        proj = structure['proj']['children']
+        self.assertEqual(set(proj), {'src', 'README.md'})
+        self.assertIn('a.py', proj['src']['children'])
+        self.assertIn('b.py', proj['src']['children']['lib']['children'])
+
+    def test_parse_tree_command_output(self):
+        """測試解析 tree 指令輸出"""
+        structure = self._parse_text("""```
+.
+├── src
+│   ├── main.py
+│   └── utils
+│       └── helpers.py
+└── README.md
+
+3 directories, 3 files
+```""")
+
+        self.assertIn('src', structure)
+        self.assertIn('README.md', structure)
+        utils = structure['src']['children']['utils']
+        self.assertIn('helpers.py', utils['children'])
+
+    def test_parse_tree_command_named_root(self):
+        """測試 tree 指令輸出的根目錄名稱與統計行"""
+        structure = self._parse_text("""```
+myproj
+├── src
+│   └── main.py
+└── README.md
+
+1 directory, 2 files
+```""")
+
+        self.assertEqual(list(structure), ['myproj'])
+        children = structure['myproj']['children']
+        self.assertEqual(set(children), {'src', 'README.md'})
+        self.assertIn('main.py', children['src']['children'])
+
+    def test_prose_line_is_not_tree_root(self):
+        """測試緊鄰樹狀圖的說明文字不會成為根目錄"""
+        structure = self._parse_text("""結構如下:
+├── src
+│   └── main.py
+└── README.md
+""")
+
+        self.assertEqual(set(structure), {'src', 'README.md'})
+
+    def test_fenced_label_without_summary_is_not_tree_root(self):
+        """測試圍欄內第一行的標籤在沒有 tree 統計行時不會成為根目錄"""
+        content = """```
+Layout
+├── src
+│   └── main.py
+└── README.md
+```"""
+        structure = self._parse_text(content)
+        self.assertEqual(set(structure), {'src', 'README.md'})
+
+        block_parser = StructureParser(str(self.temp_dir / "structure.md"), block=0)
+        self.assertEqual(block_parser.parse(), structure)
+
+    def test_prose_above_fence_is_not_tree_root(self):
+        """測試圍欄外緊鄰的說明文字即使區塊有統計行也不會成為根目錄"""
+        structure = self._parse_text("""Structure
+```
+├── src
+│   └── main.py
+└── README.md
+
+1 directory, 2 files
+```""")
+
+        self.assertEqual(set(structure), {'src', 'README.md'})
+
+    def test_tree_command_named_root_with_block_selector(self):
+        """測試以 --block 讀取區塊時同樣辨識 tree 指令的根目錄"""
+        (self.temp_dir / "structure.md").write_text("""# 結構
+
+```text
+myproj
+├── src
+│   └── main.py
+└── README.md
+
+1 directory, 2 files
+```""", encoding='utf-8')
+        structure = StructureParser(str(self.temp_dir / "structure.md"), block=0).parse()
+
+        self.assertEqual(list(structure), ['myproj'])
+        self.assertIn('main.py', structure['myproj']['children']['src']['children'])
+
+
+if __name__ == '__main__':
+    unittest.main()
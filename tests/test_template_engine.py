@@ -0,0 +1,117 @@
+"""
+模板引擎測試
+"""
+import unittest
+import sys
+import tempfile
+import shutil
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+# 添加 src 目錄到路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from template_engine import CompiledTemplate, TemplateEngine, TemplatePack, standard_params
+from project_generator import ProjectGenerator, DEFAULT_TEMPLATE
+
+
+class TestCompiledTemplate(unittest.TestCase):
+    """編譯模板測試"""
+
+    def test_matches_str_format(self):
+        """測試渲染結果與 str.format 相同"""
+        for source in ("# {name}\n\n{comment}\n", "{{\n  \"name\": \"{name}\"\n}}", "100% {name}", "{name:>6}|{comment!r}"):
+            params = {'name': 'core', 'comment': '核心 %s'}
+            self.assertEqual(CompiledTemplate(source).render(params), source.format(**params))
+
+    def test_missing_param(self):
+        """測試缺少參數時拋出 KeyError"""
+        with self.assertRaises(KeyError):
+            CompiledTemplate("{name}").render({})
+
+
+class TestTemplateEngine(unittest.TestCase):
+    """模板引擎測試"""
+
+    def setUp(self):
+        self.engine = TemplateEngine(('default', "# {name}\n", standard_params))
+
+    def test_dispatch_order(self):
+        """測試依完整文件名、副檔名、預設模板的順序選擇"""
+        self.engine.register_suffix('.toml', "toml {name}")
+        self.engine.register_filename('Cargo.toml', "cargo {parent}")
+
+        self.assertEqual(self.engine.select('Cargo.toml', None, 'app')[0], 'Cargo.toml')
+        self.assertEqual(self.engine.select('ruff.toml', None, 'app')[0], '.toml')
+        self.assertEqual(self.engine.select('Makefile', None, 'app')[0], 'default')
+        template, params = self.engine.select('Cargo.toml', None, 'app')
+        self.assertEqual(self.engine.render(template, params), "cargo app")
+
+    def test_render_cache(self):
+        """測試相同模板與參數只渲染一次"""
+        for _ in range(3):
+            content = self.engine.render(*self.engine.select('__init__.py', None, 'pkg'))
+        self.assertEqual(content, "# __init__\n")
+        self.assertEqual((self.engine.cache_misses, self.engine.cache_hits), (1, 2))
+
+        # 註冊模板後清除快取
+        self.engine.register('default', "## {name}\n")
+        self.assertEqual(self.engine.render(*self.engine.select('__init__.py', None, 'pkg')), "## __init__\n")
+
+    def test_cache_size(self):
+        """測試快取大小固定"""
+        engine = TemplateEngine(('default', "{name}", standard_params), cache_size=2)
+        for i in range(5):
+            engine.render('default', {'name': str(i)})
+        self.assertEqual(len(engine._cache), 2)
+
+    def test_register_pack_invalid_suffix(self):
+        """測試副檔名需以點開頭"""
+        with self.assertRaises(ValueError):
+            self.engine.register_pack(TemplatePack(suffixes={'ts': "x"}))
+
+
+class TestGeneratorTemplatePacks(unittest.TestCase):
+    """生成器自訂模板包測試"""
+
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_template_pack(self):
+        """測試自訂模板包優先於內建模板"""
+        pack = TemplatePack(
+            filenames={'Dockerfile': "# {parent}\nFROM python:3.12-slim\n"},
+            suffixes={'.ts': "// {comment}\nexport {{}};\n", '.py': "# {filename}\n"},
+        )
+        generator = ProjectGenerator(str(self.temp_dir), template_packs=[pack])
+        children = {name: {'name': name, 'type': 'file', 'comment': '說明'}
+                    for name in ('Dockerfile', 'index.ts', 'main.py', 'pyproject.toml', 'notes.txt')}
+        structure = {'app': {'name': 'app', 'type': 'directory', 'children': children}}
+        with patch('sys.stdout', new=StringIO()):
+            generator.generate(structure)
+
+        app = self.temp_dir / 'app'
+        self.assertEqual((app / 'Dockerfile').read_text(encoding='utf-8'), "# app\nFROM python:3.12-slim\n")
+        self.assertEqual((app / 'index.ts').read_text(encoding='utf-8'), "// 說明\nexport {};\n")
+        self.assertEqual((app / 'main.py').read_text(encoding='utf-8'), "# main.py\n")
+        self.assertIn('name = "app"', (app / 'pyproject.toml').read_text(encoding='utf-8'))
+        self.assertEqual((app / 'notes.txt').read_text(encoding='utf-8'), "# notes.txt\n\n說明\n")
+
+    def test_builtin_template_ids(self):
+        """測試內建模板 ID 不變（生成清單沿用）"""
+        engine = ProjectGenerator(str(self.temp_dir)).engine
+        parent = self.temp_dir.name
+        self.assertEqual(engine.select('a.py', None, parent)[0], '.py')
+        self.assertEqual(engine.select('README.md', None, parent)[0], '.md')
+        self.assertEqual(engine.select('package.json', None, parent), ('package.json', {'name': parent}))
+        self.assertEqual(engine.select('a.yaml', None, parent)[0], DEFAULT_TEMPLATE)
+
+        content, _, _ = engine.render_entry(*engine.select('package.json', None, parent))
+        self.assertIn(f'"name": "{parent}"', content)
+
+if __name__ == '__main__':
+    unittest.main()
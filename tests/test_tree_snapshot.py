@@ -0,0 +1,120 @@
+"""
+目錄樹快照測試
+"""
+import unittest
+import sys
+import tempfile
+import shutil
+from pathlib import Path
+from unittest.mock import patch
+
+# 添加 src 目錄到路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from filesystem import DiskFileSystem, MemoryFileSystem
+from tree_snapshot import TreeSnapshot
+from verification_metrics import VerificationMetrics
+
+STRUCTURE_CONTENT = """```
+system/
+└─ project1/
+   ├─ core/                ← 核心模組
+   │  ├─ pyproject.toml
+   │  └─ src/
+   │     └─ main.py        ← 主程式
+   └─ README.md
+```"""
+
+
+class TestTreeSnapshot(unittest.TestCase):
+    """目錄樹快照測試"""
+
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        root = self.temp_dir / "root"
+        (root / "core" / "src").mkdir(parents=True)
+        (root / "docs").mkdir()
+        (root / "README.md").write_text("# root\n", encoding='utf-8')
+        (root / "core" / "pyproject.toml").write_text("[project]\n", encoding='utf-8')
+        (root / "core" / "src" / "main.py").write_text("x = 1\n", encoding='utf-8')
+        self.root = root
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_paths(self):
+        """測試路徑、類型與大小"""
+        snapshot = TreeSnapshot(self.root)
+        self.assertEqual(snapshot.directories, ['core', 'docs', 'core/src'])
+        self.assertEqual(snapshot.files, ['README.md', 'core/pyproject.toml', 'core/src/main.py'])
+        self.assertTrue(snapshot.exists())
+        self.assertTrue(snapshot.is_dir('core/src'))
+        self.assertFalse(snapshot.is_dir('README.md'))
+        self.assertFalse(snapshot.exists('missing'))
+        self.assertEqual(snapshot.entries['core/src/main.py'].size, 6)
+
+    def test_files_matching(self):
+        """測試依文件名稱篩選"""
+        snapshot = TreeSnapshot(self.root)
+        self.assertEqual(snapshot.files_matching('*.py'), ['core/src/main.py'])
+        self.assertEqual(snapshot.files_matching('README.md'), ['README.md'])
+        self.assertEqual(snapshot.full_path('README.md'), str(self.root / 'README.md'))
+
+    def test_missing_root(self):
+        """測試根目錄不存在"""
+        snapshot = TreeSnapshot(self.temp_dir / "missing")
+        self.assertFalse(snapshot.exists())
+        self.assertEqual((snapshot.files, snapshot.directories), ([], []))
+
+    def test_memory_matches_disk(self):
+        """測試記憶體檔案系統的快照與磁碟相同"""
+        fs = MemoryFileSystem()
+        for path in ('core/src', 'docs'):
+            fs.mkdir(f"root/{path}")
+        for path in ('README.md', 'core/pyproject.toml', 'core/src/main.py'):
+            fs.write(f"root/{path}", (self.root / path).read_text(encoding='utf-8'))
+        memory = TreeSnapshot("root", fs)
+        disk = TreeSnapshot(self.root)
+        self.assertEqual((memory.files, memory.directories), (disk.files, disk.directories))
+
+
+class TestMetricsSnapshot(unittest.TestCase):
+    """驗證指標共用快照測試"""
+
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.structure_file = self.temp_dir / "structure.md"
+        self.structure_file.write_text(STRUCTURE_CONTENT, encoding='utf-8')
+        project = self.temp_dir / "generated" / "system" / "project1"
+        (project / "core" / "src").mkdir(parents=True)
+        (project / "core" / "src" / "main.py").write_text('"""主程式"""\n', encoding='utf-8')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_single_walk(self):
+        """測試計算所有指標只走訪一次目錄樹"""
+        fs = DiskFileSystem()
+        metrics = VerificationMetrics(str(self.structure_file), str(self.temp_dir / "generated"), fs=fs)
+        with patch.object(fs, 'scan', wraps=fs.scan) as scan, \
+                patch.object(fs, 'walk', wraps=fs.walk) as walk, \
+                patch.object(fs, 'exists', wraps=fs.exists) as exists:
+            result = metrics.calculate_all_metrics()
+        self.assertEqual(scan.call_count, 1)
+        self.assertEqual(walk.call_count, 0)
+        self.assertEqual(exists.call_count, 0)
+        self.assertEqual(result['file_coverage']['matched_count'], 1)
+
+    def test_refresh_snapshot(self):
+        """測試重新走訪後反映新文件"""
+        metrics = VerificationMetrics(str(self.structure_file), str(self.temp_dir / "generated"))
+        self.assertEqual(metrics.calculate_file_coverage()['matched_count'], 1)
+        project = self.temp_dir / "generated" / "system" / "project1"
+        (project / "README.md").write_text("# 專案\n", encoding='utf-8')
+        self.assertEqual(metrics.calculate_file_coverage()['matched_count'], 1)
+        metrics.refresh_snapshot()
+        self.assertEqual(metrics.calculate_file_coverage()['matched_count'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,168 @@
+"""
+測試驗證結果快取
+"""
+import os
+import time
+import unittest
+import sys
+import tempfile
+import shutil
+from pathlib import Path
+from unittest.mock import patch
+
+# 添加 src 目錄到路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from content_checks import ContentChecker
+from filesystem import MemoryFileSystem
+from verification_cache import (
+    VerificationCache, default_verification_cache, set_verification_cache_enabled
+)
+from verification_metrics import VerificationMetrics
+from parse_cache import ParseCache, default_parse_cache
+
+STRUCTURE_CONTENT = """```
+system/
+└─ project1/
+   ├─ core/                ← 核心模組
+   │  ├─ pyproject.toml
+   │  └─ src/
+   │     ├─ main.py        ← 主程式
+   │     └─ utils.py       ← 工具函數
+   └─ README.md
+```"""
+
+# 足以避開 mtime 太接近走訪時間的保護
+OLD_MTIME_NS = 1_000_000_000 * 1_000_000_000
+
+
+class TestVerificationCache(unittest.TestCase):
+    """測試驗證結果快取"""
+
+    def setUp(self):
+        """設置測試環境"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.cache = VerificationCache(str(self.temp_dir / "cache"))
+        self.structure_file = self.temp_dir / "structure.md"
+        self.structure_file.write_text(STRUCTURE_CONTENT, encoding='utf-8')
+        self.generated_dir = self.temp_dir / "generated"
+        self.project = self.generated_dir / "system" / "project1"
+        (self.project / "core" / "src").mkdir(parents=True)
+        self._write("core/pyproject.toml", '[project]\nname = "core"\n')
+        self._write("core/src/main.py", '"""主程式"""\n\ndef main():\n    pass\n')
+        self._write("core/src/utils.py", '"""工具函數"""\n')
+        self._write("README.md", "# 專案\n\n核心模組\n")
+
+    def tearDown(self):
+        """清理測試環境"""
+        set_verification_cache_enabled(True)
+        shutil.rmtree(self.temp_dir)
+
+    def _write(self, relative_path: str, content: str, mtime_ns: int = OLD_MTIME_NS):
+        path = self.project / relative_path
+        path.write_text(content, encoding='utf-8')
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+    def _calculator(self, cache=None):
+        return VerificationMetrics(str(self.structure_file), str(self.generated_dir),
+                                   cache=cache or self.cache, workers=1)
+
+    def _read_paths(self, calculator):
+        """計算所有指標並返回實際讀取的文件"""
+        with patch.object(ContentChecker, 'check', autospec=True,
+                          side_effect=ContentChecker.check) as check:
+            metrics = calculator.calculate_all_metrics()
+        return metrics, sorted(call.args[1] for call in check.call_args_list)
+
+    def test_unchanged_files_not_reread(self):
+        """測試未改變的文件直接沿用快取結果"""
+        first, read = self._read_paths(self._calculator())
+        self.assertEqual(len(read), 4)
+
+        calculator = self._calculator()
+        second, read = self._read_paths(calculator)
+        self.assertEqual(read, [])
+        self.assertEqual(calculator.cache_stats, {'hits': 4, 'misses': 0})
+        self.assertEqual(second, first)
+
+    def test_changed_file_reread(self):
+        """測試內容改變的文件重新讀取，結果反映新內容"""
+        self._calculator().calculate_all_metrics()
+        self._write("core/src/utils.py", "x = 1\n", mtime_ns=OLD_MTIME_NS + 1)
+
+        calculator = self._calculator()
+        metrics, read = self._read_paths(calculator)
+        self.assertEqual([Path(path).name for path in read], ["utils.py"])
+        self.assertEqual(calculator.cache_stats, {'hits': 3, 'misses': 1})
+        checks = {check['file']: check for check in metrics['template_accuracy']['template_files']['python_files']['checks']}
+        self.assertFalse(checks['core/src/utils.py']['passed'])
+        self.assertIn('工具函數', metrics['annotation_preservation']['missing_annotations'])
+
+    def test_new_and_removed_files(self):
+        """測試新增與刪除的文件"""
+        self._calculator().calculate_all_metrics()
+        (self.project / "core" / "src" / "utils.py").unlink()
+        self._write("core/src/extra.py", '"""額外"""\n')
+
+        metrics, read = self._read_paths(self._calculator())
+        self.assertEqual([Path(path).name for path in read], ["extra.py"])
+        files = [check['file'] for check in metrics['template_accuracy']['template_files']['python_files']['checks']]
+        self.assertEqual(sorted(files), ['core/src/extra.py', 'core/src/main.py'])
+
+    def test_recent_mtime_not_cached(self):
+        """測試 mtime 太接近走訪時間的文件不寫入快取"""
+        now = time.time_ns()
+        self._write("README.md", "# 專案\n", mtime_ns=now)
+        self._calculator().calculate_all_metrics()
+
+        _, read = self._read_paths(self._calculator())
+        self.assertEqual([Path(path).name for path in read], ["README.md"])
+
+    def test_key_depends_on_annotations(self):
+        """測試預期註解改變時不沿用快取"""
+        self._calculator().calculate_all_metrics()
+        self.structure_file.write_text(STRUCTURE_CONTENT.replace("主程式", "入口"), encoding='utf-8')
+
+        _, read = self._read_paths(self._calculator())
+        self.assertEqual(len(read), 4)
+
+    def test_corrupted_cache_ignored(self):
+        """測試損壞的快取項目視為未命中"""
+        self._calculator().calculate_all_metrics()
+        for entry in (self.temp_dir / "cache").iterdir():
+            entry.write_bytes(b"not marshal")
+
+        _, read = self._read_paths(self._calculator())
+        self.assertEqual(len(read), 4)
+
+    def test_memory_filesystem_not_cached(self):
+        """測試記憶體檔案系統不使用預設快取"""
+        calculator = VerificationMetrics(str(self.structure_file), str(self.generated_dir),
+                                         fs=MemoryFileSystem())
+        self.assertIsNone(calculator.cache)
+
+    def test_disable(self):
+        """測試停用預設快取"""
+        self.assertIsInstance(default_verification_cache(), VerificationCache)
+        set_verification_cache_enabled(False)
+        self.assertIsNone(default_verification_cache())
+        calculator = VerificationMetrics(str(self.structure_file), str(self.generated_dir))
+        self.assertIsNone(calculator.cache)
+
+
+    def test_independent_from_parse_cache(self):
+        """測試驗證快取與解析快取的目錄與開關互不影響"""
+        with patch.dict(os.environ, {'PROJECT_STRUCTURE_VERIFY_CACHE_DIR': '',
+                                     'XDG_CACHE_HOME': str(self.temp_dir / "xdg")}):
+            os.environ.pop('PROJECT_STRUCTURE_CACHE_DIR', None)
+            self.assertEqual(VerificationCache.default_cache_dir().name, 'verify')
+            self.assertEqual(ParseCache.default_cache_dir().name, 'parse')
+
+        set_verification_cache_enabled(False)
+        self.assertIsNone(default_verification_cache())
+        self.assertIsInstance(default_parse_cache(), ParseCache)
+        self.assertFalse(hasattr(VerificationCache, 'key_for'))
+
+
+if __name__ == '__main__':
+    unittest.main()
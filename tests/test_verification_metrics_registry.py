@@ -0,0 +1,125 @@
+"""
+測試指標登記表與選取部分指標
+"""
+import json
+import unittest
+import sys
+import tempfile
+import shutil
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+# 添加 src 目錄到路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from content_checks import ContentChecker
+from verification_metrics import (
+    INPUT_CONTENTS, METRICS, VerificationMetrics, parse_metric_selection, select_metrics
+)
+from generate_metrics import main
+
+STRUCTURE_CONTENT = """```
+system/
+└─ project1/
+   ├─ core/                ← 核心模組
+   │  ├─ pyproject.toml
+   │  └─ src/
+   │     └─ main.py        ← 主程式
+   └─ README.md
+```"""
+
+
+class TestMetricRegistry(unittest.TestCase):
+    """測試指標登記表與選取部分指標"""
+
+    def setUp(self):
+        """設置測試環境"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.structure_file = self.temp_dir / "structure.md"
+        self.structure_file.write_text(STRUCTURE_CONTENT, encoding='utf-8')
+        self.generated_dir = self.temp_dir / "generated"
+        project = self.generated_dir / "system" / "project1"
+        (project / "core" / "src").mkdir(parents=True)
+        (project / "core" / "pyproject.toml").write_text('[project]\nname = "core"\n', encoding='utf-8')
+        (project / "core" / "src" / "main.py").write_text('"""主程式"""\n', encoding='utf-8')
+        (project / "README.md").write_text("# 專案\n", encoding='utf-8')
+
+    def tearDown(self):
+        """清理測試環境"""
+        shutil.rmtree(self.temp_dir)
+
+    def _calculator(self):
+        return VerificationMetrics(str(self.structure_file), str(self.generated_dir), cache=None)
+
+    def test_registry_matches_all_metrics(self):
+        """測試登記表涵蓋所有指標且順序相同"""
+        metrics = self._calculator().calculate_all_metrics()
+        self.assertEqual(list(METRICS) + ['overall_score'], list(metrics))
+
+    def test_selection_skips_file_contents(self):
+        """測試不需要文件內容的指標不讀取文件"""
+        calculator = self._calculator()
+        with patch.object(ContentChecker, 'run', side_effect=AssertionError("不應讀取文件")):
+            selected = calculator.calculate_metrics(['directory_coverage', 'file_coverage', 'hierarchy_accuracy'])
+
+        self.assertEqual(list(selected), ['file_coverage', 'directory_coverage', 'hierarchy_accuracy'])
+        full = self._calculator().calculate_all_metrics()
+        for name, value in selected.items():
+            self.assertEqual(value, full[name])
+
+    def test_selection_reads_declared_contents(self):
+        """測試宣告文件內容輸入的指標讀取一次文件"""
+        self.assertIn(INPUT_CONTENTS, METRICS['template_accuracy'].inputs)
+        with patch.object(ContentChecker, 'run', autospec=True, side_effect=ContentChecker.run) as run:
+            selected = self._calculator().calculate_metrics(['template_accuracy', 'annotation_preservation'])
+
+        self.assertEqual(run.call_count, 1)
+        self.assertEqual(selected['annotation_preservation']['preserved_count'], 1)
+
+    def test_compute_selection(self):
+        """測試部分指標的結果不含總體分數，全部指標時照常計算"""
+        result = self._calculator().compute(['file_coverage'])
+        self.assertEqual(list(result), ['file_coverage'])
+        self.assertIn('overall_score', self._calculator().compute(list(METRICS)))
+
+    def test_unknown_metric(self):
+        """測試未知的指標名稱"""
+        with self.assertRaises(ValueError):
+            self._calculator().calculate_metrics(['file_coverage', 'speed'])
+        with self.assertRaises(ValueError):
+            select_metrics([])
+
+    def test_parse_metric_selection(self):
+        """測試解析 --metrics 參數"""
+        self.assertEqual(parse_metric_selection(' directory_coverage,file_coverage,,file_coverage '),
+                         ('file_coverage', 'directory_coverage'))
+        with self.assertRaises(ValueError):
+            parse_metric_selection('file_coverage,unknown')
+
+    def test_cli_metrics(self):
+        """測試命令列只輸出選取的指標"""
+        argv = ['generate_metrics.py', '--structure', str(self.structure_file),
+                '--generated', str(self.generated_dir), '--json', '--metrics', 'file_coverage']
+        with patch.object(sys, 'argv', argv), patch('sys.stdout', new=StringIO()) as stdout:
+            main()
+
+        self.assertEqual(list(json.loads(stdout.getvalue())), ['file_coverage'])
+
+    def test_cli_metrics_markdown_report(self):
+        """測試 --metrics 未搭配 --json 時 Markdown 報告只包含選取的指標"""
+        output = self.temp_dir / "METRICS.md"
+        argv = ['generate_metrics.py', '--structure', str(self.structure_file),
+                '--generated', str(self.generated_dir), '--output', str(output),
+                '--lang', 'en', '--metrics', 'file_coverage']
+        with patch.object(sys, 'argv', argv), patch('sys.stdout', new=StringIO()):
+            main()
+
+        report = (self.temp_dir / "METRICS.en.md").read_text(encoding='utf-8')
+        self.assertIn('| File Coverage |', report)
+        self.assertNotIn('Directory Coverage', report)
+        self.assertNotIn('Overall Score', report)
+
+
+if __name__ == '__main__':
+    unittest.main()
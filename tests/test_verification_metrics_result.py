@@ -0,0 +1,94 @@
+"""
+測試共用的驗證指標結果
+"""
+import json
+import unittest
+import sys
+import tempfile
+import shutil
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+# 添加 src 目錄到路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from verification_metrics import MetricsResult, VerificationMetrics, overall_score
+from main import generate_report_files
+from i18n import LANG_EN, LANG_ZH_CN, LANG_ZH_TW
+
+STRUCTURE_CONTENT = """```
+system/
+└─ project1/
+   ├─ core/                ← 核心模組
+   │  ├─ pyproject.toml
+   │  └─ src/
+   │     └─ main.py        ← 主程式
+   └─ README.md
+```"""
+
+
+class TestMetricsResult(unittest.TestCase):
+    """測試共用的驗證指標結果"""
+
+    def setUp(self):
+        """設置測試環境"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.structure_file = self.temp_dir / "structure.md"
+        self.structure_file.write_text(STRUCTURE_CONTENT, encoding='utf-8')
+        self.generated_dir = self.temp_dir / "generated"
+        project = self.generated_dir / "system" / "project1"
+        (project / "core" / "src").mkdir(parents=True)
+        (project / "core" / "src" / "main.py").write_text('"""主程式"""\n', encoding='utf-8')
+        (project / "README.md").write_text("# 專案\n", encoding='utf-8')
+
+    def tearDown(self):
+        """清理測試環境"""
+        shutil.rmtree(self.temp_dir)
+
+    def _calculator(self):
+        return VerificationMetrics(str(self.structure_file), str(self.generated_dir))
+
+    def test_compute(self):
+        """測試結果與 calculate_all_metrics 相同並附上總體分數"""
+        metrics = self._calculator().calculate_all_metrics()
+        result = self._calculator().compute()
+
+        self.assertEqual(result['overall_score'], overall_score(metrics))
+        self.assertEqual(result['file_coverage']['matched_count'], metrics['file_coverage']['matched_count'])
+        expected = dict(metrics, overall_score=overall_score(metrics))
+        self.assertEqual(json.loads(json.dumps(result.to_dict())), json.loads(json.dumps(expected)))
+
+    def test_read_only(self):
+        """測試結果不可修改"""
+        result = self._calculator().compute()
+        with self.assertRaises(TypeError):
+            result['file_coverage']['coverage_rate'] = 1.0
+        with self.assertRaises(AttributeError):
+            result['file_coverage']['missing_files'].append('x')
+        with self.assertRaises(TypeError):
+            result['overall_score'] = 0.0
+
+    def test_reports_share_metrics(self):
+        """測試所有報告與語言只計算一次指標"""
+        report_dir = self.temp_dir / "reports"
+        report_dir.mkdir()
+        with patch.object(VerificationMetrics, 'calculate_all_metrics',
+                          autospec=True, side_effect=VerificationMetrics.calculate_all_metrics) as calculate, \
+                patch('sys.stdout', new=StringIO()):
+            generate_report_files(str(self.structure_file), str(self.generated_dir), report_dir,
+                                  [LANG_ZH_TW, LANG_ZH_CN, LANG_EN])
+
+        self.assertEqual(calculate.call_count, 1)
+        self.assertEqual(len(list(report_dir.glob('*.md'))), 9)
+        self.assertIn('/100', (report_dir / "METRICS.en.md").read_text(encoding='utf-8'))
+
+    def test_result_is_mapping(self):
+        """測試結果可作為一般映射傳給報告"""
+        result = MetricsResult(self._calculator().calculate_all_metrics())
+        self.assertIn('structure_coverage', result)
+        self.assertEqual(len(result), 8)
+
+
+if __name__ == '__main__':
+    unittest.main()